@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -7,8 +8,20 @@ from pathlib import Path
 # Get the project root directory
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
 
-# Create a SQLite database in the project root
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{BASE_DIR}/bazaar.db"
+# Create a SQLite database in the project root (DATABASE_URL overrides it, e.g. for benchmarks)
+SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", f"sqlite:///{BASE_DIR}/bazaar.db")
+
+def _database_dir(url: str) -> Path:
+    database = make_url(url).database
+    if url.startswith("sqlite") and database and database != ":memory:":
+        return Path(database).resolve().parent
+    return BASE_DIR
+
+# Directory of the SQLite database file (the project root for other databases).
+# Files derived from the database, such as the catalog snapshot and the
+# simulation cache, default to living next to it, so runs against a scratch
+# database never overwrite the project's own.
+DATABASE_DIR = _database_dir(SQLALCHEMY_DATABASE_URL)
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
@@ -1,14 +1,23 @@
 # app/database/init_db.py
 
+import hashlib
 import logging
-from sqlalchemy import inspect
-from app.database.database import engine, Base
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from app.database.database import engine, Base, SessionLocal
 from app.models.hero import Hero
 from app.models.item import Item
 from app.models.skill import Skill
 from app.models.monster import Monster
 from app.models.enchantment import Enchantment
 from app.models.merchant import Merchant
+from app.models.build import Build
+from app.models.tag import Tag
+from app.models.job import Job
+from app.models.cooccurrence import ItemFrequency, ItemPair, ItemSkillPair
+from app.models.stats import HeroBuildCount, ItemUsageCount, SkillTierCount
+from app.models.backfill import DataBackfill
+from app.services.backfills import run_pending_backfills
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -28,6 +37,102 @@ def init_db():
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
 
+def upgrade_schema():
+    """Create missing tables and add columns missing from existing ones.
+
+    ``create_all`` only creates missing tables, so columns added to an
+    existing model would otherwise be missing from older databases. Only
+    nullable columns and columns with a server default are added this way;
+    existing rows get the server default. Missing indexes are created too.
+
+    Raises:
+        RuntimeError: If a missing column is NOT NULL without a server
+            default, which existing rows could not satisfy
+    """
+    Base.metadata.create_all(bind=engine)
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                
+                if not column.nullable and column.server_default is None:
+                    raise RuntimeError(
+                        f"Cannot add NOT NULL column {table.name}.{column.name} without a server default; "
+                        "give it a server_default or make it nullable"
+                    )
+                column_type = column.type.compile(dialect=engine.dialect)
+                definition = column_type
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    default_sql = f"'{default}'" if isinstance(default, str) else str(default)
+                    definition += f" {'' if column.nullable else 'NOT NULL '}DEFAULT {default_sql}"
+                logger.info(f"Adding column {table.name}.{column.name} ({definition})")
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {definition}'))
+
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    logger.info(f"Creating index {index.name} on {table.name}")
+                    index.create(bind=connection)
+
+def schema_version() -> int:
+    """Return a fingerprint of the models' tables, columns and indexes.
+
+    Stored in SQLite's ``user_version`` once the schema is up to date, so
+    startup can skip inspecting the database when nothing has changed.
+    """
+    digest = hashlib.sha1()
+    for table in Base.metadata.sorted_tables:
+        digest.update(table.name.encode("utf-8"))
+        for column in table.columns:
+            digest.update(f"{column.name}:{column.type}".encode("utf-8"))
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(f"{index.name}".encode("utf-8"))
+    # user_version is a signed 32-bit integer
+    return int(digest.hexdigest()[:7], 16)
+
+def get_stored_schema_version(bind: Engine = engine) -> int:
+    if bind.dialect.name != "sqlite":
+        return 0
+    with bind.connect() as connection:
+        return connection.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+def set_stored_schema_version(version: int, bind: Engine = engine) -> None:
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.begin() as connection:
+        connection.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+def ensure_schema() -> bool:
+    """Upgrade the schema unless the database already records the current version.
+
+    Data backfills the database has not completed yet run afterwards either
+    way (one small read when there are none).
+
+    Returns:
+        True if the schema was checked and upgraded, False if it was skipped
+    """
+    version = schema_version()
+    upgraded = get_stored_schema_version() != version
+    if upgraded:
+        logger.info("Schema version changed; upgrading database schema")
+        upgrade_schema()
+        set_stored_schema_version(version)
+    db = SessionLocal()
+    try:
+        run_pending_backfills(db)
+    finally:
+        db.close()
+    return upgraded
+
 def reset_db():
     """Reset the database by dropping and recreating all tables."""
     logger.warning("Dropping all database tables...")
@@ -35,6 +140,7 @@ def reset_db():
     
     logger.info("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    set_stored_schema_version(schema_version())
     logger.info("Database reset completed successfully")
 
 if __name__ == "__main__":
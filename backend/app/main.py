@@ -1,22 +1,57 @@
+import asyncio
+import os
+import signal
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routes import hero_routes, item_routes, skill_routes, build_routes, inventory_routes
+from .routes import hero_routes, item_routes, skill_routes, build_routes, inventory_routes, metrics_routes
 from .database.database import engine
-from .models import hero, item, skill, build
+from .database.init_db import ensure_schema
+from .middleware.admission import AdmissionMiddleware
+from .middleware.compression import CompressionMiddleware
+from .middleware.instrumentation import InstrumentationMiddleware
+from .middleware.lazy_routers import LazyRouterMiddleware, LazyRouters
+from .middleware.profiling import ProfilingMiddleware
+from .services.catalog import SNAPSHOT_PATH, request_reload
+from .services.jobs import job_manager
+from .services.metrics import instrument_engine
+from .services.slow_queries import instrument_slow_queries
+from .services.warmup import WARM_CACHES, warm_caches
 
-# Create database tables
-hero.Base.metadata.create_all(bind=engine)
-item.Base.metadata.create_all(bind=engine)
-skill.Base.metadata.create_all(bind=engine)
-build.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema checks run once per start, and only when the models changed
+    ensure_schema()
+    if SNAPSHOT_PATH and hasattr(signal, "SIGUSR1"):
+        # The launcher forwards SIGUSR1 when a new catalog snapshot generation is published
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, request_reload)
+    if WARM_CACHES == "before":
+        warm_caches()
+    # Only one process per deployment dispatches jobs (the launcher enables it in one worker)
+    run_jobs = os.environ.get("JOB_MANAGER_ENABLED", "1") != "0"
+    if run_jobs:
+        job_manager.start()
+    if WARM_CACHES == "after":
+        threading.Thread(target=warm_caches, name="cache-warmup", daemon=True).start()
+    yield
+    if run_jobs:
+        job_manager.stop()
 
 app = FastAPI(
     title="The Bazaar Game Assistant API",
     description="API for The Bazaar Game Assistant web app",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
+# Rate limit clients and shed load per route class (ADMISSION_ENABLED=0 turns it off). Added
+# first so CORS, compression and metrics also apply to the 429/503 responses.
+if os.environ.get("ADMISSION_ENABLED", "1") != "0":
+    app.add_middleware(AdmissionMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,15 +59,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Id", "Retry-After"],
 )
 
+# gzip/brotli for responses the client accepts compressed (COMPRESSION_ENABLED=0 turns it off)
+if os.environ.get("COMPRESSION_ENABLED", "1") != "0":
+    app.add_middleware(CompressionMiddleware)
+
+# Per-request timing and SQL counters (set METRICS_ENABLED=0 to turn off)
+if os.environ.get("METRICS_ENABLED", "1") != "0":
+    instrument_engine(engine)
+    app.add_middleware(InstrumentationMiddleware)
+
+# Profile requests on demand (X-Profile header, __profile flag) or 1 in PROFILE_SAMPLE_RATE
+app.add_middleware(ProfilingMiddleware)
+
+# Log statements slower than SLOW_QUERY_MS with their query plans
+instrument_slow_queries(engine)
+
 # Include routers
 app.include_router(hero_routes.router)
 app.include_router(item_routes.router)
 app.include_router(skill_routes.router)
 app.include_router(build_routes.router)
 app.include_router(inventory_routes.router)
+app.include_router(metrics_routes.router)
+
+# Rarely used routers are imported on their first request (LAZY_ROUTERS=0 includes them now)
+lazy_routers = LazyRouters(app, {
+    "/optimizer": "app.routes.optimizer_routes",
+    "/simulation": "app.routes.simulation_routes",
+    "/jobs": "app.routes.job_routes",
+    "/debug": "app.routes.debug_routes",
+    "/stats": "app.routes.stats_routes",
+})
+if os.environ.get("LAZY_ROUTERS", "1") == "0":
+    lazy_routers.load_all()
+else:
+    app.add_middleware(LazyRouterMiddleware, routers=lazy_routers)
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to The Bazaar Game Assistant API"}
\ No newline at end of file
+    return {"message": "Welcome to The Bazaar Game Assistant API"}
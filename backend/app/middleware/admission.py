@@ -0,0 +1,52 @@
+# app/middleware/admission.py
+
+import time
+
+from starlette.responses import JSONResponse
+
+from app.services.admission import AdmissionController, Rejected, admission
+
+# Too many requests from one client is the client's doing; full queues are the server's
+REJECTION_STATUS = {"rate_limited": 429, "queue_full": 503, "queue_timeout": 503}
+REJECTION_DETAIL = {
+    "rate_limited": "Too many requests from this client",
+    "queue_full": "Server is overloaded",
+    "queue_timeout": "Server is overloaded",
+}
+
+class AdmissionMiddleware:
+    """Rate limit clients and queue requests per route class before serving them.
+
+    Requests over a client's rate get a 429; requests whose route class
+    (read, write, compute) has a full queue, or that waited too long for
+    a slot, get a 503. Both carry a Retry-After header, so under overload
+    most requests fail fast while the admitted ones keep their latency.
+    See app.services.admission for the limits.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            queue = await self.controller.admit(scope)
+        except Rejected as error:
+            response = JSONResponse(
+                {"detail": REJECTION_DETAIL[error.reason]},
+                status_code=REJECTION_STATUS[error.reason],
+                headers={"Retry-After": str(error.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        if queue is None:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            queue.release(time.perf_counter() - started)
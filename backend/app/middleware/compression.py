@@ -0,0 +1,87 @@
+# app/middleware/compression.py
+
+from app.services.compression import (
+    COMPRESSION_MIN_BYTES,
+    DYNAMIC_LEVELS,
+    compress,
+    compression_budget,
+    negotiate
+)
+from app.services.metrics import registry
+
+# Media types worth compressing; images, archives and the like already are
+COMPRESSIBLE_TYPES = (b"application/json", b"text/html", b"text/plain", b"text/css", b"application/javascript")
+
+class CompressionMiddleware:
+    """Compress response bodies with gzip or brotli, as the client's Accept-Encoding allows.
+
+    Only whole bodies of compressible types, at least ``minimum_size``
+    bytes long, are compressed. Streamed responses (server-sent events,
+    file downloads) and responses that already carry a Content-Encoding,
+    such as the stored catalog payloads, pass through untouched. When
+    the CPU budget in app.services.compression is spent, responses go
+    out uncompressed until it refills.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        encoding = negotiate(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                response_headers = dict(message.get("headers", []))
+                content_type = response_headers.get(b"content-type", b"")
+                if b"content-encoding" in response_headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until the body shows whether it is worth compressing
+                    start = message
+                return
+
+            body = message.get("body", b"")
+            passthrough = True
+            if message.get("more_body", False):
+                # Streamed; sent as it comes
+                await send(start)
+                await send(message)
+                return
+            vary = [(b"vary", b"Accept-Encoding")]
+            if len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+            if not compression_budget.available():
+                registry.record_compression_skip("budget")
+                start["headers"] = list(start.get("headers", [])) + vary
+                await send(start)
+                await send(message)
+                return
+            compressed = compress(body, encoding, DYNAMIC_LEVELS[encoding])
+            start["headers"] = [
+                (name, value) for name, value in start.get("headers", []) if name != b"content-length"
+            ] + [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+            ] + vary
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,62 @@
+# app/middleware/instrumentation.py
+
+import time
+
+from app.services.metrics import RequestMetrics, current_request, registry
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+class InstrumentationMiddleware:
+    """Record wall time, SQL time, SQL statement count and response size per route.
+
+    Each response carries a ``Server-Timing`` header, e.g.
+    ``app;dur=12.40, db;dur=3.10, sql;desc="7 statements"``, and every
+    request is aggregated into the histograms served at ``/metrics``.
+    Requests are labelled by route template (``/builds/{build_id}``)
+    rather than path so the number of series stays bounded.
+
+    This is a plain ASGI middleware: it adds one context variable and a few
+    counters per request and never buffers the body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(scope)
+        token = current_request.set(metrics)
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - metrics.started) * 1000
+                timing = (
+                    f"app;dur={elapsed_ms:.2f}, db;dur={metrics.sql_seconds * 1000:.2f}, "
+                    f'sql;desc="{metrics.sql_statements} statements"'
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode("latin-1"))]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            # FastAPI records the matched route in the scope during routing
+            route = scope.get("route")
+            registry.record(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                metrics,
+                time.perf_counter() - metrics.started,
+                size,
+            )
@@ -0,0 +1,64 @@
+# app/middleware/lazy_routers.py
+
+import importlib
+import logging
+import threading
+from typing import Dict
+
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+class LazyRouters:
+    """Routers that are imported and included the first time they are needed.
+
+    Maps a path prefix to the module holding its ``router``. A router is
+    loaded by the first request under its prefix, or by a request for the
+    OpenAPI schema, which needs every route.
+    """
+
+    def __init__(self, app: FastAPI, routers: Dict[str, str]):
+        self.app = app
+        self.pending = dict(routers)
+        self._lock = threading.Lock()
+        self._openapi = app.openapi
+        app.openapi = self._full_openapi
+
+    def load(self, prefix: str) -> None:
+        with self._lock:
+            module_name = self.pending.pop(prefix, None)
+            if module_name is None:
+                return
+            module = importlib.import_module(module_name)
+            self.app.include_router(module.router)
+            # The cached schema no longer lists every route
+            self.app.openapi_schema = None
+            logger.debug(f"Loaded router {module_name}")
+
+    def load_all(self) -> None:
+        for prefix in list(self.pending):
+            self.load(prefix)
+
+    def match(self, path: str):
+        for prefix in self.pending:
+            if path == prefix or path.startswith(prefix + "/"):
+                return prefix
+        return None
+
+    def _full_openapi(self):
+        self.load_all()
+        return self._openapi()
+
+class LazyRouterMiddleware:
+    """Load a lazy router before the first request under its prefix is routed."""
+
+    def __init__(self, app, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.routers.pending:
+            prefix = self.routers.match(scope["path"])
+            if prefix is not None:
+                self.routers.load(prefix)
+        await self.app(scope, receive, send)
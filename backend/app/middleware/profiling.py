@@ -0,0 +1,81 @@
+# app/middleware/profiling.py
+
+import logging
+import sys
+import time
+from urllib.parse import parse_qs
+
+from app.services.profiler import (
+    SamplingProfiler, debug_access_allowed, elapsed_ms, profile_store, request_sampler
+)
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_FLAG = "__profile"
+
+class ProfilingMiddleware:
+    """Run selected requests under the sampling profiler.
+
+    A request is profiled when it carries ``X-Profile: 1`` or the
+    ``__profile=1`` query flag (both need the X-Debug-Token header, or a
+    loopback client when DEBUG_TOKEN is unset), or when it is picked by
+    the 1-in-N background sampler (PROFILE_SAMPLE_RATE). The profile ID
+    is returned in the ``X-Profile-Id`` header and the profile is listed
+    at /debug/profiles.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _trigger(self, scope) -> str:
+        headers = dict(scope.get("headers") or [])
+        flag = headers.get(PROFILE_HEADER, b"").decode("latin-1")
+        if not flag and scope.get("query_string"):
+            flag = parse_qs(scope["query_string"].decode("latin-1")).get(PROFILE_QUERY_FLAG, [""])[0]
+        if flag and flag not in ("0", "false"):
+            token = headers.get(b"x-debug-token", b"").decode("latin-1") or None
+            client = scope.get("client")
+            if debug_access_allowed(token, client[0] if client else None):
+                return "header" if headers.get(PROFILE_HEADER) else "query"
+        return "sampled" if request_sampler.should_profile() else ""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trigger = self._trigger(scope)
+        if not trigger:
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(sys._getframe(), lambda: scope.get("endpoint"))
+        profile_id = profile_store.new_id()
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            route = scope.get("route")
+            try:
+                profile_store.save(profile_id, profiler, {
+                    "trigger": trigger,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(route, "path", None),
+                    "status": status,
+                    "duration_ms": elapsed_ms(started),
+                })
+                logger.info(f"Saved profile {profile_id} of {scope['method']} {scope['path']}")
+            except OSError as e:
+                logger.warning(f"Could not save profile: {e}")
@@ -5,4 +5,10 @@ from app.models.item import Item, ItemSize, ItemSource
 from app.models.skill import Skill, SkillSource, SkillTier
 from app.models.monster import Monster
 from app.models.enchantment import Enchantment, ItemEnchantment
-from app.models.merchant import Merchant, MerchantType
\ No newline at end of file
+from app.models.merchant import Merchant, MerchantType
+from app.models.build import Build, BuildItem, BuildSkill
+from app.models.tag import Tag, ItemTag, SkillTag
+from app.models.job import Job
+from app.models.cooccurrence import ItemFrequency, ItemPair, ItemSkillPair
+from app.models.stats import HeroBuildCount, ItemUsageCount, SkillTierCount
+from app.models.backfill import DataBackfill
\ No newline at end of file
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from ..database.database import Base
+
+class DataBackfill(Base):
+    """A one-time data backfill that has completed on this database (see app.services.backfills)."""
+    __tablename__ = "data_backfills"
+
+    name = Column(String, primary_key=True)
+    completed_at = Column(DateTime, default=datetime.utcnow)
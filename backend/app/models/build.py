@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, Table
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database.database import Base
@@ -12,17 +12,28 @@ class Build(Base):
     hero_id = Column(Integer, ForeignKey("heroes.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped by every update; clients send it back in If-Match
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Hash of hero, slotted items and skills (app.services.fingerprints); NULL until backfilled
+    fingerprint = Column(String(32), nullable=True, unique=True, index=True)
 
     # Relationships
     hero = relationship("Hero", back_populates="builds")
     build_items = relationship("BuildItem", back_populates="build", cascade="all, delete-orphan")
     build_skills = relationship("BuildSkill", back_populates="build", cascade="all, delete-orphan")
 
+    # Cover the change checks of app.services.inventory_match and
+    # app.services.similar_builds without reading the table
+    __table_args__ = (
+        Index("ix_builds_hero_changes", "hero_id", "updated_at", "version"),
+        Index("ix_builds_updated_at", "updated_at"),
+    )
+
 class BuildItem(Base):
     __tablename__ = "build_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    build_id = Column(Integer, ForeignKey("builds.id"))
+    build_id = Column(Integer, ForeignKey("builds.id"), index=True)
     item_id = Column(Integer, ForeignKey("items.id"))
     slot = Column(String, nullable=True)  # Optional positioning info for the UI
 
@@ -34,7 +45,7 @@ class BuildSkill(Base):
     __tablename__ = "build_skills"
 
     id = Column(Integer, primary_key=True, index=True)
-    build_id = Column(Integer, ForeignKey("builds.id"))
+    build_id = Column(Integer, ForeignKey("builds.id"), index=True)
     skill_id = Column(Integer, ForeignKey("skills.id"))
 
     # Relationships
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from ..database.database import Base
+
+# Counts maintained by app.services.cooccurrence as builds are written
+
+class ItemFrequency(Base):
+    """Number of builds that contain an item."""
+    __tablename__ = "item_frequencies"
+
+    item_id = Column(Integer, ForeignKey("items.id"), primary_key=True)
+    builds = Column(Integer, nullable=False)
+
+class ItemPair(Base):
+    """Number of builds that contain both items; every pair is stored in both directions."""
+    __tablename__ = "item_pairs"
+
+    item_id = Column(Integer, ForeignKey("items.id"), primary_key=True)
+    partner_id = Column(Integer, ForeignKey("items.id"), primary_key=True)
+    builds = Column(Integer, nullable=False)
+
+    # An item's partners, most frequent first, straight off the index
+    __table_args__ = (Index("ix_item_pairs_top", "item_id", builds.desc(), "partner_id"),)
+
+class ItemSkillPair(Base):
+    """Number of builds that contain both an item and a skill."""
+    __tablename__ = "item_skill_pairs"
+
+    item_id = Column(Integer, ForeignKey("items.id"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    builds = Column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_item_skill_pairs_top", "item_id", builds.desc(), "skill_id"),)
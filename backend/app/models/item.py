@@ -26,6 +26,7 @@ class Item(Base):
     cooldown = Column(Integer, nullable=True)
     effect = Column(Text)
     cost = Column(Integer, nullable=True)
+    types = Column(String, nullable=True)  # Item types (Weapon, Tech, etc.)
     
     # Relationships
     hero = relationship("Hero", back_populates="items")
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text
+from datetime import datetime
+from ..database.database import Base
+
+class Job(Base):
+    """A background job (simulation, optimization or import) and its progress."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, index=True)
+    params = Column(Text)  # JSON-encoded handler parameters
+    dedupe_key = Column(String, index=True)  # Hash of kind and params, used to coalesce duplicates
+    priority = Column(Integer, default=0, index=True)  # Higher runs first
+    status = Column(String, default="queued", index=True)  # queued, running, succeeded, failed, cancelled
+    cancel_requested = Column(Boolean, default=False)
+    progress = Column(Float, default=0.0)  # 0.0 to 1.0
+    message = Column(String, nullable=True)
+    result = Column(Text, nullable=True)  # JSON-encoded handler result
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
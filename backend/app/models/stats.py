@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from ..database.database import Base
+
+# Aggregates maintained by app.services.aggregate_stats as builds, items and
+# skills are written. Missing sizes, sources and tiers are stored as "".
+
+class HeroBuildCount(Base):
+    """Number of builds for a hero."""
+    __tablename__ = "hero_build_counts"
+
+    hero_id = Column(Integer, ForeignKey("heroes.id"), primary_key=True)
+    builds = Column(Integer, nullable=False)
+
+class ItemUsageCount(Base):
+    """Items of one size and source, and how many times builds use them (once per build and item)."""
+    __tablename__ = "item_usage_counts"
+
+    size = Column(String, primary_key=True)  # ItemSize value
+    source = Column(String, primary_key=True)  # ItemSource value
+    items = Column(Integer, nullable=False)
+    build_uses = Column(Integer, nullable=False)
+
+class SkillTierCount(Base):
+    """Skills of one starting tier, and how many times builds use them (once per build and skill)."""
+    __tablename__ = "skill_tier_counts"
+
+    tier = Column(String, primary_key=True)
+    skills = Column(Integer, nullable=False)
+    build_uses = Column(Integer, nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from ..database.database import Base
+
+class Tag(Base):
+    """A normalized item or skill type, e.g. "Weapon" or "ShieldReference"."""
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True)  # Display name as first seen in the data
+    key = Column(String, unique=True, index=True)  # Lower-cased name used for matching
+
+class ItemTag(Base):
+    __tablename__ = "item_tags"
+
+    item_id = Column(Integer, ForeignKey("items.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True, index=True)
+
+class SkillTag(Base):
+    __tablename__ = "skill_tags"
+
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True, index=True)
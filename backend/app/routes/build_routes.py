@@ -1,19 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
 
 from ..database.database import get_db
 from ..schemas.build import (
+    BuildBulkCreate,
+    BuildBulkResponse,
     BuildCreate, 
     BuildResponse, 
     BuildUpdate, 
-    BuildDetailedResponse
+    BuildDetailedResponse,
+    BuildSlotUpdate,
+    SimilarBuildsResponse
 )
+from ..schemas.synergy import BuildSynergyResponse
 from ..models.build import Build, BuildItem, BuildSkill
 from ..models.hero import Hero
 from ..models.item import Item
 from ..models.skill import Skill
+from ..services.aggregate_stats import record_build_stats
+from ..services.build_updates import BuildNotFound, BuildVersionConflict, set_slot
+from ..services.build_updates import update_build as apply_build_update
+from ..services.bulk_builds import MAX_BULK_BUILDS, create_builds
+from ..services.catalog import get_catalog
+from ..services.cooccurrence import record_build_changes
+from ..services.fingerprints import DuplicateBuild, find_fingerprints, fingerprint_of
+from ..services.read_models import BuildRecord, ItemRecord, SkillRecord, load_builds, records_by_id
+from ..services.similar_builds import MAX_SIMILAR_BUILDS, find_similar, forget_build, index_build
+from ..services.synergy import get_synergy_graph
 
 router = APIRouter(
     prefix="/builds",
@@ -21,16 +36,19 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Helper function to convert a Build model instance to a detailed response
-def convert_build_to_detailed_response(build, db: Session):
+# Helper function to convert a build record to a detailed response
+def convert_build_to_detailed_response(build: BuildRecord, db: Session):
     # Get hero name
-    hero = db.query(Hero).filter(Hero.id == build.hero_id).first()
-    hero_name = hero.name if hero else "Unknown"
+    hero_name = db.query(Hero.name).filter(Hero.id == build.hero_id).scalar() or "Unknown"
+    
+    # Load every item and skill of the build in one statement each
+    item_records = records_by_id(db, ItemRecord, (bi.item_id for bi in build.build_items))
+    skill_records = records_by_id(db, SkillRecord, (bs.skill_id for bs in build.build_skills))
     
     # Get detailed item information
     items = []
     for build_item in build.build_items:
-        item = db.query(Item).filter(Item.id == build_item.item_id).first()
+        item = item_records.get(build_item.item_id)
         if item:
             item_dict = {
                 "id": item.id,
@@ -52,7 +70,7 @@ def convert_build_to_detailed_response(build, db: Session):
     # Get detailed skill information
     skills = []
     for build_skill in build.build_skills:
-        skill = db.query(Skill).filter(Skill.id == build_skill.skill_id).first()
+        skill = skill_records.get(build_skill.skill_id)
         if skill:
             skill_dict = {
                 "id": skill.id,
@@ -79,15 +97,26 @@ def convert_build_to_detailed_response(build, db: Session):
         "hero_name": hero_name,
         "created_at": build.created_at,
         "updated_at": build.updated_at,
+        "version": build.version,
+        "fingerprint": build.fingerprint,
         "items": items,
         "skills": skills
     }
 
 @router.post("/", response_model=BuildResponse, status_code=status.HTTP_201_CREATED)
-async def create_build(build: BuildCreate, db: Session = Depends(get_db)):
+async def create_build(build: BuildCreate, response: Response, dedupe: bool = True, db: Session = Depends(get_db)):
     """
     Create a new build with items and skills.
+    
+    A build with the same hero, slotted items and skills as a stored build
+    is not saved twice: with ``dedupe`` (the default) the stored build is
+    returned with 200, otherwise the request fails with 409.
     """
+    fingerprint = fingerprint_of(build)
+    existing_id = find_fingerprints(db, [fingerprint]).get(fingerprint)
+    if existing_id is not None:
+        return existing_build_response(existing_id, dedupe, response, db)
+    
     # Check if hero exists
     hero = db.query(Hero).filter(Hero.id == build.hero_id).first()
     if not hero:
@@ -100,7 +129,8 @@ async def create_build(build: BuildCreate, db: Session = Depends(get_db)):
     db_build = Build(
         name=build.name,
         description=build.description,
-        hero_id=build.hero_id
+        hero_id=build.hero_id,
+        fingerprint=fingerprint
     )
     
     # Add items to build
@@ -136,13 +166,68 @@ async def create_build(build: BuildCreate, db: Session = Depends(get_db)):
         )
         db_build.build_skills.append(build_skill)
     
-    # Save to database
+    # Save to database, with the co-occurrence counts and aggregates in the same transaction
     db.add(db_build)
-    db.commit()
+    contents = ([bi.item_id for bi in build.build_items], [bs.skill_id for bs in build.build_skills])
+    record_build_changes(db, [(None, contents)])
+    record_build_stats(db, [(build.hero_id, None, contents)])
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request saved the same build first
+        db.rollback()
+        existing_id = find_fingerprints(db, [fingerprint]).get(fingerprint)
+        if existing_id is None:
+            raise
+        return existing_build_response(existing_id, dedupe, response, db)
     db.refresh(db_build)
+    index_build(db_build.id, (bi.item_id for bi in db_build.build_items), (bs.skill_id for bs in db_build.build_skills))
     
+    response.headers["ETag"] = build_etag(db_build.version)
     return db_build
 
+def existing_build_response(build_id: int, dedupe: bool, response: Response, db: Session) -> BuildRecord:
+    """Answer a create request for a build that is already stored."""
+    if not dedupe:
+        raise duplicate_build_error(DuplicateBuild(build_id))
+    response.status_code = status.HTTP_200_OK
+    return load_build_response(build_id, response, db)
+
+def duplicate_build_error(error: DuplicateBuild) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=str(error),
+        headers={"Location": f"{router.prefix}/{error.build_id}"}
+    )
+
+@router.post("/bulk", response_model=BuildBulkResponse)
+def create_builds_bulk(request: BuildBulkCreate, db: Session = Depends(get_db)):
+    """
+    Create many builds in one request and one transaction.
+    
+    Every referenced hero, item and skill is checked with one query per
+    table. Invalid builds are reported per build; with ``all_or_nothing``
+    set, nothing is created if any build is invalid. Builds that are
+    already stored, or repeated in the request, are created once and
+    reported as duplicates.
+    
+    This is a plain (non-async) route so a large import runs in the
+    threadpool instead of blocking the event loop.
+    """
+    if len(request.builds) > MAX_BULK_BUILDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_BUILDS} builds per request"
+        )
+    
+    result = create_builds(db, request.builds, request.all_or_nothing)
+    for entry in result["results"]:
+        if entry["status"] == "created":
+            build = request.builds[entry["index"]]
+            index_build(entry["build_id"], (bi.item_id for bi in build.build_items),
+                        (bs.skill_id for bs in build.build_skills))
+    return result
+
 @router.get("/", response_model=List[BuildResponse])
 async def get_builds(
     skip: int = 0, 
@@ -163,16 +248,32 @@ async def get_builds(
     if name:
         query = query.filter(Build.name.ilike(f"%{name}%"))
     
-    # Get builds
-    builds = query.offset(skip).limit(limit).all()
-    return builds
+    # Get builds with their items and skills as read-only records
+    return load_builds(db, query.offset(skip).limit(limit))
+
+@router.get("/by-fingerprint/{fingerprint}", response_model=BuildDetailedResponse)
+async def get_build_by_fingerprint(fingerprint: str, response: Response, db: Session = Depends(get_db)):
+    """
+    Get the build with a fingerprint (a hash of its hero, slotted items
+    and skills), through the unique index on the column.
+    """
+    builds = load_builds(db, db.query(Build).filter(Build.fingerprint == fingerprint.lower()))
+    if not builds:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No build with fingerprint {fingerprint}"
+        )
+    
+    response.headers["ETag"] = build_etag(builds[0].version)
+    return convert_build_to_detailed_response(builds[0], db)
 
 @router.get("/{build_id}", response_model=BuildDetailedResponse)
-async def get_build(build_id: int, db: Session = Depends(get_db)):
+async def get_build(build_id: int, response: Response, db: Session = Depends(get_db)):
     """
     Get detailed information about a specific build.
     """
-    build = db.query(Build).filter(Build.id == build_id).first()
+    builds = load_builds(db, db.query(Build).filter(Build.id == build_id))
+    build = builds[0] if builds else None
     
     if not build:
         raise HTTPException(
@@ -180,84 +281,165 @@ async def get_build(build_id: int, db: Session = Depends(get_db)):
             detail=f"Build with ID {build_id} not found"
         )
     
+    response.headers["ETag"] = build_etag(build.version)
     return convert_build_to_detailed_response(build, db)
 
-@router.put("/{build_id}", response_model=BuildResponse)
-async def update_build(build_id: int, build_update: BuildUpdate, db: Session = Depends(get_db)):
+@router.get("/{build_id}/similar", response_model=SimilarBuildsResponse)
+async def get_similar_builds(build_id: int, k: int = 10, db: Session = Depends(get_db)):
     """
-    Update a build.
+    Find the ``k`` builds with the most items and skills in common with a build.
+    
+    Approximate: candidates come from a MinHash-LSH index and are ranked
+    by exact Jaccard similarity, so builds sharing little with this one
+    may be missed, but the lookup does not scan the library.
+    """
+    if not 1 <= k <= MAX_SIMILAR_BUILDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"k must be between 1 and {MAX_SIMILAR_BUILDS}"
+        )
+    
+    found = find_similar(db, build_id, k)
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Build with ID {build_id} not found"
+        )
+    
+    neighbours, candidates = found
+    # Builds deleted since find_similar checked them drop out here
+    rows = {row.id: row for row in db.query(Build.id, Build.name, Build.hero_id)
+            .filter(Build.id.in_([neighbour_id for neighbour_id, _ in neighbours]))}
+    similar = [
+        {"build_id": neighbour_id, "name": rows[neighbour_id].name, "hero_id": rows[neighbour_id].hero_id,
+         "similarity": round(similarity, 4)}
+        for neighbour_id, similarity in neighbours if neighbour_id in rows
+    ]
+    return {"build_id": build_id, "candidates": candidates, "similar": similar}
+
+@router.get("/{build_id}/synergy", response_model=BuildSynergyResponse)
+async def get_build_synergy(build_id: int, db: Session = Depends(get_db)):
+    """
+    Score how well the items and skills of a build feed each other.
     """
-    # Get the existing build
-    db_build = db.query(Build).filter(Build.id == build_id).first()
+    builds = load_builds(db, db.query(Build).filter(Build.id == build_id))
+    build = builds[0] if builds else None
+    
+    if not build:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Build with ID {build_id} not found"
+        )
     
-    if not db_build:
+    graph = get_synergy_graph(get_catalog(db))
+    result = graph.score_build(
+        [bi.item_id for bi in build.build_items],
+        [bs.skill_id for bs in build.build_skills]
+    )
+    return {"build_id": build.id, "catalog_version": graph.version, **result}
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Return the build version from an If-Match header (``"3"``, ``W/"3"`` or ``*``)."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.split(",")[0].strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid If-Match header: {if_match}"
+        )
+
+def build_etag(version: int) -> str:
+    return f'"{version}"'
+
+def load_build_response(build_id: int, response: Response, db: Session) -> BuildRecord:
+    """Load a build for a response and set its ETag."""
+    build = load_builds(db, db.query(Build).filter(Build.id == build_id))[0]
+    response.headers["ETag"] = build_etag(build.version)
+    return build
+
+def reindex_build(build: BuildRecord) -> BuildRecord:
+    """Bring the similar-build index up to date with an updated build."""
+    index_build(build.id, (bi.item_id for bi in build.build_items), (bs.skill_id for bs in build.build_skills))
+    return build
+
+def run_build_update(build_id: int, update, if_match: Optional[str]) -> None:
+    """Run an update from app.services.build_updates and map its errors to HTTP errors."""
+    try:
+        update(parse_if_match(if_match))
+    except BuildNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Build with ID {build_id} not found"
         )
+    except BuildVersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"Build {build_id} was modified; it is now at version {e.current_version}",
+            headers={"ETag": build_etag(e.current_version)}
+        )
+    except DuplicateBuild as e:
+        raise duplicate_build_error(e)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+@router.put("/{build_id}", response_model=BuildResponse)
+async def update_build(
+    build_id: int,
+    build_update: BuildUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Update a build.
     
-    # Update basic build information
+    Only the rows that differ from the stored build are written. Send the
+    build's ETag in If-Match to fail with 412 instead of overwriting
+    someone else's changes. Fails with 409 if another build already has
+    the resulting items and skills.
+    """
+    changes = {}
     if build_update.name is not None:
-        db_build.name = build_update.name
-        
+        changes["name"] = build_update.name
     if build_update.description is not None:
-        db_build.description = build_update.description
-    
-    # Update items if provided
+        changes["description"] = build_update.description
+    items = None
     if build_update.build_items is not None:
-        # Remove existing items
-        for build_item in db_build.build_items:
-            db.delete(build_item)
-        
-        # Add new items
-        for item_data in build_update.build_items:
-            # Check if item exists
-            item = db.query(Item).filter(Item.id == item_data.item_id).first()
-            if not item:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Item with ID {item_data.item_id} not found"
-                )
-            
-            # Create build item
-            build_item = BuildItem(
-                build_id=build_id,
-                item_id=item_data.item_id,
-                slot=item_data.slot
-            )
-            db.add(build_item)
-    
-    # Update skills if provided
+        items = [(item.item_id, item.slot) for item in build_update.build_items]
+    skills = None
     if build_update.build_skills is not None:
-        # Remove existing skills
-        for build_skill in db_build.build_skills:
-            db.delete(build_skill)
-        
-        # Add new skills
-        for skill_data in build_update.build_skills:
-            # Check if skill exists
-            skill = db.query(Skill).filter(Skill.id == skill_data.skill_id).first()
-            if not skill:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Skill with ID {skill_data.skill_id} not found"
-                )
-            
-            # Create build skill
-            build_skill = BuildSkill(
-                build_id=build_id,
-                skill_id=skill_data.skill_id
-            )
-            db.add(build_skill)
-    
-    # Update the timestamp
-    db_build.updated_at = datetime.utcnow()
-    
-    # Commit changes
-    db.commit()
-    db.refresh(db_build)
+        skills = [skill.skill_id for skill in build_update.build_skills]
     
-    return db_build
+    run_build_update(
+        build_id,
+        lambda version: apply_build_update(db, build_id, changes, items, skills, expected_version=version),
+        if_match
+    )
+    return reindex_build(load_build_response(build_id, response, db))
+
+@router.patch("/{build_id}/slots/{slot}", response_model=BuildResponse)
+async def update_build_slot(
+    build_id: int,
+    slot: str,
+    slot_update: BuildSlotUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Put an item into one slot of a build, or clear the slot with ``{"item_id": null}``.
+    """
+    run_build_update(
+        build_id,
+        lambda version: set_slot(db, build_id, slot, slot_update.item_id, expected_version=version),
+        if_match
+    )
+    return reindex_build(load_build_response(build_id, response, db))
 
 @router.delete("/{build_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_build(build_id: int, db: Session = Depends(get_db)):
@@ -274,7 +456,11 @@ async def delete_build(build_id: int, db: Session = Depends(get_db)):
         )
     
     # Delete the build (cascade will delete associated items and skills)
+    contents = ([bi.item_id for bi in build.build_items], [bs.skill_id for bs in build.build_skills])
+    record_build_changes(db, [(contents, None)])
+    record_build_stats(db, [(build.hero_id, contents, None)])
     db.delete(build)
     db.commit()
+    forget_build(build_id)
     
     return None
\ No newline at end of file
@@ -0,0 +1,76 @@
+# app/routes/debug_routes.py
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import FileResponse
+from typing import List, Optional
+
+from app.schemas.debug import InventorySessionStats, ProfileDetail, ProfileSummary, SlowQueryLogResponse
+from app.services.inventory_sessions import inventory_sessions
+from app.services.profiler import debug_access_allowed, profile_store
+from app.services.slow_queries import slow_query_log
+
+def require_debug_access(request: Request, x_debug_token: Optional[str] = Header(None)):
+    """Allow debug endpoints with the DEBUG_TOKEN header, or from loopback when no token is set."""
+    if not debug_access_allowed(x_debug_token, request.client.host if request.client else None):
+        raise HTTPException(status_code=403, detail="Debug token required")
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[Depends(require_debug_access)],
+    responses={403: {"description": "Debug token required"}},
+)
+
+@router.get("/slow-queries", response_model=SlowQueryLogResponse)
+async def get_slow_queries(limit: Optional[int] = None, flagged_only: bool = False):
+    """
+    Statements slower than SLOW_QUERY_MS, newest first, with their query plans.
+    Use flagged_only to list only full scans of items, skills or build_items.
+    """
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "total": slow_query_log.total,
+        "entries": slow_query_log.entries(limit, flagged_only)
+    }
+
+@router.delete("/slow-queries", status_code=204)
+async def clear_slow_queries():
+    """
+    Empty the slow-query buffer.
+    """
+    slow_query_log.clear()
+
+@router.get("/inventory-sessions", response_model=InventorySessionStats)
+async def get_inventory_sessions():
+    """
+    Open live inventory sessions and the memory their match state uses.
+    """
+    return inventory_sessions.stats()
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+async def list_profiles(limit: Optional[int] = 100):
+    """
+    Saved request profiles, newest first. Profile a request by sending it
+    with the X-Profile: 1 header or the __profile=1 query flag.
+    """
+    return profile_store.list(limit)
+
+@router.get("/profiles/{profile_id}", response_model=ProfileDetail)
+async def get_profile(profile_id: str):
+    """
+    Summary of one profile with its top frames by self and total samples.
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+@router.get("/profiles/{profile_id}/collapsed")
+async def download_profile(profile_id: str):
+    """
+    Download a profile as collapsed stacks (input for flamegraph.pl or speedscope).
+    """
+    path = profile_store.collapsed_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.collapsed")
@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 
-from ..database.database import get_db
+from ..database.database import SessionLocal, get_db
 from ..models.build import Build, BuildItem, BuildSkill
 from ..models.hero import Hero
-from ..models.item import Item
-from ..models.skill import Skill
+from ..services.inventory_match import (
+    DEFAULT_TOP_BUILDS,
+    ITEM,
+    MAX_TOP_BUILDS,
+    SKILL,
+    match_counters,
+    match_percentage
+)
+from ..services.inventory_sessions import (
+    DEFAULT_RANKING_SIZE,
+    MAX_RANKING_SIZE,
+    InventorySession,
+    SessionsFull,
+    inventory_sessions
+)
+from ..services.read_models import ItemRecord, SkillRecord, load_builds, records_by_id
 
 router = APIRouter(
     prefix="/inventory",
@@ -33,6 +47,32 @@ class BuildMatchResponse(BaseModel):
     class Config:
         from_attributes = True  # Updated from orm_mode to fix warning
 
+class RecommendRequest(InventoryBase):
+    # What the shop offers; if neither is given, everything the hero's builds use
+    candidate_item_ids: Optional[List[int]] = None
+    candidate_skill_ids: Optional[List[int]] = None
+
+class Recommendation(BaseModel):
+    type: str  # "item" or "skill"
+    id: int
+    name: str
+    gain: float  # Increase in the summed match percentage of the best-matching builds
+    builds: int  # Builds of the hero that use it
+
+class RecommendResponse(BaseModel):
+    hero_id: int
+    builds_considered: int
+    top_builds: int
+    current_score: float  # Summed match percentage of the best-matching builds now
+    recommendations: List[Recommendation]
+
+class SessionMessage(BaseModel):
+    op: str  # "set", "add" or "remove"
+    type: Optional[str] = None  # "item" or "skill", for add and remove
+    id: Optional[int] = None
+    item_ids: Optional[List[int]] = None  # for set
+    skill_ids: Optional[List[int]] = None
+
 @router.post("/match-builds", response_model=List[BuildMatchResponse])
 async def match_inventory_to_builds(
     inventory: InventoryBase,
@@ -44,15 +84,18 @@ async def match_inventory_to_builds(
     Returns a list of builds sorted by match percentage.
     """
     # Validate hero
-    hero = db.query(Hero).filter(Hero.id == inventory.hero_id).first()
+    hero = db.query(Hero.id, Hero.name).filter(Hero.id == inventory.hero_id).first()
     if not hero:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Hero with ID {inventory.hero_id} not found"
         )
     
-    # Get all builds for this hero
-    builds = db.query(Build).filter(Build.hero_id == inventory.hero_id).all()
+    # Get all builds for this hero as read-only records (three statements for any number of builds)
+    builds = load_builds(db, db.query(Build).filter(Build.hero_id == inventory.hero_id))
+    # Names of everything the builds use, for the missing lists
+    item_records = records_by_id(db, ItemRecord, (bi.item_id for build in builds for bi in build.build_items))
+    skill_records = records_by_id(db, SkillRecord, (bs.skill_id for build in builds for bs in build.build_skills))
     
     # Calculate match percentage for each build
     results = []
@@ -66,22 +109,12 @@ async def match_inventory_to_builds(
         matching_items = set(build_item_ids).intersection(set(inventory.item_ids))
         matching_skills = set(build_skill_ids).intersection(set(inventory.skill_ids))
         
-        # Calculate match percentages
-        if build_item_ids:
-            item_match_percentage = len(matching_items) / len(build_item_ids) * 100
-        else:
-            item_match_percentage = 100  # No items required
-            
-        if build_skill_ids:
-            skill_match_percentage = len(matching_skills) / len(build_skill_ids) * 100
-        else:
-            skill_match_percentage = 100  # No skills required
-        
-        # Calculate overall match percentage (weighted equally for now)
-        match_percentage = (item_match_percentage + skill_match_percentage) / 2
+        # Calculate overall match percentage (items and skills weighted equally for now)
+        percentage = match_percentage(len(matching_items), len(build_item_ids),
+                                      len(matching_skills), len(build_skill_ids))
         
         # Skip if match percentage is below threshold
-        if match_percentage < min_match_percentage:
+        if percentage < min_match_percentage:
             continue
         
         # Get missing items
@@ -89,7 +122,7 @@ async def match_inventory_to_builds(
         missing_items = []
         
         for item_id in missing_item_ids:
-            item = db.query(Item).filter(Item.id == item_id).first()
+            item = item_records.get(item_id)
             build_item = next((bi for bi in build.build_items if bi.item_id == item_id), None)
             
             if item:
@@ -104,7 +137,7 @@ async def match_inventory_to_builds(
         missing_skills = []
         
         for skill_id in missing_skill_ids:
-            skill = db.query(Skill).filter(Skill.id == skill_id).first()
+            skill = skill_records.get(skill_id)
             
             if skill:
                 missing_skills.append({
@@ -118,7 +151,7 @@ async def match_inventory_to_builds(
             "build_name": build.name,
             "hero_id": build.hero_id,
             "hero_name": hero.name,
-            "match_percentage": round(match_percentage, 2),
+            "match_percentage": round(percentage, 2),
             "missing_items": missing_items,
             "missing_skills": missing_skills
         })
@@ -126,4 +159,153 @@ async def match_inventory_to_builds(
     # Sort results by match percentage (highest first)
     results.sort(key=lambda x: x["match_percentage"], reverse=True)
     
-    return results
\ No newline at end of file
+    return results
+
+@router.post("/recommend", response_model=RecommendResponse)
+async def recommend_next_pick(
+    request: RecommendRequest,
+    top_builds: int = DEFAULT_TOP_BUILDS,
+    limit: int = 10,
+    db: Session = Depends(get_db)
+):
+    """
+    Rank the items and skills to pick next by how much closer they bring
+    the inventory to the hero's best-matching builds.
+    
+    A candidate's gain is the increase in the summed match percentage of
+    the ``top_builds`` best-matching builds, counting builds it lifts into
+    that top. The hero's builds are kept as posting lists that catch up
+    with writes; per-build match counters are computed once per request,
+    and each candidate only rescores the builds that use it.
+    """
+    if not 1 <= top_builds <= MAX_TOP_BUILDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"top_builds must be between 1 and {MAX_TOP_BUILDS}"
+        )
+    
+    hero = db.query(Hero.id).filter(Hero.id == request.hero_id).first()
+    if not hero:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Hero with ID {request.hero_id} not found"
+        )
+    
+    counters = match_counters(db, request.hero_id, request.item_ids, request.skill_ids)
+    candidates = None
+    if request.candidate_item_ids is not None or request.candidate_skill_ids is not None:
+        candidates = [(ITEM, item_id) for item_id in request.candidate_item_ids or []] + \
+                     [(SKILL, skill_id) for skill_id in request.candidate_skill_ids or []]
+    ranked = counters.recommend(top_builds, limit, candidates)
+    
+    item_records = records_by_id(db, ItemRecord, (entity_id for kind, entity_id, _, _ in ranked if kind == ITEM))
+    skill_records = records_by_id(db, SkillRecord, (entity_id for kind, entity_id, _, _ in ranked if kind == SKILL))
+    recommendations = []
+    for kind, entity_id, gain, builds in ranked:
+        record = (item_records if kind == ITEM else skill_records).get(entity_id)
+        if record:
+            recommendations.append({
+                "type": kind,
+                "id": entity_id,
+                "name": record.name,
+                "gain": round(gain, 2),
+                "builds": builds
+            })
+    
+    return {
+        "hero_id": request.hero_id,
+        "builds_considered": len(counters.order),
+        "top_builds": top_builds,
+        "current_score": round(counters.top_score(top_builds), 2),
+        "recommendations": recommendations
+    }
+
+def session_update(db: Session, session: InventorySession, rescored: int) -> dict:
+    """Message with the ranking entries that changed since the client's last update."""
+    changed, removed = session.diff()
+    names = {}
+    if changed:
+        names = dict(db.query(Build.id, Build.name).filter(Build.id.in_([build_id for _, build_id, _ in changed])).all())
+    return {
+        "type": "update",
+        "rescored": rescored,
+        "changed": [
+            {"rank": rank, "build_id": build_id, "build_name": names.get(build_id), "match_percentage": percentage}
+            for rank, build_id, percentage in changed
+        ],
+        "removed": removed
+    }
+
+def handle_session_message(db: Session, session: InventorySession, message: Optional[SessionMessage]) -> dict:
+    """Apply one client message to a session and return the update to send back.
+
+    ``None`` stands for the session's start, answered with the whole ranking.
+
+    Raises:
+        ValueError: If the message is not a valid change
+        SessionsFull: If the session's match state does not fit
+    """
+    if message is None or message.op == "set":
+        if message is not None:
+            session.set_inventory(message.item_ids or [], message.skill_ids or [])
+        inventory_sessions.refresh(db, session)
+        return session_update(db, session, len(session.counters.order))
+    if message.op not in ("add", "remove"):
+        raise ValueError(f"Unknown op {message.op!r}")
+    if message.type not in (ITEM, SKILL) or message.id is None:
+        raise ValueError(f"{message.op} needs a type of {ITEM!r} or {SKILL!r} and an id")
+    inventory_sessions.refresh(db, session)
+    rescored = session.change(message.type, message.id, message.op == "add")
+    return session_update(db, session, rescored)
+
+@router.websocket("/session")
+async def inventory_session(websocket: WebSocket, hero_id: int, limit: int = DEFAULT_RANKING_SIZE):
+    """
+    Live match ranking for an inventory that changes one item at a time.
+    
+    The server keeps per-build match counts for the session. Each message
+    (``{"op": "add" | "remove", "type": "item" | "skill", "id": ...}``, or
+    ``{"op": "set", "item_ids": [...], "skill_ids": [...]}`` to replace the
+    whole inventory) rescores only the builds containing the changed id,
+    and the reply carries only the ranking entries that changed. The
+    first message sent is the ranking of the empty inventory.
+    
+    Match state of idle sessions may be dropped when sessions together
+    exceed SESSION_MEMORY_MB; it is recomputed on their next message.
+    """
+    db = SessionLocal()
+    try:
+        if not 1 <= limit <= MAX_RANKING_SIZE or db.query(Hero.id).filter(Hero.id == hero_id).first() is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+    finally:
+        db.close()
+    
+    def respond(message: Optional[SessionMessage]) -> dict:
+        db = SessionLocal()
+        try:
+            return handle_session_message(db, session, message)
+        except ValueError as e:
+            return {"type": "error", "detail": str(e)}
+        finally:
+            db.close()
+    
+    await websocket.accept()
+    session = inventory_sessions.open(hero_id, limit)
+    try:
+        await websocket.send_json(respond(None))
+        while True:
+            try:
+                message = SessionMessage.model_validate(await websocket.receive_json())
+            except ValueError as e:
+                # Malformed JSON or fields (pydantic's ValidationError is a ValueError)
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+            await websocket.send_json(respond(message))
+    except SessionsFull as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        inventory_sessions.close(session)
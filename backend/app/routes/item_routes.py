@@ -1,12 +1,25 @@
 # app/routes/item_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
+from itertools import islice
 
 from app.database.database import get_db
-from app.schemas.item import ItemResponse, ItemCreate, ItemSize, ItemSource
+from app.schemas.batch import BatchLookupRequest
+from app.schemas.cooccurrence import ItemCooccurrenceResponse
+from app.schemas.item import ItemBatchResponse, ItemResponse, ItemCreate, ItemSearchResponse, ItemSize, ItemSource
+from app.schemas.synergy import ItemSynergyResponse
 from app.models.item import Item, ItemSize as ItemSizeModel, ItemSource as ItemSourceModel
+from app.models.tag import ItemTag
+from app.services.aggregate_stats import record_catalog_changes
+from app.services.bitmap import Bitmap
+from app.services.catalog import get_catalog, invalidate_catalog
+from app.services.catalog_payloads import catalog_response
+from app.services.cooccurrence import top_partners
+from app.services.read_models import MAX_BATCH_IDS, ItemRecord, lookup_batch, parse_id_list, project, project_one
+from app.services.synergy import get_synergy_graph
+from app.services.tag_index import ITEM, get_tag_index, in_bitmap, parse_tag_list, set_tags
 
 router = APIRouter(
     prefix="/items",
@@ -14,11 +27,11 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def convert_item_for_response(item: Item) -> Dict[str, Any]:
-    """Convert an Item model instance to a dictionary suitable for response.
+def convert_item_for_response(item: Union[Item, ItemRecord]) -> Dict[str, Any]:
+    """Convert an Item model instance or record to a dictionary suitable for response.
     
     Args:
-        item: Item model instance
+        item: Item model instance, or an ItemRecord from a read route
         
     Returns:
         Dictionary representation with string enum values
@@ -34,23 +47,37 @@ def convert_item_for_response(item: Item) -> Dict[str, Any]:
         "cooldown": item.cooldown,
         "effect": item.effect,
         "cost": item.cost,
+        "types": item.types,
         "enchantments": []  # We'll leave this empty for now as it's complex to load
     }
     return item_dict
 
-@router.get("/", response_model=List[ItemResponse])
-async def get_items(
-    skip: int = 0, 
-    limit: int = 100, 
+def build_item_query(
+    db: Session,
     name: Optional[str] = None,
     size: Optional[str] = None,
     source: Optional[str] = None,
     hero_id: Optional[int] = None,
     monster_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    types: Optional[str] = None,
+    types_all: Optional[str] = None,
+    types_none: Optional[str] = None
 ):
-    """
-    Get a list of items with optional filtering.
+    """Build an item query with the list filters applied.
+    
+    Args:
+        db: Database session
+        name: Case-insensitive substring of the item name
+        size: Only items of this size
+        source: Only items from this source
+        hero_id: Only items of this hero
+        monster_id: Only items of this monster
+        types: Comma-separated tags; items with any of them match
+        types_all: Comma-separated tags; items must have all of them
+        types_none: Comma-separated tags; items with any of them are dropped
+        
+    Returns:
+        The filtered query
     """
     query = db.query(Item)
     
@@ -75,53 +102,215 @@ async def get_items(
         query = query.filter(Item.hero_id == hero_id)
     if monster_id:
         query = query.filter(Item.monster_id == monster_id)
+    if types or types_all or types_none:
+        tag_ids = get_tag_index(db).match(
+            ITEM,
+            any_of=parse_tag_list(types),
+            all_of=parse_tag_list(types_all),
+            none_of=parse_tag_list(types_none)
+        )
+        query = query.filter(in_bitmap(Item.id, tag_ids))
+    
+    return query
+
+@router.get("/", response_model=List[ItemResponse])
+async def get_items(
+    request: Request,
+    skip: int = 0, 
+    limit: int = 100, 
+    name: Optional[str] = None,
+    size: Optional[str] = None,
+    source: Optional[str] = None,
+    hero_id: Optional[int] = None,
+    monster_id: Optional[int] = None,
+    types: Optional[str] = None,
+    types_all: Optional[str] = None,
+    types_none: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a list of items with optional filtering.
+    
+    Unfiltered pages are served from stored, precompressed bytes that are
+    rebuilt when the catalog changes.
+    """
+    def page():
+        query = build_item_query(db, name, size, source, hero_id, monster_id, types, types_all, types_none)
+        
+        # Get items and convert them for response
+        items = project(query.offset(skip).limit(limit), ItemRecord)
+        return [convert_item_for_response(item) for item in items]
+    
+    if any((name, size, source, hero_id, monster_id, types, types_all, types_none)):
+        return page()
+    return catalog_response(request, db, List[ItemResponse], page)
+
+@router.get("/search", response_model=ItemSearchResponse)
+async def search_items(
+    skip: int = 0, 
+    limit: int = 100, 
+    name: Optional[str] = None,
+    size: Optional[str] = None,
+    source: Optional[str] = None,
+    hero_id: Optional[int] = None,
+    monster_id: Optional[int] = None,
+    types: Optional[str] = None,
+    types_all: Optional[str] = None,
+    types_none: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Search items with the same filters as the list route, returning the
+    total match count and tag facets alongside the page of results.
+    """
+    query = build_item_query(db, name, size, source, hero_id, monster_id, types, types_all, types_none)
     
-    # Get items and convert them for response
-    items = query.offset(skip).limit(limit).all()
-    return [convert_item_for_response(item) for item in items]
+    matched = Bitmap(item_id for (item_id,) in query.with_entities(Item.id))
+    page = list(islice(matched, skip, skip + limit))
+    items = project(db.query(Item).filter(Item.id.in_(page)).order_by(Item.id), ItemRecord) if page else []
+    
+    return {
+        "total": len(matched),
+        "results": [convert_item_for_response(item) for item in items],
+        "facets": get_tag_index(db).facets(ITEM, matched)
+    }
+
+def resolve_item_batch(ids: List[int], db: Session) -> Dict[str, Any]:
+    """Look up items by ID with one query.
+    
+    Args:
+        ids: Requested item IDs
+        db: Database session
+        
+    Returns:
+        Response dictionary with the found items keyed by ID and the missing IDs
+    """
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} IDs per request")
+    found, missing = lookup_batch(db, ItemRecord, ids)
+    return {
+        "items": {item_id: convert_item_for_response(item) for item_id, item in found.items()},
+        "missing": missing
+    }
+
+@router.get("/batch", response_model=ItemBatchResponse)
+async def get_items_batch(ids: str, db: Session = Depends(get_db)):
+    """
+    Get many items by ID in one request, e.g. ``/items/batch?ids=1,2,3``.
+    """
+    try:
+        id_list = parse_id_list(ids)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    return resolve_item_batch(id_list, db)
+
+@router.post("/batch", response_model=ItemBatchResponse)
+async def post_items_batch(request: BatchLookupRequest, db: Session = Depends(get_db)):
+    """
+    Get many items by ID in one request, for lists too long for a query string.
+    """
+    return resolve_item_batch(request.ids, db)
 
 @router.get("/{item_id}", response_model=ItemResponse)
 async def get_item(item_id: int, db: Session = Depends(get_db)):
     """
     Get a specific item by ID.
     """
-    item = db.query(Item).filter(Item.id == item_id).first()
+    item = project_one(db.query(Item).filter(Item.id == item_id), ItemRecord)
     if item is None:
         raise HTTPException(status_code=404, detail="Item not found")
     
     return convert_item_for_response(item)
 
+@router.get("/{item_id}/synergies", response_model=ItemSynergyResponse)
+async def get_item_synergies(item_id: int, limit: int = 20, db: Session = Depends(get_db)):
+    """
+    Get the items that synergize with a specific item, strongest first.
+    
+    Served from the precomputed synergy graph for the current catalog version.
+    """
+    catalog = get_catalog(db)
+    if item_id not in catalog.items:
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    graph = get_synergy_graph(catalog)
+    synergies = [
+        {"item_id": partner_id, "name": catalog.items[partner_id].name, "weight": weight}
+        for partner_id, weight in graph.synergies(item_id, limit)
+    ]
+    return {"item_id": item_id, "catalog_version": graph.version, "synergies": synergies}
+
+@router.get("/{item_id}/co-occurrence", response_model=ItemCooccurrenceResponse)
+async def get_item_cooccurrence(item_id: int, limit: int = 20, db: Session = Depends(get_db)):
+    """
+    Get the items and skills most often used in the same builds as an item.
+    
+    Served from co-occurrence counts that build writes keep up to date.
+    """
+    catalog = get_catalog(db)
+    if item_id not in catalog.items:
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    builds, items, skills = top_partners(db, item_id, limit)
+    
+    def share(count: int) -> float:
+        return round(count / builds, 4) if builds else 0.0
+    
+    return {
+        "item_id": item_id,
+        "builds": builds,
+        "items": [
+            {"item_id": partner_id, "name": catalog.items[partner_id].name, "builds": count, "share": share(count)}
+            for partner_id, count in items if partner_id in catalog.items
+        ],
+        "skills": [
+            {"skill_id": skill_id, "name": catalog.skills[skill_id].name, "builds": count, "share": share(count)}
+            for skill_id, count in skills if skill_id in catalog.skills
+        ],
+    }
+
 @router.get("/hero/{hero_id}", response_model=List[ItemResponse])
-async def get_items_by_hero(hero_id: int, db: Session = Depends(get_db)):
+async def get_items_by_hero(hero_id: int, request: Request, db: Session = Depends(get_db)):
     """
-    Get all items for a specific hero.
+    Get all items for a specific hero (stored, precompressed per catalog version).
     """
-    items = db.query(Item).filter(Item.hero_id == hero_id).all()
-    return [convert_item_for_response(item) for item in items]
+    def hero_items():
+        items = project(db.query(Item).filter(Item.hero_id == hero_id), ItemRecord)
+        return [convert_item_for_response(item) for item in items]
+    
+    return catalog_response(request, db, List[ItemResponse], hero_items)
 
 @router.get("/size/{size}", response_model=List[ItemResponse])
-async def get_items_by_size(size: str, db: Session = Depends(get_db)):
+async def get_items_by_size(size: str, request: Request, db: Session = Depends(get_db)):
     """
-    Get all items of a specific size.
+    Get all items of a specific size (stored, precompressed per catalog version).
     """
     try:
         size_enum = ItemSizeModel(size)
-        items = db.query(Item).filter(Item.size == size_enum).all()
-        return [convert_item_for_response(item) for item in items]
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid size value: {size}")
+    
+    def sized_items():
+        items = project(db.query(Item).filter(Item.size == size_enum), ItemRecord)
+        return [convert_item_for_response(item) for item in items]
+    
+    return catalog_response(request, db, List[ItemResponse], sized_items)
 
 @router.get("/source/{source}", response_model=List[ItemResponse])
-async def get_items_by_source(source: str, db: Session = Depends(get_db)):
+async def get_items_by_source(source: str, request: Request, db: Session = Depends(get_db)):
     """
-    Get all items from a specific source.
+    Get all items from a specific source (stored, precompressed per catalog version).
     """
     try:
         source_enum = ItemSourceModel(source)
-        items = db.query(Item).filter(Item.source == source_enum).all()
-        return [convert_item_for_response(item) for item in items]
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid source value: {source}")
+    
+    def source_items():
+        items = project(db.query(Item).filter(Item.source == source_enum), ItemRecord)
+        return [convert_item_for_response(item) for item in items]
+    
+    return catalog_response(request, db, List[ItemResponse], source_items)
 
 @router.post("/", response_model=ItemResponse)
 async def create_item(item: ItemCreate, db: Session = Depends(get_db)):
@@ -143,11 +332,16 @@ async def create_item(item: ItemCreate, db: Session = Depends(get_db)):
         monster_id=item.monster_id,
         cooldown=item.cooldown,
         effect=item.effect,
-        cost=item.cost
+        cost=item.cost,
+        types=item.types
     )
     db.add(db_item)
+    db.flush()
+    set_tags(db, ITEM, db_item.id, db_item.types)
+    record_catalog_changes(db, items=[(db_item, 1)])
     db.commit()
     db.refresh(db_item)
+    invalidate_catalog()
     
     return convert_item_for_response(db_item)
 
@@ -160,7 +354,10 @@ async def delete_item(item_id: int, db: Session = Depends(get_db)):
     if item is None:
         raise HTTPException(status_code=404, detail="Item not found")
     
+    db.query(ItemTag).filter(ItemTag.item_id == item.id).delete(synchronize_session=False)
+    record_catalog_changes(db, items=[(item, -1)])
     db.delete(item)
     db.commit()
+    invalidate_catalog()
     
     return convert_item_for_response(item)
\ No newline at end of file
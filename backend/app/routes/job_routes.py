@@ -0,0 +1,137 @@
+# app/routes/job_routes.py
+
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import List, Optional, Dict, Any
+
+from app.database.database import SessionLocal, get_db
+from app.models.job import Job
+from app.schemas.job import JobCreate, JobResponse
+from app.services.jobs import TERMINAL_STATUSES, job_manager
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    responses={404: {"description": "Not found"}},
+)
+
+# Seconds between database polls of a job's event stream
+EVENT_POLL_INTERVAL = 0.5
+
+def convert_job_for_response(job: Job) -> Dict[str, Any]:
+    """Convert a Job model instance to a dictionary suitable for response.
+    
+    Args:
+        job: Job model instance
+        
+    Returns:
+        Dictionary representation with decoded params and result
+    """
+    job_dict = {
+        "id": job.id,
+        "kind": job.kind,
+        "params": json.loads(job.params or "{}"),
+        "priority": job.priority or 0,
+        "status": job.status,
+        "cancel_requested": bool(job.cancel_requested),
+        "progress": job.progress or 0.0,
+        "message": job.message,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "attempts": job.attempts or 0,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at
+    }
+    return job_dict
+
+def get_job_or_404(db: Session, job_id: int) -> Job:
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/", response_model=JobResponse, status_code=202)
+async def submit_job(job: JobCreate, db: Session = Depends(get_db)):
+    """
+    Queue a background job.
+    
+    Submitting the same kind and parameters as a job that is still queued
+    or running returns that job instead of queueing a duplicate.
+    """
+    try:
+        db_job = job_manager.submit(db, job.kind, job.params, job.priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return convert_job_for_response(db_job)
+
+@router.get("/", response_model=List[JobResponse])
+async def get_jobs(
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a list of jobs, newest first, with optional filtering.
+    """
+    query = db.query(Job)
+    
+    # Apply filters if provided
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    
+    jobs = query.order_by(Job.id.desc()).offset(skip).limit(limit).all()
+    return [convert_job_for_response(job) for job in jobs]
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    Get the status, progress and result of a job.
+    """
+    return convert_job_for_response(get_job_or_404(db, job_id))
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    Cancel a job. Queued jobs are cancelled immediately; running jobs stop
+    at their next progress report.
+    """
+    job = get_job_or_404(db, job_id)
+    return convert_job_for_response(job_manager.cancel(db, job))
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: int, db: Session = Depends(get_db)):
+    """
+    Stream a job's progress as server-sent events until it finishes.
+    """
+    get_job_or_404(db, job_id)
+    
+    async def events():
+        last = None
+        while True:
+            poll_db = SessionLocal()
+            try:
+                job = poll_db.query(Job).filter(Job.id == job_id).first()
+                payload = convert_job_for_response(job)
+            finally:
+                poll_db.close()
+            
+            state = (payload["status"], payload["progress"], payload["message"])
+            if state != last:
+                last = state
+                data = json.dumps(payload, default=str)
+                yield f"event: progress\ndata: {data}\n\n"
+            if payload["status"] in TERMINAL_STATUSES:
+                yield f"event: end\ndata: {json.dumps({'status': payload['status']})}\n\n"
+                return
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
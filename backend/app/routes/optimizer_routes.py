@@ -0,0 +1,43 @@
+# app/routes/optimizer_routes.py
+
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.database.database import get_db
+from app.models.hero import Hero
+from app.schemas.optimizer import OptimizerRequest, OptimizerResponse
+from app.services.catalog import get_catalog
+from app.simulation.optimizer import IslandOptimizer, OptimizerConfig
+
+router = APIRouter(
+    prefix="/optimizer",
+    tags=["optimizer"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.post("/run", response_model=OptimizerResponse)
+def run_optimizer(request: OptimizerRequest, db: Session = Depends(get_db)):
+    """
+    Search for boards and skill sets that trade off win rate against cost.
+    
+    Runs the island-model genetic optimizer and returns its Pareto front.
+    This is a plain (non-async) route so the search runs in the threadpool
+    instead of blocking the event loop.
+    """
+    hero = db.query(Hero).filter(Hero.id == request.hero_id).first()
+    if hero is None:
+        raise HTTPException(status_code=404, detail="Hero not found")
+    
+    catalog = get_catalog(db)
+    unknown = {item_id for board in request.opponent_boards or [] for item_id in board} - set(catalog.items)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown opponent item IDs: {sorted(unknown)}")
+    
+    config = OptimizerConfig(**request.model_dump())
+    try:
+        result = IslandOptimizer(catalog, config).run()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return asdict(result)
@@ -0,0 +1,109 @@
+# app/routes/simulation_routes.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.database.database import get_db
+from app.models.build import Build
+from app.routes.debug_routes import require_debug_access
+from app.schemas.simulation import SimulationCacheStats, SimulationRequest, SimulationResponse
+from app.services.catalog import Catalog, get_catalog
+from app.simulation.cache import get_simulation_cache
+from app.simulation.engine import ENGINE_VERSION, TIER_COST_MULTIPLIER, Board, board_cost, default_opponents
+
+router = APIRouter(
+    prefix="/simulation",
+    tags=["simulation"],
+    responses={404: {"description": "Not found"}},
+)
+
+def run_cached_simulation(
+    catalog: Catalog,
+    item_ids: List[int],
+    skill_ids: List[int],
+    tier: str = "Bronze",
+    opponent_boards: Optional[List[List[int]]] = None,
+    opponents: int = 4,
+    fights_per_opponent: int = 4,
+    seed: int = 0,
+    base_health: float = 300.0
+):
+    """Simulate a board through the result cache and return the response dictionary.
+    
+    Raises:
+        HTTPException: If the tier, or any item or skill ID, is not in the catalog
+    """
+    if tier not in TIER_COST_MULTIPLIER:
+        raise HTTPException(status_code=400, detail=f"Unknown tier {tier!r}; expected one of {list(TIER_COST_MULTIPLIER)}")
+    unknown_items = (set(item_ids) | {i for board in opponent_boards or [] for i in board}) - set(catalog.items)
+    unknown_skills = set(skill_ids) - set(catalog.skills)
+    if unknown_items or unknown_skills:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown item IDs {sorted(unknown_items)}, skill IDs {sorted(unknown_skills)}"
+        )
+    
+    board = Board.from_ids(item_ids, skill_ids, tier)
+    if opponent_boards:
+        rivals = [Board.from_ids(ids, tier=tier) for ids in opponent_boards]
+    else:
+        rivals = default_opponents(catalog, opponents, seed, tier)
+    
+    score = get_simulation_cache().win_rate(board, rivals, catalog, fights_per_opponent, seed, base_health)
+    return {
+        "win_rate": score,
+        "cost": board_cost(board, catalog),
+        "engine_version": ENGINE_VERSION,
+        "effects_version": catalog.effects_version
+    }
+
+@router.post("/win-rate", response_model=SimulationResponse)
+def simulate_board(request: SimulationRequest, db: Session = Depends(get_db)):
+    """
+    Simulate a board against a set of opponents and return its win rate.
+    
+    Results are served from the simulation cache when the same board has
+    been simulated before under the same engine, effect data and seed.
+    """
+    return run_cached_simulation(get_catalog(db), **request.model_dump())
+
+@router.get("/builds/{build_id}", response_model=SimulationResponse)
+def simulate_build(
+    build_id: int,
+    tier: str = "Bronze",
+    opponents: int = Query(4, ge=1, le=50, description="Number of generated opponents"),
+    fights_per_opponent: int = Query(4, ge=1, le=100, description="Fights simulated against each opponent"),
+    seed: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Simulate a saved build against generated opponents.
+    """
+    build = db.query(Build).filter(Build.id == build_id).first()
+    if build is None:
+        raise HTTPException(status_code=404, detail=f"Build with ID {build_id} not found")
+    
+    item_ids = [bi.item_id for bi in sorted(build.build_items, key=lambda bi: bi.id)]
+    skill_ids = [bs.skill_id for bs in build.build_skills]
+    return run_cached_simulation(
+        get_catalog(db), item_ids, skill_ids, tier,
+        opponents=opponents, fights_per_opponent=fights_per_opponent, seed=seed
+    )
+
+@router.get("/cache", response_model=SimulationCacheStats)
+def get_cache_stats():
+    """
+    Get hit/miss counters and sizes of the simulation result cache.
+    """
+    return get_simulation_cache().snapshot()
+
+@router.delete("/cache", status_code=204, dependencies=[Depends(require_debug_access)])
+def clear_cache():
+    """
+    Empty both tiers of the simulation result cache.
+    
+    Guarded like the debug routes: DEBUG_TOKEN header, or loopback only.
+    """
+    get_simulation_cache().clear()
+    return None
@@ -1,13 +1,22 @@
 # app/routes/skill_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
+from itertools import islice
 import json
 
 from app.database.database import get_db
-from app.schemas.skill import Skill as SkillSchema, SkillCreate
+from app.schemas.batch import BatchLookupRequest
+from app.schemas.skill import Skill as SkillSchema, SkillBatchResponse, SkillCreate, SkillSearchResponse
 from app.models.skill import Skill, SkillSource
+from app.models.tag import SkillTag
+from app.services.aggregate_stats import record_catalog_changes
+from app.services.bitmap import Bitmap
+from app.services.catalog import invalidate_catalog
+from app.services.catalog_payloads import catalog_response
+from app.services.read_models import MAX_BATCH_IDS, SkillRecord, lookup_batch, parse_id_list, project, project_one
+from app.services.tag_index import SKILL, get_tag_index, in_bitmap, parse_tag_list, set_tags
 
 router = APIRouter(
     prefix="/skills",
@@ -15,11 +24,11 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def convert_skill_for_response(skill: Skill) -> Dict[str, Any]:
-    """Convert a Skill model instance to a dictionary suitable for response.
+def convert_skill_for_response(skill: Union[Skill, SkillRecord]) -> Dict[str, Any]:
+    """Convert a Skill model instance or record to a dictionary suitable for response.
     
     Args:
-        skill: Skill model instance
+        skill: Skill model instance, or a SkillRecord from a read route
         
     Returns:
         Dictionary representation with string enum values
@@ -37,19 +46,30 @@ def convert_skill_for_response(skill: Skill) -> Dict[str, Any]:
     }
     return skill_dict
 
-@router.get("/", response_model=List[SkillSchema])
-async def get_skills(
-    skip: int = 0, 
-    limit: int = 100, 
+def build_skill_query(
+    db: Session,
     name: Optional[str] = None,
     hero_id: Optional[int] = None,
     source: Optional[str] = None,
     tier: Optional[str] = None,
     types: Optional[str] = None,
-    db: Session = Depends(get_db)
+    types_all: Optional[str] = None,
+    types_none: Optional[str] = None
 ):
-    """
-    Get a list of skills with optional filtering.
+    """Build a skill query with the list filters applied.
+    
+    Args:
+        db: Database session
+        name: Case-insensitive substring of the skill name
+        hero_id: Only skills of this hero
+        source: Only skills from this source
+        tier: Only skills of this tier
+        types: Comma-separated tags; skills with any of them match
+        types_all: Comma-separated tags; skills must have all of them
+        types_none: Comma-separated tags; skills with any of them are dropped
+        
+    Returns:
+        The filtered query
     """
     query = db.query(Skill)
     
@@ -67,46 +87,147 @@ async def get_skills(
             pass
     if tier:
         query = query.filter(Skill.tier == tier)
-    if types:
-        # Filter by any of the types in the comma-separated list
-        type_list = [t.strip() for t in types.split(',')]
-        conditions = []
-        for t in type_list:
-            conditions.append(Skill.types.ilike(f"%{t}%"))
-        if conditions:
-            from sqlalchemy import or_
-            query = query.filter(or_(*conditions))
-    
-    # Get skills and convert them for response
-    skills = query.offset(skip).limit(limit).all()
-    return [convert_skill_for_response(skill) for skill in skills]
+    
+    if types or types_all or types_none:
+        # Exact tag matches from the in-memory index ("Shield" no longer matches "ShieldReference")
+        tag_ids = get_tag_index(db).match(
+            SKILL,
+            any_of=parse_tag_list(types),
+            all_of=parse_tag_list(types_all),
+            none_of=parse_tag_list(types_none)
+        )
+        query = query.filter(in_bitmap(Skill.id, tag_ids))
+    
+    return query
+
+@router.get("/", response_model=List[SkillSchema])
+async def get_skills(
+    request: Request,
+    skip: int = 0, 
+    limit: int = 100, 
+    name: Optional[str] = None,
+    hero_id: Optional[int] = None,
+    source: Optional[str] = None,
+    tier: Optional[str] = None,
+    types: Optional[str] = None,
+    types_all: Optional[str] = None,
+    types_none: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a list of skills with optional filtering.
+    
+    Unfiltered pages are served from stored, precompressed bytes that are
+    rebuilt when the catalog changes.
+    """
+    def page():
+        query = build_skill_query(db, name, hero_id, source, tier, types, types_all, types_none)
+        
+        # Get skills and convert them for response
+        skills = project(query.offset(skip).limit(limit), SkillRecord)
+        return [convert_skill_for_response(skill) for skill in skills]
+    
+    if any((name, hero_id, source, tier, types, types_all, types_none)):
+        return page()
+    return catalog_response(request, db, List[SkillSchema], page)
+
+@router.get("/search", response_model=SkillSearchResponse)
+async def search_skills(
+    skip: int = 0, 
+    limit: int = 100, 
+    name: Optional[str] = None,
+    hero_id: Optional[int] = None,
+    source: Optional[str] = None,
+    tier: Optional[str] = None,
+    types: Optional[str] = None,
+    types_all: Optional[str] = None,
+    types_none: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Search skills with the same filters as the list route, returning the
+    total match count and tag facets alongside the page of results.
+    """
+    query = build_skill_query(db, name, hero_id, source, tier, types, types_all, types_none)
+    
+    matched = Bitmap(skill_id for (skill_id,) in query.with_entities(Skill.id))
+    page = list(islice(matched, skip, skip + limit))
+    skills = project(db.query(Skill).filter(Skill.id.in_(page)).order_by(Skill.id), SkillRecord) if page else []
+    
+    return {
+        "total": len(matched),
+        "results": [convert_skill_for_response(skill) for skill in skills],
+        "facets": get_tag_index(db).facets(SKILL, matched)
+    }
+
+def resolve_skill_batch(ids: List[int], db: Session) -> Dict[str, Any]:
+    """Look up skills by ID with one query.
+    
+    Args:
+        ids: Requested skill IDs
+        db: Database session
+        
+    Returns:
+        Response dictionary with the found skills keyed by ID and the missing IDs
+    """
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} IDs per request")
+    found, missing = lookup_batch(db, SkillRecord, ids)
+    return {
+        "skills": {skill_id: convert_skill_for_response(skill) for skill_id, skill in found.items()},
+        "missing": missing
+    }
+
+@router.get("/batch", response_model=SkillBatchResponse)
+async def get_skills_batch(ids: str, db: Session = Depends(get_db)):
+    """
+    Get many skills by ID in one request, e.g. ``/skills/batch?ids=1,2,3``.
+    """
+    try:
+        id_list = parse_id_list(ids)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    return resolve_skill_batch(id_list, db)
+
+@router.post("/batch", response_model=SkillBatchResponse)
+async def post_skills_batch(request: BatchLookupRequest, db: Session = Depends(get_db)):
+    """
+    Get many skills by ID in one request, for lists too long for a query string.
+    """
+    return resolve_skill_batch(request.ids, db)
 
 @router.get("/{skill_id}", response_model=SkillSchema)
 async def get_skill(skill_id: int, db: Session = Depends(get_db)):
     """
     Get a specific skill by ID.
     """
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
+    skill = project_one(db.query(Skill).filter(Skill.id == skill_id), SkillRecord)
     if skill is None:
         raise HTTPException(status_code=404, detail="Skill not found")
     
     return convert_skill_for_response(skill)
 
 @router.get("/hero/{hero_id}", response_model=List[SkillSchema])
-async def get_skills_by_hero(hero_id: int, db: Session = Depends(get_db)):
+async def get_skills_by_hero(hero_id: int, request: Request, db: Session = Depends(get_db)):
     """
-    Get all skills for a specific hero.
+    Get all skills for a specific hero (stored, precompressed per catalog version).
     """
-    skills = db.query(Skill).filter(Skill.hero_id == hero_id).all()
-    return [convert_skill_for_response(skill) for skill in skills]
+    def hero_skills():
+        skills = project(db.query(Skill).filter(Skill.hero_id == hero_id), SkillRecord)
+        return [convert_skill_for_response(skill) for skill in skills]
+    
+    return catalog_response(request, db, List[SkillSchema], hero_skills)
 
 @router.get("/tier/{tier}", response_model=List[SkillSchema])
-async def get_skills_by_tier(tier: str, db: Session = Depends(get_db)):
+async def get_skills_by_tier(tier: str, request: Request, db: Session = Depends(get_db)):
     """
-    Get all skills of a specific tier.
+    Get all skills of a specific tier (stored, precompressed per catalog version).
     """
-    skills = db.query(Skill).filter(Skill.tier == tier).all()
-    return [convert_skill_for_response(skill) for skill in skills]
+    def tier_skills():
+        skills = project(db.query(Skill).filter(Skill.tier == tier), SkillRecord)
+        return [convert_skill_for_response(skill) for skill in skills]
+    
+    return catalog_response(request, db, List[SkillSchema], tier_skills)
 
 @router.post("/", response_model=SkillSchema)
 async def create_skill(skill: SkillCreate, db: Session = Depends(get_db)):
@@ -129,8 +250,12 @@ async def create_skill(skill: SkillCreate, db: Session = Depends(get_db)):
         types=skill.types
     )
     db.add(db_skill)
+    db.flush()
+    set_tags(db, SKILL, db_skill.id, db_skill.types)
+    record_catalog_changes(db, skills=[(db_skill, 1)])
     db.commit()
     db.refresh(db_skill)
+    invalidate_catalog()
     
     return convert_skill_for_response(db_skill)
 
@@ -143,7 +268,10 @@ async def delete_skill(skill_id: int, db: Session = Depends(get_db)):
     if skill is None:
         raise HTTPException(status_code=404, detail="Skill not found")
     
+    db.query(SkillTag).filter(SkillTag.skill_id == skill.id).delete(synchronize_session=False)
+    record_catalog_changes(db, skills=[(skill, -1)])
     db.delete(skill)
     db.commit()
+    invalidate_catalog()
     
     return convert_skill_for_response(skill)
\ No newline at end of file
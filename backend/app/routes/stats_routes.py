@@ -0,0 +1,52 @@
+# app/routes/stats_routes.py
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database.database import get_db
+from app.models.hero import Hero
+from app.schemas.stats import StatsResponse
+from app.services.aggregate_stats import read_stats
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["stats"],
+)
+
+def share(part: int, total: int) -> float:
+    return round(part / total, 4) if total else 0.0
+
+@router.get("/", response_model=StatsResponse)
+async def get_stats(db: Session = Depends(get_db)):
+    """
+    Dashboard counts: builds per hero, item usage by size and source, and
+    skill tiers.
+    
+    Read from aggregate tables that every write keeps current, so the cost
+    does not grow with the number of builds. Reconcile them against the
+    base tables with app/utils/run_stats_reconcile.py.
+    """
+    stats = read_stats(db)
+    hero_names = dict(db.query(Hero.id, Hero.name).filter(Hero.id.in_([row[0] for row in stats["heroes"]])).all())
+    
+    builds = sum(count for _, count in stats["heroes"])
+    item_uses = sum(uses for _, _, _, uses in stats["items"])
+    skill_uses = sum(uses for _, _, uses in stats["skills"])
+    return {
+        "builds": builds,
+        "items": sum(count for _, _, count, _ in stats["items"]),
+        "skills": sum(count for _, count, _ in stats["skills"]),
+        "heroes": [
+            {"hero_id": hero_id, "hero_name": hero_names.get(hero_id), "builds": count, "share": share(count, builds)}
+            for hero_id, count in sorted(stats["heroes"], key=lambda row: (-row[1], row[0]))
+        ],
+        "item_usage": [
+            {"size": size or None, "source": source or None, "items": count, "build_uses": uses,
+             "share": share(uses, item_uses)}
+            for size, source, count, uses in sorted(stats["items"], key=lambda row: (-row[3], row[0], row[1]))
+        ],
+        "skill_tiers": [
+            {"tier": tier or None, "skills": count, "build_uses": uses, "share": share(uses, skill_uses)}
+            for tier, count, uses in sorted(stats["skills"], key=lambda row: (-row[2], row[0]))
+        ]
+    }
@@ -0,0 +1,7 @@
+# app/schemas/batch.py
+
+from pydantic import BaseModel, Field
+from typing import List
+
+class BatchLookupRequest(BaseModel):
+    ids: List[int] = Field(..., description="IDs to resolve; duplicates are resolved once")
@@ -45,6 +45,8 @@ class BuildResponse(BuildBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    version: int
+    fingerprint: Optional[str] = None
     build_items: List[BuildItemResponse]
     build_skills: List[BuildSkillResponse]
     
@@ -56,6 +58,8 @@ class BuildDetailedResponse(BuildBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    version: int
+    fingerprint: Optional[str] = None
     hero_name: str
     items: List[dict]  # Will contain detailed item info
     skills: List[dict]  # Will contain detailed skill info
@@ -63,6 +67,35 @@ class BuildDetailedResponse(BuildBase):
     class Config:
         from_attributes = True  # Updated from orm_mode
 
+# Bulk creation
+class BuildBulkCreate(BaseModel):
+    builds: List[BuildCreate]
+    all_or_nothing: bool = False  # Create nothing if any build is invalid
+
+class BuildBulkResult(BaseModel):
+    index: int  # Position of the build in the request
+    status: str  # "created", "duplicate", "invalid", or "skipped" (valid, but the request was all-or-nothing)
+    build_id: Optional[int] = None
+    errors: List[str] = []
+
+class BuildBulkResponse(BaseModel):
+    created: int
+    duplicates: int  # Builds that already existed; their result holds the existing build's ID
+    failed: int
+    results: List[BuildBulkResult]
+
+# Similar builds
+class SimilarBuild(BaseModel):
+    build_id: int
+    name: str
+    hero_id: int
+    similarity: float  # Jaccard similarity of the two builds' item and skill sets
+
+class SimilarBuildsResponse(BaseModel):
+    build_id: int
+    candidates: int  # Builds compared after the LSH lookup
+    similar: List[SimilarBuild]
+
 # Update schemas
 class BuildItemUpdate(BuildItemBase):
     pass
@@ -74,4 +107,7 @@ class BuildUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     build_items: Optional[List[BuildItemCreate]] = None
-    build_skills: Optional[List[BuildSkillCreate]] = None
\ No newline at end of file
+    build_skills: Optional[List[BuildSkillCreate]] = None
+
+class BuildSlotUpdate(BaseModel):
+    item_id: Optional[int] = None  # None clears the slot
\ No newline at end of file
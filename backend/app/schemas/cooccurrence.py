@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class CooccurringItem(BaseModel):
+    item_id: int = Field(..., description="ID of the partner item")
+    name: str = Field(..., description="Name of the partner item")
+    builds: int = Field(..., description="Builds containing both items")
+    share: float = Field(..., description="Share of the builds with the item that also contain the partner")
+
+class CooccurringSkill(BaseModel):
+    skill_id: int = Field(..., description="ID of the skill")
+    name: str = Field(..., description="Name of the skill")
+    builds: int = Field(..., description="Builds containing both the item and the skill")
+    share: float = Field(..., description="Share of the builds with the item that also take the skill")
+
+class ItemCooccurrenceResponse(BaseModel):
+    item_id: int = Field(..., description="The item the counts are for")
+    builds: int = Field(..., description="Builds containing the item")
+    items: List[CooccurringItem] = Field(default_factory=list, description="Items most often in the same build")
+    skills: List[CooccurringSkill] = Field(default_factory=list, description="Skills most often in the same build")
@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+class SlowQueryEntry(BaseModel):
+    id: int
+    timestamp: str
+    duration_ms: float
+    statement: str = Field(..., description="SQL with literals replaced by ? and IN lists shortened")
+    parameters: str = Field(..., description="Parameter types, never values")
+    method: Optional[str] = None
+    route: Optional[str] = Field(None, description="Route template of the request that ran the statement")
+    call_site: Optional[str] = Field(None, description="Innermost application frame, file:line in function")
+    plan: List[str] = Field(default_factory=list, description="EXPLAIN QUERY PLAN details")
+    full_scans: List[str] = Field(default_factory=list, description="Tables scanned without an index")
+    flagged_tables: List[str] = Field(default_factory=list, description="Full scans of items, skills or build_items")
+    flagged: bool
+
+class SlowQueryLogResponse(BaseModel):
+    threshold_ms: float
+    total: int = Field(..., description="Slow statements seen since start, including ones dropped from the buffer")
+    entries: List[SlowQueryEntry]
+
+class ProfileSummary(BaseModel):
+    id: str
+    created_at: str
+    trigger: str = Field(..., description="header, query or sampled")
+    method: str
+    path: str
+    route: Optional[str] = None
+    status: int
+    duration_ms: float
+    samples: int
+    interval_ms: float
+
+class ProfileFrame(BaseModel):
+    frame: str
+    samples: int
+    percent: float
+
+class ProfileDetail(ProfileSummary):
+    top_frames: Dict[str, List[ProfileFrame]] = Field(..., description="Top frames by self and total samples")
+
+class InventorySessionStats(BaseModel):
+    sessions: int = Field(..., description="Open inventory WebSocket sessions")
+    holding_state: int = Field(..., description="Sessions whose match state is in memory")
+    memory_bytes: int = Field(..., description="Estimated size of that state")
+    memory_cap_bytes: int
+    evictions: int = Field(..., description="Times an idle session's state was dropped since start")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 from .enchantment import EnchantmentResponse  # Import the EnchantmentResponse
 
@@ -23,6 +23,7 @@ class ItemBase(BaseModel):
     cooldown: Optional[int] = Field(None, description="Cooldown of the item in turns")
     effect: str = Field(..., description="Effect of the item when used")
     cost: Optional[int] = Field(None, description="Cost to purchase the item if available from merchant")
+    types: Optional[str] = Field(None, description="Comma-separated item types (Weapon, Tech, etc.)")
     
 class ItemCreate(ItemBase):
     pass
@@ -32,4 +33,13 @@ class ItemResponse(ItemBase):
     enchantments: List[EnchantmentResponse] = Field(default_factory=list, description="Enchantments applied to this item")
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ItemSearchResponse(BaseModel):
+    total: int = Field(..., description="Number of items matching the filters")
+    results: List[ItemResponse] = Field(default_factory=list, description="The requested page of matching items")
+    facets: Dict[str, int] = Field(default_factory=dict, description="Number of matching items carrying each tag")
+
+class ItemBatchResponse(BaseModel):
+    items: Dict[int, ItemResponse] = Field(default_factory=dict, description="Found items keyed by ID")
+    missing: List[int] = Field(default_factory=list, description="Requested IDs with no item, in request order")
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class JobCreate(BaseModel):
+    kind: str = Field(..., description="Job kind: simulate, optimize or import")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Fields of SimulationRequest (simulate) or OptimizerRequest (optimize); import takes none")
+    priority: int = Field(0, description="Higher priorities run first")
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    params: Dict[str, Any]
+    priority: int
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    cancel_requested: bool
+    progress: float = Field(..., description="Fraction complete, from 0 to 1")
+    message: Optional[str] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class OptimizerRequest(BaseModel):
+    hero_id: int = Field(..., description="The hero to optimize a board for")
+    tier: str = Field("Bronze", description="Tier of every item on the board")
+    include_universal: bool = Field(True, description="Include universal items and skills in the pool")
+    include_monster: bool = Field(True, description="Include monster items and skills in the pool")
+    max_skills: int = Field(2, ge=0, le=10, description="Maximum number of skills per board")
+    islands: Optional[int] = Field(None, ge=1, le=64, description="Number of islands (defaults to one per core)")
+    population_size: int = Field(24, ge=2, le=500, description="Boards per island")
+    generations: int = Field(30, ge=1, le=1000, description="Generations to run")
+    migration_interval: int = Field(5, ge=1, le=1000, description="Generations between migrations; more than generations means no migration")
+    migration_size: int = Field(2, ge=0, le=500, description="Boards sent to the next island on each migration")
+    opponent_boards: Optional[List[List[int]]] = Field(None, description="Opponent boards as item ID lists; generated from monster items if omitted")
+    fights_per_opponent: int = Field(2, ge=1, le=100, description="Fights simulated against each opponent")
+    seed: int = Field(0, description="Seed; the same seed and settings give the same result")
+    time_budget: Optional[float] = Field(30.0, gt=0, le=600, description="Wall-clock budget in seconds")
+
+class ParetoEntryResponse(BaseModel):
+    item_ids: List[int] = Field(..., description="Item IDs from left to right")
+    skill_ids: List[int] = Field(..., description="Selected skill IDs")
+    win_rate: float = Field(..., description="Fraction of simulated fights won")
+    cost: int = Field(..., description="Total cost of items and skills")
+
+class OptimizerResponse(BaseModel):
+    pareto_front: List[ParetoEntryResponse]
+    generations_completed: int
+    evaluations: int
+    elapsed_seconds: float
+    islands: int
+    seed: int
+    engine_version: str
+    stopped_by_budget: bool
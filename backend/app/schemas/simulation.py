@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class SimulationRequest(BaseModel):
+    item_ids: List[int] = Field(..., description="Item IDs from left to right")
+    skill_ids: List[int] = Field(default_factory=list, description="Selected skill IDs")
+    tier: str = Field("Bronze", description="Tier of every item on the board")
+    opponent_boards: Optional[List[List[int]]] = Field(None, description="Opponent boards as item ID lists; generated from monster items if omitted")
+    opponents: int = Field(4, ge=1, le=50, description="Number of generated opponents when no boards are given")
+    fights_per_opponent: int = Field(4, ge=1, le=100, description="Fights simulated against each opponent")
+    seed: int = Field(0, description="Seed for crits and targeting")
+    base_health: float = Field(300.0, gt=0, description="Starting health of both players")
+
+class SimulationResponse(BaseModel):
+    win_rate: float = Field(..., description="Fraction of simulated fights won")
+    cost: int = Field(..., description="Total cost of items and skills")
+    engine_version: str
+    effects_version: str
+
+class SimulationCacheStats(BaseModel):
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    stores: int
+    evictions: int
+    purged: int
+    hit_rate: float
+    memory_entries: int
+    disk_entries: Optional[int] = None
+    engine_version: str
+    effects_version: Optional[str] = None
@@ -1,7 +1,7 @@
 # app/schemas/skill.py
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
 class SkillSourceEnum(str, Enum):
@@ -43,5 +43,16 @@ class SkillInDB(Skill):
     """Schema for a skill as stored in the database."""
     pass
 
+class SkillSearchResponse(BaseModel):
+    """Schema for a page of skill search results with tag facets."""
+    total: int
+    results: List[Skill]
+    facets: Dict[str, int]
+
 # Define SkillResponse as an alias for Skill to maintain compatibility
-SkillResponse = Skill
\ No newline at end of file
+SkillResponse = Skill
+
+class SkillBatchResponse(BaseModel):
+    """Schema for skills looked up by ID, keyed by ID, with the IDs not found."""
+    skills: Dict[int, Skill]
+    missing: List[int]
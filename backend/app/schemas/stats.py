@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class HeroBuildStats(BaseModel):
+    hero_id: int
+    hero_name: Optional[str] = Field(None, description="None if the hero no longer exists")
+    builds: int
+    share: float = Field(..., description="Share of all builds")
+
+class ItemUsageStats(BaseModel):
+    size: Optional[str] = None
+    source: Optional[str] = None
+    items: int = Field(..., description="Items of this size and source in the catalog")
+    build_uses: int = Field(..., description="Uses in builds, counting an item once per build")
+    share: float = Field(..., description="Share of all item uses in builds")
+
+class SkillTierStats(BaseModel):
+    tier: Optional[str] = None
+    skills: int = Field(..., description="Skills starting at this tier in the catalog")
+    build_uses: int = Field(..., description="Uses in builds, counting a skill once per build")
+    share: float = Field(..., description="Share of all skill uses in builds")
+
+class StatsResponse(BaseModel):
+    builds: int = Field(..., description="Builds of every hero")
+    items: int = Field(..., description="Items in the catalog")
+    skills: int = Field(..., description="Skills in the catalog")
+    heroes: List[HeroBuildStats] = Field(default_factory=list, description="Most builds first")
+    item_usage: List[ItemUsageStats] = Field(default_factory=list, description="Most used first")
+    skill_tiers: List[SkillTierStats] = Field(default_factory=list, description="Most used first")
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class SynergyPartner(BaseModel):
+    item_id: int = Field(..., description="ID of the partner item")
+    name: str = Field(..., description="Name of the partner item")
+    weight: float = Field(..., description="Strength of the link; higher means more triggers or buffs connect the two")
+
+class ItemSynergyResponse(BaseModel):
+    item_id: int = Field(..., description="The item the synergies are for")
+    catalog_version: str = Field(..., description="Catalog version the graph was built from")
+    synergies: List[SynergyPartner] = Field(default_factory=list, description="Partner items, strongest first")
+
+class ItemPairSynergy(BaseModel):
+    item_ids: List[int]
+    weight: float
+
+class SkillItemSynergy(BaseModel):
+    skill_id: int
+    item_id: int
+    weight: float
+
+class BuildSynergyResponse(BaseModel):
+    build_id: int = Field(..., description="The scored build")
+    catalog_version: str = Field(..., description="Catalog version the graph was built from")
+    score: float = Field(..., description="Sum of every item-item and skill-item link in the build")
+    item_pairs: List[ItemPairSynergy] = Field(default_factory=list)
+    skill_item_pairs: List[SkillItemSynergy] = Field(default_factory=list)
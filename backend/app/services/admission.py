@@ -0,0 +1,228 @@
+# app/services/admission.py
+
+import asyncio
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Optional
+
+from app.services.metrics import registry
+
+READ = "read"
+WRITE = "write"
+COMPUTE = "compute"
+
+# Requests per second each client may make, and how many it may make at once
+ADMISSION_CLIENT_RATE = float(os.environ.get("ADMISSION_CLIENT_RATE", 20))
+ADMISSION_CLIENT_BURST = float(os.environ.get("ADMISSION_CLIENT_BURST", 40))
+# Clients whose buckets are remembered; the least recently seen are forgotten first
+ADMISSION_MAX_CLIENTS = int(os.environ.get("ADMISSION_MAX_CLIENTS", 10000))
+# Header naming the client when behind a proxy (e.g. x-forwarded-for); the peer address otherwise
+ADMISSION_CLIENT_HEADER = os.environ.get("ADMISSION_CLIENT_HEADER", "").lower()
+
+# Per route class: requests served at once, requests allowed to wait, and
+# seconds one may wait. SQLite has a single writer, so more concurrent
+# writes would only queue on its lock, where they hold a worker thread.
+ADMISSION_LIMITS = {
+    route_class: (
+        int(os.environ.get(f"ADMISSION_{route_class.upper()}_CONCURRENCY", concurrency)),
+        int(os.environ.get(f"ADMISSION_{route_class.upper()}_QUEUE", queue)),
+        float(os.environ.get(f"ADMISSION_{route_class.upper()}_WAIT", wait)),
+    )
+    for route_class, concurrency, queue, wait in (
+        (READ, 32, 128, 2.0),
+        (WRITE, 2, 32, 5.0),
+        (COMPUTE, 4, 16, 10.0),
+    )
+}
+
+# Simulations, optimizer runs and inventory matching take far longer than reads
+COMPUTE_PREFIXES = ("/optimizer", "/simulation", "/inventory/recommend", "/inventory/match-builds")
+# POST routes that only read
+READ_ONLY_POSTS = ("/items/batch", "/skills/batch")
+# Never queued or rate limited, so the server can be watched while overloaded
+EXEMPT_PATHS = ("/metrics",)
+# Event streams (server-sent events): rate limited but never queued
+STREAM_ROUTES = re.compile(r"^/jobs/\d+/events/?$")
+
+# Bounds of the Retry-After hint, in seconds
+MAX_RETRY_AFTER = 60
+
+class Rejected(Exception):
+    """Raised when a request is turned away.
+
+    Attributes:
+        reason: "rate_limited", "queue_full" or "queue_timeout"
+        retry_after: Seconds the client should wait before retrying
+    """
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = min(MAX_RETRY_AFTER, max(1, math.ceil(retry_after)))
+
+def route_class(method: str, path: str) -> str:
+    """Classify a request as READ, WRITE or COMPUTE by method and path."""
+    if path.startswith(COMPUTE_PREFIXES):
+        return COMPUTE
+    if method in ("GET", "HEAD") or path.rstrip("/") in READ_ONLY_POSTS:
+        return READ
+    return WRITE
+
+class ClientBuckets:
+    """Token bucket per client, refilled at ``rate`` tokens per second up to ``burst``."""
+
+    def __init__(self, rate: float, burst: float, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        # client -> [tokens, last refill]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client: str) -> None:
+        """Spend one token of ``client``'s bucket.
+
+        Raises:
+            Rejected: The bucket is empty ("rate_limited")
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                bucket = self._buckets[client] = [self.burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(client)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] < 1:
+                raise Rejected("rate_limited", (1 - bucket[0]) / self.rate if self.rate > 0 else MAX_RETRY_AFTER)
+            bucket[0] -= 1
+
+class RouteClassQueue:
+    """Concurrency limit with a bounded, first-come first-served wait queue.
+
+    Used from the event loop only. Waiting requests hold no thread or
+    database connection, and a request that cannot get a slot soon fails
+    at once instead of timing out later.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int, wait: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.wait = wait
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Moving average of how long a request holds its slot, for Retry-After
+        self._service_seconds = 0.05
+
+    def _retry_after(self) -> float:
+        return (len(self._waiters) + 1) * self._service_seconds / max(1, self.concurrency)
+
+    def _report(self) -> None:
+        registry.record_admission_state(self.name, self.in_flight, len(self._waiters))
+
+    async def acquire(self) -> None:
+        """Wait for a slot.
+
+        Raises:
+            Rejected: The queue is full ("queue_full") or no slot freed up
+                within ``wait`` seconds ("queue_timeout")
+        """
+        if self.in_flight < self.concurrency and not self._waiters:
+            self.in_flight += 1
+            self._report()
+            return
+        if len(self._waiters) >= self.queue:
+            raise Rejected("queue_full", self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._report()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.wait)
+        except asyncio.TimeoutError:
+            raise Rejected("queue_timeout", self._retry_after())
+        except BaseException:
+            # Client gone; hand on a slot that was granted meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self.release(self._service_seconds)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._report()
+        registry.record_admission_wait(self.name, time.perf_counter() - started)
+
+    def release(self, held: float) -> None:
+        """Free a slot, handing it to the longest waiting request if any.
+
+        Args:
+            held: Seconds the slot was held, for the Retry-After estimate
+        """
+        self._service_seconds += (held - self._service_seconds) * 0.1
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot passes on, so in_flight stays the same
+                waiter.set_result(None)
+                self._report()
+                return
+        self.in_flight -= 1
+        self._report()
+
+class AdmissionController:
+    """Per-client rate limits and per-route-class queues for incoming requests."""
+
+    def __init__(self, client_rate: float, client_burst: float, max_clients: int,
+                 limits: Dict[str, tuple]):
+        self.clients = ClientBuckets(client_rate, client_burst, max_clients)
+        self.queues = {name: RouteClassQueue(name, *limit) for name, limit in limits.items()}
+
+    def client_id(self, scope: dict) -> str:
+        """Identify the client of an ASGI request."""
+        if ADMISSION_CLIENT_HEADER:
+            for name, value in scope.get("headers", []):
+                if name.decode("latin-1") == ADMISSION_CLIENT_HEADER:
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else ""
+
+    async def admit(self, scope: dict) -> Optional[RouteClassQueue]:
+        """Admit a request, waiting for a slot of its route class if needed.
+
+        Event streams (server-sent events, STREAM_ROUTES) are rate limited
+        but not queued: they stay open for minutes and would hold a slot all
+        that time. They are recognized by route, never by the Accept header
+        a client sends.
+
+        Returns:
+            The queue whose slot the request holds (release it when the
+            response is sent), or None if the request holds none
+
+        Raises:
+            Rejected: The request must be turned away
+        """
+        path = scope["path"]
+        if path in EXEMPT_PATHS:
+            return None
+        queue = self.queues[route_class(scope["method"], path)]
+        try:
+            self.clients.take(self.client_id(scope))
+            if scope["method"] == "GET" and STREAM_ROUTES.match(path):
+                return None
+            await queue.acquire()
+        except Rejected as error:
+            registry.record_admission_rejection(queue.name, error.reason)
+            raise
+        return queue
+
+admission = AdmissionController(ADMISSION_CLIENT_RATE, ADMISSION_CLIENT_BURST, ADMISSION_MAX_CLIENTS,
+                                ADMISSION_LIMITS)
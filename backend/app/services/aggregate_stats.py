@@ -0,0 +1,195 @@
+# app/services/aggregate_stats.py
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models.build import BuildItem, BuildSkill
+from app.models.item import Item
+from app.models.skill import Skill
+from app.models.stats import HeroBuildCount, ItemUsageCount, SkillTierCount
+from app.services.cooccurrence import BuildContents
+
+# A written build: its hero, and its contents before and after the write
+# (None for "did not exist")
+BuildStatsChange = Tuple[int, Optional[BuildContents], Optional[BuildContents]]
+
+# Key columns and count columns of each aggregate table
+_TABLES = {
+    HeroBuildCount: (("hero_id",), ("builds",)),
+    ItemUsageCount: (("size", "source"), ("items", "build_uses")),
+    SkillTierCount: (("tier",), ("skills", "build_uses")),
+}
+
+# What each table should hold, computed from the base tables. Plain SQL, so
+# the dataset generator can run the rebuild on its own sqlite3 connection.
+# Enum columns store member names, whose lower case is the value.
+RECOMPUTE_QUERIES = {
+    "hero_build_counts":
+        "SELECT hero_id, COUNT(*) FROM builds WHERE hero_id IS NOT NULL GROUP BY hero_id",
+    "item_usage_counts":
+        "SELECT COALESCE(LOWER(i.size), ''), COALESCE(LOWER(i.source), ''), COUNT(*), COALESCE(SUM(u.uses), 0) "
+        "FROM items i LEFT JOIN (SELECT item_id, COUNT(DISTINCT build_id) AS uses FROM build_items "
+        "GROUP BY item_id) u ON u.item_id = i.id GROUP BY 1, 2",
+    "skill_tier_counts":
+        "SELECT COALESCE(s.tier, ''), COUNT(*), COALESCE(SUM(u.uses), 0) "
+        "FROM skills s LEFT JOIN (SELECT skill_id, COUNT(DISTINCT build_id) AS uses FROM build_skills "
+        "GROUP BY skill_id) u ON u.skill_id = s.id GROUP BY 1",
+}
+
+def _rebuild_statements(table: str) -> Tuple[str, str]:
+    model = next(model for model in _TABLES if model.__tablename__ == table)
+    keys, counts = _TABLES[model]
+    return (f"DELETE FROM {table}",
+            f"INSERT INTO {table} ({', '.join(keys + counts)}) {RECOMPUTE_QUERIES[table]}")
+
+REBUILD_STATEMENTS = tuple(statement for table in RECOMPUTE_QUERIES for statement in _rebuild_statements(table))
+
+def _item_key(size, source) -> Tuple[str, str]:
+    return size.value if size else "", source.value if source else ""
+
+def _upsert(db: Session, model, deltas: Dict[tuple, Sequence[int]]) -> None:
+    """Add count deltas to an aggregate table and drop rows whose counts all reach zero."""
+    keys, counts = _TABLES[model]
+    rows = [{**dict(zip(keys, key)), **dict(zip(counts, delta))}
+            for key, delta in deltas.items() if any(delta)]
+    if not rows:
+        return
+    statement = insert(model)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={column: getattr(model, column) + statement.excluded[column] for column in counts}
+    ), rows)
+    if any(row[column] < 0 for row in rows for column in counts):
+        db.query(model).filter(*(getattr(model, column) <= 0 for column in counts)) \
+            .delete(synchronize_session=False)
+
+def record_build_stats(db: Session, changes: Iterable[BuildStatsChange]) -> None:
+    """Update the aggregates for builds that were created, changed or deleted.
+
+    Call it inside the transaction that writes the builds; it does not
+    commit. Costs one lookup each for the items and skills involved and
+    one upsert per table.
+
+    Args:
+        db: Database session
+        changes: (hero_id, before, after) of each written build
+    """
+    heroes: Counter = Counter()
+    item_uses: Counter = Counter()
+    skill_uses: Counter = Counter()
+    for hero_id, before, after in changes:
+        heroes[hero_id] += (after is not None) - (before is not None)
+        for contents, sign in ((before, -1), (after, 1)):
+            if contents is not None:
+                item_uses.update({item_id: sign for item_id in set(contents[0])})
+                skill_uses.update({skill_id: sign for skill_id in set(contents[1])})
+
+    items: Counter = Counter()
+    changed_items = [item_id for item_id, delta in item_uses.items() if delta]
+    if changed_items:
+        for item_id, size, source in db.query(Item.id, Item.size, Item.source).filter(Item.id.in_(changed_items)):
+            items[_item_key(size, source)] += item_uses[item_id]
+    tiers: Counter = Counter()
+    changed_skills = [skill_id for skill_id, delta in skill_uses.items() if delta]
+    if changed_skills:
+        for skill_id, tier in db.query(Skill.id, Skill.tier).filter(Skill.id.in_(changed_skills)):
+            tiers[tier or ""] += skill_uses[skill_id]
+
+    _upsert(db, HeroBuildCount, {(hero_id,): (delta,) for hero_id, delta in heroes.items() if hero_id is not None})
+    _upsert(db, ItemUsageCount, {key: (0, delta) for key, delta in items.items()})
+    _upsert(db, SkillTierCount, {(tier,): (0, delta) for tier, delta in tiers.items()})
+
+def _build_uses(db: Session, column, ids: List[int]) -> Dict[int, int]:
+    if not ids:
+        return {}
+    return dict(db.query(column, func.count(func.distinct(column.class_.build_id)))
+                .filter(column.in_(ids)).group_by(column).all())
+
+def record_catalog_changes(db: Session, items: Iterable[Tuple[Item, int]] = (),
+                           skills: Iterable[Tuple[Skill, int]] = ()) -> None:
+    """Update the aggregates for items and skills that were added (+1) or deleted (-1).
+
+    New rows must be flushed so they have IDs. Builds already referring to
+    an item or skill's ID count as its uses. Call it inside the writing
+    transaction; it does not commit.
+    """
+    items, skills = list(items), list(skills)
+    item_uses = _build_uses(db, BuildItem.item_id, [item.id for item, _ in items])
+    skill_uses = _build_uses(db, BuildSkill.skill_id, [skill.id for skill, _ in skills])
+
+    item_deltas: Dict[tuple, List[int]] = {}
+    for item, sign in items:
+        delta = item_deltas.setdefault(_item_key(item.size, item.source), [0, 0])
+        delta[0] += sign
+        delta[1] += sign * item_uses.get(item.id, 0)
+    tier_deltas: Dict[tuple, List[int]] = {}
+    for skill, sign in skills:
+        delta = tier_deltas.setdefault((skill.tier or "",), [0, 0])
+        delta[0] += sign
+        delta[1] += sign * skill_uses.get(skill.id, 0)
+
+    _upsert(db, ItemUsageCount, item_deltas)
+    _upsert(db, SkillTierCount, tier_deltas)
+
+def rebuild_stats(db: Session) -> Dict[str, int]:
+    """Recompute every aggregate from the base tables and commit.
+
+    Returns:
+        Number of rows in each aggregate table
+    """
+    for statement in REBUILD_STATEMENTS:
+        db.execute(text(statement))
+    db.commit()
+    return {model.__tablename__: db.query(model).count() for model in _TABLES}
+
+def reconcile_stats(db: Session, fix: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Compare every aggregate table with a full recompute.
+
+    Runs in an immediate transaction, so writers wait for the comparison
+    instead of racing it.
+
+    Args:
+        db: Database session
+        fix: Rewrite the tables that differ from the recompute
+
+    Returns:
+        Per table: its expected row count and the rows that differ, as
+        {"key", "stored", "expected"} with None for a missing row
+    """
+    db.execute(text("BEGIN IMMEDIATE"))
+    try:
+        report: Dict[str, Dict[str, Any]] = {}
+        for model, (keys, counts) in _TABLES.items():
+            table = model.__tablename__
+            width = len(keys)
+            expected = {tuple(row[:width]): tuple(row[width:]) for row in db.execute(text(RECOMPUTE_QUERIES[table]))}
+            stored = {tuple(row[:width]): tuple(row[width:])
+                      for row in db.query(*(getattr(model, column) for column in keys + counts))}
+            mismatches = [
+                {"key": list(key), "stored": list(stored[key]) if key in stored else None,
+                 "expected": list(expected[key]) if key in expected else None}
+                for key in sorted(expected.keys() | stored.keys(), key=repr)
+                if stored.get(key) != expected.get(key)
+            ]
+            if mismatches and fix:
+                for statement in _rebuild_statements(table):
+                    db.execute(text(statement))
+            report[table] = {"rows": len(expected), "mismatches": mismatches}
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return report
+
+def read_stats(db: Session) -> Dict[str, List[tuple]]:
+    """Return the rows of every aggregate table (three small reads)."""
+    return {
+        "heroes": db.query(HeroBuildCount.hero_id, HeroBuildCount.builds).all(),
+        "items": db.query(ItemUsageCount.size, ItemUsageCount.source, ItemUsageCount.items,
+                          ItemUsageCount.build_uses).all(),
+        "skills": db.query(SkillTierCount.tier, SkillTierCount.skills, SkillTierCount.build_uses).all(),
+    }
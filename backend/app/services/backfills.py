@@ -0,0 +1,48 @@
+# app/services/backfills.py
+
+import logging
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models.backfill import DataBackfill
+from app.services.aggregate_stats import rebuild_stats
+from app.services.cooccurrence import rebuild_cooccurrence
+from app.services.tag_index import sync_all_tags
+
+logger = logging.getLogger(__name__)
+
+# Derived tables that writes keep current once they have been filled from the
+# base tables. Each backfill runs once per database, at startup, before any
+# request can write deltas on top of an unfilled table; a row in
+# data_backfills records that it ran. Every backfill rebuilds its tables
+# from scratch and commits, so running one twice is harmless.
+BACKFILLS: Dict[str, Callable[[Session], Any]] = {
+    # Item and skill tag associations, from the types strings
+    "tags": sync_all_tags,
+    # Item and item-skill co-occurrence counts, from the stored builds
+    "cooccurrence": rebuild_cooccurrence,
+    # Build counts per hero and item/skill counts per size, source and tier
+    "aggregate_stats": rebuild_stats,
+}
+
+def run_pending_backfills(db: Session) -> List[str]:
+    """Run the backfills this database has not completed yet.
+
+    Args:
+        db: Database session; committed after each backfill
+
+    Returns:
+        Names of the backfills that ran
+    """
+    done = {name for (name,) in db.query(DataBackfill.name)}
+    ran = []
+    for name, backfill in BACKFILLS.items():
+        if name in done:
+            continue
+        logger.info(f"Running data backfill '{name}'")
+        backfill(db)
+        db.merge(DataBackfill(name=name))
+        db.commit()
+        ran.append(name)
+    return ran
@@ -0,0 +1,70 @@
+# app/services/bitmap.py
+
+from typing import Dict, Iterable, Iterator
+
+_CHUNK_BITS = 16
+_CHUNK_MASK = (1 << _CHUNK_BITS) - 1
+
+class Bitmap:
+    """Compressed bitmap of non-negative integer IDs.
+
+    IDs are split into 65536-wide chunks keyed by their high bits, and each
+    non-empty chunk is stored as a Python int bitset of its low bits (at
+    most 8 KB). Empty chunks take no space, so sparse or clustered ID sets
+    stay small, and set operations only touch chunks both sides share.
+    Instances are treated as immutable; every operation returns a new one.
+    """
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, ids: Iterable[int] = ()):
+        chunks: Dict[int, int] = {}
+        for value in ids:
+            key = value >> _CHUNK_BITS
+            chunks[key] = chunks.get(key, 0) | (1 << (value & _CHUNK_MASK))
+        self._chunks = chunks
+
+    @classmethod
+    def _from_chunks(cls, chunks: Dict[int, int]) -> "Bitmap":
+        bitmap = cls.__new__(cls)
+        bitmap._chunks = {key: bits for key, bits in chunks.items() if bits}
+        return bitmap
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        return Bitmap._from_chunks({key: bits & large[key] for key, bits in small.items() if key in large})
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self._chunks)
+        for key, bits in other._chunks.items():
+            chunks[key] = chunks.get(key, 0) | bits
+        return Bitmap._from_chunks(chunks)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        return Bitmap._from_chunks({
+            key: bits & ~other._chunks.get(key, 0) for key, bits in self._chunks.items()
+        })
+
+    def __contains__(self, value: int) -> bool:
+        return bool(self._chunks.get(value >> _CHUNK_BITS, 0) >> (value & _CHUNK_MASK) & 1)
+
+    def __len__(self) -> int:
+        return sum(bin(bits).count("1") for bits in self._chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        for key in sorted(self._chunks):
+            bits = self._chunks[key]
+            base = key << _CHUNK_BITS
+            while bits:
+                low = bits & -bits
+                yield base + low.bit_length() - 1
+                bits ^= low
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Bitmap) and self._chunks == other._chunks
+
+    def __repr__(self) -> str:
+        return f"Bitmap({len(self)} ids)"
@@ -0,0 +1,203 @@
+# app/services/build_updates.py
+
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.build import Build, BuildItem, BuildSkill
+from app.models.item import Item
+from app.models.skill import Skill
+from app.services.aggregate_stats import record_build_stats
+from app.services.bulk_builds import existing_ids
+from app.services.cooccurrence import record_build_changes
+from app.services.fingerprints import DuplicateBuild, build_fingerprint, find_fingerprints
+
+# Retries when an unconditional update races another writer
+MAX_UPDATE_ATTEMPTS = 3
+
+ItemSlots = List[Tuple[int, Optional[str]]]
+
+class BuildNotFound(Exception):
+    """Raised when the build to update does not exist."""
+
+class BuildVersionConflict(Exception):
+    """Raised when the build changed since the version the client read."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Build is at version {current_version}")
+        self.current_version = current_version
+
+class RowDiff:
+    """The writes that turn one list of child rows into another.
+
+    Rows whose key is still wanted are left alone. Leftover stored rows
+    are reused for leftover wanted keys (an UPDATE instead of a DELETE
+    plus an INSERT); whatever remains is deleted or inserted.
+    """
+
+    def __init__(self, stored: Sequence[Tuple[int, Hashable]], wanted: Sequence[Hashable]):
+        kept = Counter(key for _, key in stored) & Counter(wanted)
+        unmatched = Counter(kept)
+        spare_rows = []
+        for row_id, key in stored:
+            if unmatched[key]:
+                unmatched[key] -= 1
+            else:
+                spare_rows.append(row_id)
+        unmatched = Counter(kept)
+        new_keys = []
+        for key in wanted:
+            if unmatched[key]:
+                unmatched[key] -= 1
+            else:
+                new_keys.append(key)
+
+        reused = min(len(spare_rows), len(new_keys))
+        self.updates: List[Tuple[int, Hashable]] = list(zip(spare_rows[:reused], new_keys[:reused]))
+        self.deletes: List[int] = spare_rows[reused:]
+        self.inserts: List[Hashable] = new_keys[reused:]
+        self.added_keys = new_keys
+
+    def __bool__(self) -> bool:
+        return bool(self.updates or self.deletes or self.inserts)
+
+def _check_ids(db: Session, column, ids: List[int], label: str) -> None:
+    missing = sorted(set(ids) - existing_ids(db, column, ids))
+    if missing:
+        raise ValueError(f"{label} with ID {missing[0]} not found")
+
+def _apply(db: Session, model, diff: RowDiff, build_id: int, fields: Tuple[str, ...]) -> None:
+    if diff.updates:
+        db.execute(update(model), [{"id": row_id, **dict(zip(fields, key))} for row_id, key in diff.updates])
+    if diff.deletes:
+        db.query(model).filter(model.id.in_(diff.deletes)).delete(synchronize_session=False)
+    if diff.inserts:
+        db.execute(insert(model), [{"build_id": build_id, **dict(zip(fields, key))} for key in diff.inserts])
+
+def update_build(db: Session, build_id: int, changes: Dict[str, Any],
+                 items: Union[None, ItemSlots, Callable[[ItemSlots], ItemSlots]] = None,
+                 skills: Optional[List[int]] = None,
+                 expected_version: Optional[int] = None) -> Tuple[int, bool]:
+    """Apply the minimal set of writes that brings a build to the requested state.
+
+    The build row is updated with ``version = version + 1`` guarded by the
+    version the diff was computed against, so a concurrent writer is
+    detected without locking the build while the diff is computed. With
+    ``expected_version`` (from If-Match) a conflict is reported to the
+    caller; without it the update is recomputed against the new state.
+    The build's fingerprint is recomputed in the same UPDATE when its
+    items or skills change, and the co-occurrence counts and aggregate
+    stats in the same transaction.
+
+    Args:
+        db: Database session
+        build_id: Build to update
+        changes: New values for scalar columns (name, description)
+        items: The full list of (item_id, slot) pairs, a function from the
+            stored pairs to the new ones, or None to keep them
+        skills: The full list of skill IDs, or None to keep them
+        expected_version: Version the client last read, if it sent one
+
+    Returns:
+        The build's version after the update and whether anything was written
+
+    Raises:
+        BuildNotFound: The build does not exist
+        BuildVersionConflict: The build is not at ``expected_version``
+        DuplicateBuild: Another build already has the resulting items and skills
+        ValueError: An added item or skill does not exist
+    """
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        row = db.query(Build.version, Build.name, Build.description, Build.hero_id, Build.fingerprint) \
+            .filter(Build.id == build_id).first()
+        if row is None:
+            raise BuildNotFound(build_id)
+        current_version = row.version
+        if expected_version is not None and expected_version != current_version:
+            raise BuildVersionConflict(current_version)
+
+        scalar_changes = {column: value for column, value in changes.items() if getattr(row, column) != value}
+        item_diff = skill_diff = None
+        stored_items = stored_skills = []
+        if items is not None or skills is not None:
+            # Both lists are needed for the new fingerprint, even if only one changes
+            stored_items = db.query(BuildItem.id, BuildItem.item_id, BuildItem.slot) \
+                .filter(BuildItem.build_id == build_id).order_by(BuildItem.id).all()
+            stored_skills = db.query(BuildSkill.id, BuildSkill.skill_id) \
+                .filter(BuildSkill.build_id == build_id).order_by(BuildSkill.id).all()
+        wanted_items = [(item_id, slot) for _, item_id, slot in stored_items]
+        if items is not None:
+            wanted_items = items(wanted_items) if callable(items) else items
+            item_diff = RowDiff([(row_id, (item_id, slot)) for row_id, item_id, slot in stored_items], wanted_items)
+            _check_ids(db, Item.id, [item_id for item_id, _ in item_diff.added_keys], "Item")
+        wanted_skills = [skill_id for _, skill_id in stored_skills]
+        if skills is not None:
+            wanted_skills = skills
+            skill_diff = RowDiff([(row_id, (skill_id,)) for row_id, skill_id in stored_skills],
+                                 [(s,) for s in skills])
+            _check_ids(db, Skill.id, [skill_id for (skill_id,) in skill_diff.added_keys], "Skill")
+
+        if not scalar_changes and not item_diff and not skill_diff:
+            db.rollback()
+            return current_version, False
+
+        if item_diff or skill_diff:
+            fingerprint = build_fingerprint(row.hero_id, wanted_items, wanted_skills)
+            if fingerprint != row.fingerprint:
+                owner = find_fingerprints(db, [fingerprint]).get(fingerprint)
+                if owner is not None:
+                    db.rollback()
+                    raise DuplicateBuild(owner)
+                scalar_changes["fingerprint"] = fingerprint
+
+        try:
+            bumped = db.execute(
+                update(Build)
+                .where(Build.id == build_id, Build.version == current_version)
+                .values(**scalar_changes, updated_at=datetime.utcnow(), version=Build.version + 1)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        except IntegrityError:
+            # Another build took the fingerprint since it was checked
+            db.rollback()
+            owner = find_fingerprints(db, [fingerprint]).get(fingerprint)
+            if owner is None:
+                continue
+            raise DuplicateBuild(owner)
+        if not bumped:
+            # Someone else wrote first; the diff is stale
+            db.rollback()
+            if expected_version is not None:
+                raise BuildVersionConflict(db.query(Build.version).filter(Build.id == build_id).scalar())
+            continue
+
+        if item_diff:
+            _apply(db, BuildItem, item_diff, build_id, ("item_id", "slot"))
+        if skill_diff:
+            _apply(db, BuildSkill, skill_diff, build_id, ("skill_id",))
+        if item_diff or skill_diff:
+            before = ([item_id for _, item_id, _ in stored_items], [skill_id for _, skill_id in stored_skills])
+            after = ([item_id for item_id, _ in wanted_items], wanted_skills)
+            record_build_changes(db, [(before, after)])
+            record_build_stats(db, [(row.hero_id, before, after)])
+        db.commit()
+        return current_version + 1, True
+    raise BuildVersionConflict(db.query(Build.version).filter(Build.id == build_id).scalar())
+
+def set_slot(db: Session, build_id: int, slot: str, item_id: Optional[int],
+             expected_version: Optional[int] = None) -> Tuple[int, bool]:
+    """Put an item in one slot of a build, or clear the slot with ``item_id=None``.
+
+    Other slots are untouched; see update_build for return values and errors.
+    """
+    def edit(stored: ItemSlots) -> ItemSlots:
+        items = [(stored_item_id, stored_slot) for stored_item_id, stored_slot in stored if stored_slot != slot]
+        if item_id is not None:
+            items.append((item_id, slot))
+        return items
+
+    return update_build(db, build_id, {}, items=edit, expected_version=expected_version)
@@ -0,0 +1,165 @@
+# app/services/bulk_builds.py
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.build import Build, BuildItem, BuildSkill
+from app.models.hero import Hero
+from app.models.item import Item
+from app.models.skill import Skill
+from app.schemas.build import BuildCreate
+from app.services.aggregate_stats import record_build_stats
+from app.services.bitmap import Bitmap
+from app.services.cooccurrence import record_build_changes
+from app.services.fingerprints import find_fingerprints, fingerprint_of
+from app.services.tag_index import in_bitmap
+
+# Most builds one bulk request may create
+MAX_BULK_BUILDS = 10000
+
+# Times a bulk insert is redone after losing a fingerprint to a concurrent writer
+MAX_INSERT_ATTEMPTS = 3
+
+def existing_ids(db: Session, column, ids: Iterable[int]) -> Set[int]:
+    """Return which of ``ids`` exist in ``column``, with one query for the whole set."""
+    wanted = Bitmap(ids)
+    if not wanted:
+        return set()
+    return {row_id for (row_id,) in db.query(column).filter(in_bitmap(column, wanted))}
+
+def validate_builds(db: Session, builds: List[BuildCreate]) -> List[List[str]]:
+    """Check every hero, item and skill referenced by a list of builds.
+
+    Three queries in total: one ``IN`` per table over the union of the
+    IDs of all builds.
+
+    Returns:
+        The errors for each build, in input order (empty when valid)
+    """
+    heroes = existing_ids(db, Hero.id, (build.hero_id for build in builds))
+    items = existing_ids(db, Item.id, (bi.item_id for build in builds for bi in build.build_items))
+    skills = existing_ids(db, Skill.id, (bs.skill_id for build in builds for bs in build.build_skills))
+
+    errors = []
+    for build in builds:
+        build_errors = []
+        if build.hero_id not in heroes:
+            build_errors.append(f"Hero with ID {build.hero_id} not found")
+        for item_id in dict.fromkeys(bi.item_id for bi in build.build_items):
+            if item_id not in items:
+                build_errors.append(f"Item with ID {item_id} not found")
+        for skill_id in dict.fromkeys(bs.skill_id for bs in build.build_skills):
+            if skill_id not in skills:
+                build_errors.append(f"Skill with ID {skill_id} not found")
+        errors.append(build_errors)
+    return errors
+
+def insert_builds(db: Session, builds: List[BuildCreate], fingerprints: Optional[List[str]] = None) -> List[int]:
+    """Insert builds and their items and skills with one executemany per table.
+
+    Does not commit. Does not check for duplicates either: a fingerprint
+    that is already taken fails the statement with an IntegrityError.
+    The co-occurrence counts and aggregate stats are updated in the same
+    transaction.
+
+    Args:
+        db: Database session
+        builds: Builds to insert
+        fingerprints: The builds' fingerprints, if already computed
+
+    Returns:
+        The new build IDs, in input order
+    """
+    if not builds:
+        return []
+    if fingerprints is None:
+        fingerprints = [fingerprint_of(build) for build in builds]
+    now = datetime.utcnow()
+    # Batched multi-row INSERT ... RETURNING. SQLite inserts VALUES rows in order and hands
+    # out increasing rowids under the write lock, so sorted IDs line up with the input.
+    # (sort_by_parameter_order would fall back to one INSERT per row on SQLite.)
+    build_ids = sorted(db.scalars(
+        insert(Build).returning(Build.id),
+        [{"name": build.name, "description": build.description, "hero_id": build.hero_id,
+          "created_at": now, "updated_at": now, "fingerprint": fingerprint}
+         for build, fingerprint in zip(builds, fingerprints)]
+    ))
+    item_rows = [{"build_id": build_id, "item_id": bi.item_id, "slot": bi.slot}
+                 for build_id, build in zip(build_ids, builds) for bi in build.build_items]
+    skill_rows = [{"build_id": build_id, "skill_id": bs.skill_id}
+                  for build_id, build in zip(build_ids, builds) for bs in build.build_skills]
+    if item_rows:
+        db.execute(insert(BuildItem), item_rows)
+    if skill_rows:
+        db.execute(insert(BuildSkill), skill_rows)
+    contents = [([bi.item_id for bi in build.build_items], [bs.skill_id for bs in build.build_skills])
+                for build in builds]
+    record_build_changes(db, ((None, after) for after in contents))
+    record_build_stats(db, ((build.hero_id, None, after) for build, after in zip(builds, contents)))
+    return build_ids
+
+def create_builds(db: Session, builds: List[BuildCreate], all_or_nothing: bool = False) -> Dict[str, Any]:
+    """Validate and create many builds in one transaction.
+
+    A build with the same fingerprint as a stored build, or as an earlier
+    build in the request, is not created again; its result points at the
+    build that already has it.
+
+    Args:
+        db: Database session
+        builds: Builds to create
+        all_or_nothing: Create nothing if any build is invalid; otherwise
+            create the valid builds and report the invalid ones
+
+    Returns:
+        Dictionary with created/duplicate/failed counts and one result per input build
+    """
+    errors = validate_builds(db, builds)
+    failed = sum(1 for build_errors in errors if build_errors)
+    valid = [index for index, build_errors in enumerate(errors) if not build_errors]
+    fingerprints = [fingerprint_of(build) for build in builds]
+
+    for attempt in range(MAX_INSERT_ATTEMPTS):
+        stored = find_fingerprints(db, (fingerprints[index] for index in valid))
+        # The first build in the request with each new fingerprint is the one created
+        first_index: Dict[str, int] = {}
+        for index in valid:
+            if fingerprints[index] not in stored:
+                first_index.setdefault(fingerprints[index], index)
+        new = [] if all_or_nothing and failed else sorted(first_index.values())
+        try:
+            build_ids = dict(zip(new, insert_builds(db, [builds[index] for index in new],
+                                                    [fingerprints[index] for index in new])))
+            db.commit()
+            break
+        except IntegrityError:
+            # A concurrent request stored one of the fingerprints first
+            db.rollback()
+            if attempt == MAX_INSERT_ATTEMPTS - 1:
+                raise
+
+    results = []
+    for index, build_errors in enumerate(errors):
+        fingerprint = fingerprints[index]
+        build_id = None
+        if build_errors:
+            status = "invalid"
+        elif index in build_ids:
+            status, build_id = "created", build_ids[index]
+        elif fingerprint in stored:
+            status, build_id = "duplicate", stored[fingerprint]
+        elif first_index[fingerprint] in build_ids:
+            status, build_id = "duplicate", build_ids[first_index[fingerprint]]
+        else:
+            status = "skipped"
+        results.append({"index": index, "status": status, "build_id": build_id, "errors": build_errors})
+    return {
+        "created": len(build_ids),
+        "duplicates": sum(1 for result in results if result["status"] == "duplicate"),
+        "failed": failed,
+        "results": results,
+    }
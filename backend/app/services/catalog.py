@@ -0,0 +1,240 @@
+# app/services/catalog.py
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.hero import Hero
+from app.models.item import Item
+from app.models.skill import Skill
+
+def split_types(types: Optional[str]) -> Tuple[str, ...]:
+    """Split a comma-joined types string into a tuple of clean type names.
+
+    Args:
+        types: Comma-separated types, e.g. "Weapon, Tech, Damage"
+
+    Returns:
+        Tuple of non-empty type names in their original order
+    """
+    if not types:
+        return ()
+    return tuple(t.strip() for t in types.split(",") if t.strip() and t.strip() != "–")
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """Read-only view of an item as used by the catalog consumers."""
+    id: int
+    name: str
+    size: Optional[str]
+    source: Optional[str]
+    hero_id: Optional[int]
+    monster_id: Optional[int]
+    cooldown: Optional[float]
+    effect: str
+    cost: Optional[int]
+    types: Tuple[str, ...]
+
+@dataclass(frozen=True)
+class CatalogSkill:
+    """Read-only view of a skill as used by the catalog consumers."""
+    id: int
+    name: str
+    source: Optional[str]
+    hero_id: Optional[int]
+    monster_id: Optional[int]
+    tier: Optional[str]
+    effect: str
+    types: Tuple[str, ...]
+
+class Catalog:
+    """Immutable in-memory snapshot of heroes, items and skills.
+
+    The ``version`` is a content hash of every row, so two snapshots built
+    from the same data always share a version and anything derived from a
+    snapshot can be keyed on it.
+    """
+
+    def __init__(self, heroes: Dict[int, str], items: List[CatalogItem], skills: List[CatalogSkill]):
+        self.heroes = heroes
+        self.items: Dict[int, CatalogItem] = {item.id: item for item in items}
+        self.skills: Dict[int, CatalogSkill] = {skill.id: skill for skill in skills}
+        self.version = self._compute_version()
+        self.effects_version = self._compute_effects_version()
+
+    def _compute_version(self) -> str:
+        digest = hashlib.sha1()
+        for hero_id in sorted(self.heroes):
+            digest.update(repr((hero_id, self.heroes[hero_id])).encode("utf-8"))
+        for item_id in sorted(self.items):
+            digest.update(repr(self.items[item_id]).encode("utf-8"))
+        for skill_id in sorted(self.skills):
+            digest.update(repr(self.skills[skill_id]).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def _compute_effects_version(self) -> str:
+        """Hash only the fields that can change a simulated fight."""
+        digest = hashlib.sha1()
+        for item_id in sorted(self.items):
+            item = self.items[item_id]
+            digest.update(repr((item_id, item.size, item.cooldown, item.effect, item.cost, item.types)).encode("utf-8"))
+        for skill_id in sorted(self.skills):
+            skill = self.skills[skill_id]
+            digest.update(repr((skill_id, skill.tier, skill.effect, skill.types)).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def items_for_hero(self, hero_id: Optional[int], include_universal: bool = True,
+                       include_monster: bool = False) -> List[CatalogItem]:
+        """Return the items a hero can put on their board.
+
+        Args:
+            hero_id: Hero whose own items are included (None for none)
+            include_universal: Also include universal items
+            include_monster: Also include monster items
+
+        Returns:
+            Items sorted by ID
+        """
+        pool = []
+        for item in self.items.values():
+            if item.source == "hero_specific" and item.hero_id == hero_id:
+                pool.append(item)
+            elif item.source == "universal" and include_universal:
+                pool.append(item)
+            elif item.source == "monster" and include_monster:
+                pool.append(item)
+        return sorted(pool, key=lambda i: i.id)
+
+    def skills_for_hero(self, hero_id: Optional[int], include_universal: bool = True,
+                        include_monster: bool = False) -> List[CatalogSkill]:
+        """Return the skills a hero can take, following the same rules as items."""
+        pool = []
+        for skill in self.skills.values():
+            if skill.source == "hero_specific" and skill.hero_id == hero_id:
+                pool.append(skill)
+            elif skill.source == "universal" and include_universal:
+                pool.append(skill)
+            elif skill.source == "monster" and include_monster:
+                pool.append(skill)
+        return sorted(pool, key=lambda s: s.id)
+
+def load_catalog(db: Session) -> Catalog:
+    """Build a catalog snapshot from the database.
+
+    Args:
+        db: Database session
+
+    Returns:
+        A fresh Catalog
+    """
+    heroes = {hero.id: hero.name for hero in db.query(Hero).all()}
+    items = [
+        CatalogItem(
+            id=item.id,
+            name=item.name,
+            size=item.size.value if item.size else None,
+            source=item.source.value if item.source else None,
+            hero_id=item.hero_id,
+            monster_id=item.monster_id,
+            cooldown=float(item.cooldown) if item.cooldown is not None else None,
+            effect=item.effect or "",
+            cost=item.cost,
+            types=split_types(item.types),
+        )
+        for item in db.query(Item).all()
+    ]
+    skills = [
+        CatalogSkill(
+            id=skill.id,
+            name=skill.name,
+            source=skill.source.value if skill.source else None,
+            hero_id=skill.hero_id,
+            monster_id=skill.monster_id,
+            tier=skill.tier,
+            effect=skill.effect or "",
+            types=split_types(skill.types),
+        )
+        for skill in db.query(Skill).all()
+    ]
+    return Catalog(heroes, items, skills)
+
+# Shared snapshot file; unset means every process keeps its own in-memory catalog
+SNAPSHOT_PATH = os.environ.get("CATALOG_SNAPSHOT") or None
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+# Set by the launcher's SIGUSR1 when a new shared snapshot generation is published
+_reload_requested = False
+_last_snapshot_check = 0.0
+# Seconds between checks of the snapshot file, in case a notification was missed
+SNAPSHOT_CHECK_INTERVAL = 1.0
+
+def _snapshot_changed(path: str) -> bool:
+    global _last_snapshot_check
+    now = time.monotonic()
+    if now - _last_snapshot_check < SNAPSHOT_CHECK_INTERVAL:
+        return False
+    _last_snapshot_check = now
+    try:
+        return os.stat(path).st_ino != getattr(_catalog, "inode", None)
+    except FileNotFoundError:
+        return False
+
+def _load_shared(db: Session, path: str) -> Catalog:
+    from app.services.catalog_snapshot import open_snapshot, publish_snapshot
+
+    catalog = open_snapshot(path)
+    if catalog is None:
+        publish_snapshot(db, path)
+        catalog = open_snapshot(path)
+    return catalog
+
+def get_catalog(db: Session) -> Catalog:
+    """Return the current catalog snapshot, loading it on first use.
+
+    With CATALOG_SNAPSHOT set, the catalog is the memory-mapped shared
+    snapshot file, reopened when a new generation is published.
+    """
+    global _catalog, _reload_requested
+    path = SNAPSHOT_PATH
+    with _catalog_lock:
+        if path is not None:
+            if _catalog is None or _reload_requested or _snapshot_changed(path):
+                _reload_requested = False
+                _catalog = _load_shared(db, path)
+        elif _catalog is None:
+            _catalog = load_catalog(db)
+        return _catalog
+
+def request_reload() -> None:
+    """Reopen the shared snapshot on the next get_catalog call (signal-safe)."""
+    global _reload_requested
+    _reload_requested = True
+
+def invalidate_catalog() -> None:
+    """Drop the cached snapshot so the next reader reloads it.
+
+    Write routes and the importer call this after changing items, skills
+    or heroes. With a shared snapshot, a new generation is published and
+    every worker is notified.
+    """
+    global _catalog
+    path = SNAPSHOT_PATH
+    if path is not None:
+        from app.database.database import SessionLocal
+        from app.services.catalog_snapshot import publish_snapshot
+
+        db = SessionLocal()
+        try:
+            publish_snapshot(db, path)
+        finally:
+            db.close()
+        request_reload()
+        return
+    with _catalog_lock:
+        _catalog = None
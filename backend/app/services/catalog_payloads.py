@@ -0,0 +1,113 @@
+# app/services/catalog_payloads.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.services.catalog import get_catalog
+from app.services.compression import COMPRESSION_MIN_BYTES, STORED_LEVELS, compress, negotiate
+
+# Encoded catalog responses kept per process, uncompressed and compressed together
+CATALOG_PAYLOAD_CACHE_MB = float(os.environ.get("CATALOG_PAYLOAD_CACHE_MB", 32))
+
+class CatalogPayload:
+    """One catalog response body, JSON-encoded once and compressed at most once per encoding."""
+
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._encoded: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(data) for data in self._encoded.values())
+
+    def encoded(self, encoding: str) -> bytes:
+        with self._lock:
+            data = self._encoded.get(encoding)
+            if data is None:
+                data = self._encoded[encoding] = compress(self.body, encoding, STORED_LEVELS[encoding], kind="stored")
+            return data
+
+class CatalogPayloadCache:
+    """Catalog payloads of the current catalog version, least recently used dropped first."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.version: Optional[str] = None
+        self._payloads: "OrderedDict[str, CatalogPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: str, key: str) -> Optional[CatalogPayload]:
+        with self._lock:
+            if version != self.version:
+                return None
+            payload = self._payloads.get(key)
+            if payload is not None:
+                self._payloads.move_to_end(key)
+            return payload
+
+    def put(self, version: str, key: str, payload: CatalogPayload) -> None:
+        with self._lock:
+            if version != self.version:
+                # Bodies of an older catalog are never served again
+                self.version = version
+                self._payloads.clear()
+            self._payloads[key] = payload
+            self._trim()
+
+    def trim(self) -> None:
+        """Drop the least recently used payloads over the size cap, e.g. after one gained an encoding."""
+        with self._lock:
+            self._trim()
+
+    def _trim(self) -> None:
+        total = sum(payload.size for payload in self._payloads.values())
+        while total > self.max_bytes and len(self._payloads) > 1:
+            _, dropped = self._payloads.popitem(last=False)
+            total -= dropped.size
+
+catalog_payloads = CatalogPayloadCache(int(CATALOG_PAYLOAD_CACHE_MB * 2**20))
+
+def catalog_response(request: Request, db: Session, response_model: Any, build: Callable[[], Any]) -> Response:
+    """Serve a response that depends only on the catalog from stored bytes.
+
+    The body is built, validated against ``response_model`` and encoded
+    once per catalog version and URL; each encoding the clients ask for
+    is compressed once, at the highest level, and reused. Responses carry
+    an ETag, so a client holding the current body gets a 304.
+
+    Args:
+        request: The request, for its URL and headers
+        db: Database session, for the catalog version and ``build``
+        response_model: The route's response model
+        build: Returns the response content, as the route would have
+    """
+    # Read before the content, so a payload is never older than its version
+    version = get_catalog(db).version
+    query = "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items()))
+    key = f"{request.url.path}?{query}"
+    payload = catalog_payloads.get(version, key)
+    if payload is None:
+        adapter = TypeAdapter(response_model)
+        body = adapter.dump_json(adapter.validate_python(build()))
+        etag = f'"{version}-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:8]}"'
+        payload = CatalogPayload(body, etag)
+        catalog_payloads.put(version, key, payload)
+
+    headers = {"ETag": payload.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if payload.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    encoding = negotiate(request.headers.get("accept-encoding")) if len(payload.body) >= COMPRESSION_MIN_BYTES else None
+    if encoding is None:
+        return Response(payload.body, media_type="application/json", headers=headers)
+    data = payload.encoded(encoding)
+    catalog_payloads.trim()
+    return Response(data, media_type="application/json", headers={**headers, "Content-Encoding": encoding})
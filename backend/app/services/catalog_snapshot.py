@@ -0,0 +1,381 @@
+# app/services/catalog_snapshot.py
+
+import bisect
+import fcntl
+import logging
+import math
+import mmap
+import os
+import signal
+import struct
+from array import array
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.database.database import DATABASE_DIR
+from app.services.catalog import Catalog, CatalogItem, CatalogSkill, load_catalog
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BZCT"
+FORMAT_VERSION = 2
+# magic, format, generation, version, effects_version, column count
+HEADER = struct.Struct("<4sIQ16s16sI4x")
+# One directory entry per column: name, array typecode, byte offset, element count
+COLUMN = struct.Struct("<24sc7xQQ")
+# Next to the SQLite database, so a scratch database gets its own
+DEFAULT_SNAPSHOT_PATH = DATABASE_DIR / "catalog.snap"
+
+# Always the first strings in the table, so source columns can be filtered without decoding
+SOURCES = ("hero_specific", "universal", "monster")
+# Nulls in fixed-width columns
+NULL_INT = -2 ** 31
+NULL_STRING = 2 ** 32 - 1
+# Decoded records kept per process; the rest stay in the shared mapping
+DECODED_CACHE_SIZE = 4096
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+class _StringTable:
+    """Deduplicating string table built while writing a snapshot."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.blobs: List[bytes] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_STRING
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.blobs)
+            self.blobs.append(value.encode("utf-8"))
+        return position
+
+    def columns(self) -> Dict[str, array]:
+        ends = array("Q", [0])
+        for blob in self.blobs:
+            ends.append(ends[-1] + len(blob))
+        return {"string_offsets": ends, "strings": array("B", b"".join(self.blobs))}
+
+def _int(value: Optional[int]) -> int:
+    return NULL_INT if value is None else value
+
+def _float(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+def _types(prefix: str, rows: list, strings: _StringTable) -> Dict[str, array]:
+    """Flatten per-row type tuples into one index column plus row offsets."""
+    offsets, flat = array("I", [0]), array("I")
+    for row in rows:
+        flat.extend(strings.add(type_name) for type_name in row.types)
+        offsets.append(len(flat))
+    return {f"{prefix}_type_offsets": offsets, f"{prefix}_types": flat}
+
+def encode_catalog(catalog: Catalog) -> Dict[str, array]:
+    """Lay a catalog out as fixed-width columns sorted by ID.
+
+    Strings (names, effects, sizes, sources, tiers and types) are stored
+    once in a shared string table and referenced by index.
+    """
+    strings = _StringTable()
+    for source in SOURCES:
+        strings.add(source)
+    heroes = sorted(catalog.heroes.items())
+    items = sorted(catalog.items.values(), key=lambda i: i.id)
+    skills = sorted(catalog.skills.values(), key=lambda s: s.id)
+    columns = {
+        "hero_ids": array("I", (hero_id for hero_id, _ in heroes)),
+        "hero_names": array("I", (strings.add(name) for _, name in heroes)),
+        "item_ids": array("I", (item.id for item in items)),
+        "item_names": array("I", (strings.add(item.name) for item in items)),
+        "item_sizes": array("I", (strings.add(item.size) for item in items)),
+        "item_sources": array("I", (strings.add(item.source) for item in items)),
+        "item_hero_ids": array("i", (_int(item.hero_id) for item in items)),
+        "item_monster_ids": array("i", (_int(item.monster_id) for item in items)),
+        "item_cooldowns": array("d", (_float(item.cooldown) for item in items)),
+        "item_effects": array("I", (strings.add(item.effect) for item in items)),
+        "item_costs": array("i", (_int(item.cost) for item in items)),
+        **_types("item", items, strings),
+        "skill_ids": array("I", (skill.id for skill in skills)),
+        "skill_names": array("I", (strings.add(skill.name) for skill in skills)),
+        "skill_sources": array("I", (strings.add(skill.source) for skill in skills)),
+        "skill_hero_ids": array("i", (_int(skill.hero_id) for skill in skills)),
+        "skill_monster_ids": array("i", (_int(skill.monster_id) for skill in skills)),
+        "skill_tiers": array("I", (strings.add(skill.tier) for skill in skills)),
+        "skill_effects": array("I", (strings.add(skill.effect) for skill in skills)),
+        **_types("skill", skills, strings),
+    }
+    columns.update(strings.columns())
+    return columns
+
+def write_snapshot(catalog: Catalog, path: str, generation: int) -> None:
+    """Write a catalog to ``path`` atomically.
+
+    The file is a header, a column directory and 8-byte aligned column
+    arrays in native byte order. It is written next to the target, flushed
+    to disk, then moved over the target with ``os.replace``. Processes that
+    still map the old file keep reading the old generation until they
+    reopen.
+    """
+    columns = encode_catalog(catalog)
+    offset = HEADER.size + COLUMN.size * len(columns)
+    directory_entries = []
+    body = bytearray()
+    for name, values in columns.items():
+        start = _align(offset)
+        body += b"\0" * (start - offset)
+        body += values.tobytes()
+        offset = start + len(values) * values.itemsize
+        directory_entries.append(COLUMN.pack(name.encode("ascii"), values.typecode.encode("ascii"), start, len(values)))
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, generation, catalog.version.encode("ascii"),
+                         catalog.effects_version.encode("ascii"), len(columns))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(b"".join(directory_entries))
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+def read_generation(path: str) -> int:
+    """Return the generation of the snapshot at ``path``, or 0 if there is none."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(HEADER.size)
+    except FileNotFoundError:
+        return 0
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        return 0
+    return HEADER.unpack(data)[2]
+
+class _Section(Mapping):
+    """Read-only id -> record mapping over one table of a mapped snapshot.
+
+    ``ids`` is the sorted ID column; ``decode`` builds the record at a row
+    position from the other columns.
+    """
+
+    def __init__(self, ids: memoryview, decode: Callable[[int], Any]):
+        self._ids = ids
+        self._record = lru_cache(maxsize=DECODED_CACHE_SIZE)(decode)
+
+    def position(self, record_id: Any) -> int:
+        """Return the row position of an ID; raises KeyError if absent."""
+        if not isinstance(record_id, int):
+            raise KeyError(record_id)
+        position = bisect.bisect_left(self._ids, record_id)
+        if position == len(self._ids) or self._ids[position] != record_id:
+            raise KeyError(record_id)
+        return position
+
+    def __getitem__(self, record_id: int) -> Any:
+        return self._record(self.position(record_id))
+
+    def __contains__(self, record_id: object) -> bool:
+        try:
+            self.position(record_id)
+            return True
+        except KeyError:
+            return False
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def clear(self) -> None:
+        self._record.cache_clear()
+
+class MappedCatalog(Catalog):
+    """A Catalog read from a memory-mapped snapshot file.
+
+    The file is mapped read-only and every column is a memoryview into the
+    mapping, so opening a snapshot copies nothing and every process that
+    opens it shares its pages through the OS page cache. Records are
+    decoded on access and only a small per-process cache of decoded
+    records is kept.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.inode = os.fstat(f.fileno()).st_ino
+        self._view = memoryview(self._mmap)
+        self._columns: Dict[str, memoryview] = {}
+        magic, format_version, self.generation, version, effects_version, column_count = HEADER.unpack_from(self._view)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} catalog snapshot")
+        self.version = version.decode("ascii")
+        self.effects_version = effects_version.decode("ascii")
+        for entry in range(column_count):
+            name, typecode, start, count = COLUMN.unpack_from(self._view, HEADER.size + entry * COLUMN.size)
+            typecode = typecode.decode("ascii")
+            end = start + count * struct.calcsize(typecode)
+            self._columns[name.rstrip(b"\0").decode("ascii")] = self._view[start:end].cast(typecode)
+
+        columns = self._columns
+        self._string_offsets = columns["string_offsets"]
+        self._strings = columns["strings"]
+        self._string = lru_cache(maxsize=DECODED_CACHE_SIZE)(self._decode_string)
+        self.heroes = _Section(columns["hero_ids"], lambda row: self._string(columns["hero_names"][row]))
+        self.items = _Section(columns["item_ids"], self._decode_item)
+        self.skills = _Section(columns["skill_ids"], self._decode_skill)
+
+    def column(self, name: str) -> memoryview:
+        """Return a zero-copy view of one column, e.g. "item_cooldowns"."""
+        return self._columns[name]
+
+    def numpy_column(self, name: str):
+        """Return a zero-copy, read-only NumPy array over one column (needs numpy)."""
+        import numpy
+
+        return numpy.frombuffer(self._columns[name], dtype=self._columns[name].format)
+
+    def _decode_string(self, index: int) -> Optional[str]:
+        if index == NULL_STRING:
+            return None
+        return str(self._strings[self._string_offsets[index]:self._string_offsets[index + 1]], "utf-8")
+
+    def _types(self, prefix: str, row: int) -> Tuple[str, ...]:
+        offsets, flat = self._columns[f"{prefix}_type_offsets"], self._columns[f"{prefix}_types"]
+        return tuple(self._string(index) for index in flat[offsets[row]:offsets[row + 1]])
+
+    def _decode_item(self, row: int) -> CatalogItem:
+        columns, string = self._columns, self._string
+        cooldown = columns["item_cooldowns"][row]
+        return CatalogItem(
+            id=columns["item_ids"][row],
+            name=string(columns["item_names"][row]),
+            size=string(columns["item_sizes"][row]),
+            source=string(columns["item_sources"][row]),
+            hero_id=_nullable(columns["item_hero_ids"][row]),
+            monster_id=_nullable(columns["item_monster_ids"][row]),
+            cooldown=None if math.isnan(cooldown) else cooldown,
+            effect=string(columns["item_effects"][row]),
+            cost=_nullable(columns["item_costs"][row]),
+            types=self._types("item", row),
+        )
+
+    def _decode_skill(self, row: int) -> CatalogSkill:
+        columns, string = self._columns, self._string
+        return CatalogSkill(
+            id=columns["skill_ids"][row],
+            name=string(columns["skill_names"][row]),
+            source=string(columns["skill_sources"][row]),
+            hero_id=_nullable(columns["skill_hero_ids"][row]),
+            monster_id=_nullable(columns["skill_monster_ids"][row]),
+            tier=string(columns["skill_tiers"][row]),
+            effect=string(columns["skill_effects"][row]),
+            types=self._types("skill", row),
+        )
+
+    def _pool(self, prefix: str, section: _Section, hero_id: Optional[int], include_universal: bool,
+              include_monster: bool) -> list:
+        # Filter on the source and hero columns; only matching rows are decoded
+        hero_specific, universal, monster = range(len(SOURCES))
+        wanted = {hero_specific}
+        if include_universal:
+            wanted.add(universal)
+        if include_monster:
+            wanted.add(monster)
+        hero_value = _int(hero_id)
+        sources, heroes = self._columns[f"{prefix}_sources"], self._columns[f"{prefix}_hero_ids"]
+        return [
+            section._record(row) for row, source in enumerate(sources)
+            if source in wanted and (source != hero_specific or heroes[row] == hero_value)
+        ]
+
+    def items_for_hero(self, hero_id: Optional[int], include_universal: bool = True,
+                       include_monster: bool = False) -> List[CatalogItem]:
+        return self._pool("item", self.items, hero_id, include_universal, include_monster)
+
+    def skills_for_hero(self, hero_id: Optional[int], include_universal: bool = True,
+                        include_monster: bool = False) -> List[CatalogSkill]:
+        return self._pool("skill", self.skills, hero_id, include_universal, include_monster)
+
+    def __reduce__(self):
+        # Worker pools receive a plain in-memory copy rather than a path that may be swapped
+        return (Catalog, (dict(self.heroes), list(self.items.values()), list(self.skills.values())))
+
+    def close(self) -> None:
+        """Unmap the file; only call once no reader holds records from it."""
+        for section in ("heroes", "items", "skills"):
+            if hasattr(self, section):
+                getattr(self, section).clear()
+        if hasattr(self, "_string"):
+            self._string.cache_clear()
+        for view in self._columns.values():
+            view.release()
+        self._view.release()
+        self._mmap.close()
+
+def _nullable(value: int) -> Optional[int]:
+    return None if value == NULL_INT else value
+
+def _notify_path(path: str) -> str:
+    return f"{path}.pid"
+
+def notify_workers(path: str) -> None:
+    """Tell the launcher that a new snapshot generation is in place.
+
+    The launcher writes its PID next to the snapshot and forwards SIGUSR1
+    to every worker. Without a launcher this is a no-op.
+    """
+    try:
+        with open(_notify_path(path), "r") as f:
+            pid = int(f.read().strip())
+        os.kill(pid, signal.SIGUSR1)
+    except (FileNotFoundError, ValueError, ProcessLookupError, PermissionError):
+        pass
+
+def publish_snapshot(db: Session, path: str, notify: bool = True) -> int:
+    """Write the database's current catalog as the next snapshot generation.
+
+    An exclusive lock on ``<path>.lock`` serializes publishers, so the
+    last snapshot written always reflects the latest committed data.
+
+    Returns:
+        The new generation
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            generation = read_generation(path) + 1
+            catalog = load_catalog(db)
+            write_snapshot(catalog, path, generation)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    logger.info(f"Published catalog snapshot generation {generation} ({catalog.version})")
+    if notify:
+        notify_workers(path)
+    return generation
+
+def open_snapshot(path: str) -> Optional[MappedCatalog]:
+    """Map the snapshot at ``path``, or return None if there is none yet."""
+    try:
+        return MappedCatalog(path)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        # Written by an older format; the caller publishes a fresh one
+        logger.warning(str(e))
+        return None
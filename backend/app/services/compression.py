@@ -0,0 +1,108 @@
+# app/services/compression.py
+
+import gzip
+import os
+import threading
+import time
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    # Optional; without it only gzip is offered
+    brotli = None
+
+from app.services.metrics import registry
+
+GZIP = "gzip"
+BROTLI = "br"
+# Preferred first when the client rates several equally
+SUPPORTED_ENCODINGS = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+# Bodies smaller than this are sent as they are; the headers would eat the saving
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", 1024))
+# CPU seconds per second that compressing responses may use, and how much of
+# that may be spent at once. Over budget, responses go out uncompressed.
+COMPRESSION_CPU_SHARE = float(os.environ.get("COMPRESSION_CPU_SHARE", 0.2))
+COMPRESSION_CPU_BURST = float(os.environ.get("COMPRESSION_CPU_BURST", 0.5))
+
+# Fast levels for bodies compressed per request; the highest for payloads
+# compressed once and stored
+DYNAMIC_LEVELS = {BROTLI: 4, GZIP: 6}
+STORED_LEVELS = {BROTLI: 11, GZIP: 9}
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the supported encoding the client rates highest in Accept-Encoding, or None for identity."""
+    if not accept_encoding:
+        return None
+    ratings = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        ratings[coding.strip().lower()] = quality
+    wildcard = ratings.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = ratings.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+class CompressionBudget:
+    """Token bucket of CPU seconds for compression.
+
+    Refills at ``share`` seconds per second up to ``burst``. Dynamic
+    compression only runs while the bucket is positive; compressing
+    stored payloads is always allowed but is charged too, so it delays
+    dynamic compression instead of adding to it.
+    """
+
+    def __init__(self, share: float, burst: float):
+        self.share = share
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.share)
+        self._updated = now
+
+    def available(self) -> bool:
+        with self._lock:
+            self._refill()
+            return self._tokens > 0
+
+    def charge(self, seconds: float) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens -= seconds
+
+compression_budget = CompressionBudget(COMPRESSION_CPU_SHARE, COMPRESSION_CPU_BURST)
+
+def compress(data: bytes, encoding: str, level: int, kind: str = "dynamic") -> bytes:
+    """Compress a body, charging the CPU time to the compression budget.
+
+    Args:
+        data: Uncompressed body
+        encoding: GZIP or BROTLI
+        level: gzip level or brotli quality
+        kind: "dynamic" or "stored", for the metrics
+    """
+    started = time.thread_time()
+    if encoding == BROTLI:
+        compressed = brotli.compress(data, quality=level)
+    else:
+        # A fixed mtime keeps the output, and so stored payloads, reproducible
+        compressed = gzip.compress(data, compresslevel=level, mtime=0)
+    seconds = time.thread_time() - started
+    compression_budget.charge(seconds)
+    registry.record_compression(encoding, kind, len(data), len(compressed), seconds)
+    return compressed
@@ -0,0 +1,126 @@
+# app/services/cooccurrence.py
+
+from collections import Counter, defaultdict
+from itertools import permutations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.models.build import BuildItem, BuildSkill
+from app.models.cooccurrence import ItemFrequency, ItemPair, ItemSkillPair
+
+# Item IDs and skill IDs of one build
+BuildContents = Tuple[Iterable[int], Iterable[int]]
+# A build as it was before a write and as it is after; None for "did not exist"
+BuildChange = Tuple[Optional[BuildContents], Optional[BuildContents]]
+
+# Recomputes every count from the build tables. Plain SQL, so the dataset
+# generator can run it on its own sqlite3 connection.
+REBUILD_STATEMENTS = (
+    "DELETE FROM item_frequencies",
+    "DELETE FROM item_pairs",
+    "DELETE FROM item_skill_pairs",
+    "INSERT INTO item_frequencies (item_id, builds) "
+    "SELECT item_id, COUNT(DISTINCT build_id) FROM build_items GROUP BY item_id",
+    "INSERT INTO item_pairs (item_id, partner_id, builds) "
+    "SELECT a.item_id, b.item_id, COUNT(DISTINCT a.build_id) FROM build_items a "
+    "JOIN build_items b ON b.build_id = a.build_id AND b.item_id != a.item_id "
+    "GROUP BY a.item_id, b.item_id",
+    "INSERT INTO item_skill_pairs (item_id, skill_id, builds) "
+    "SELECT bi.item_id, bs.skill_id, COUNT(DISTINCT bi.build_id) FROM build_items bi "
+    "JOIN build_skills bs ON bs.build_id = bi.build_id "
+    "GROUP BY bi.item_id, bs.skill_id",
+)
+
+class _Deltas:
+    """Count changes accumulated over a set of build writes."""
+
+    def __init__(self):
+        self.items: Counter = Counter()
+        self.item_pairs: Counter = Counter()
+        self.skill_pairs: Counter = Counter()
+
+    def add(self, contents: BuildContents, sign: int) -> None:
+        item_ids, skill_ids = set(contents[0]), set(contents[1])
+        for item_id in item_ids:
+            self.items[item_id] += sign
+            for skill_id in skill_ids:
+                self.skill_pairs[item_id, skill_id] += sign
+        for pair in permutations(item_ids, 2):
+            self.item_pairs[pair] += sign
+
+def _upsert(db: Session, model, keys: Sequence[str], deltas: Counter) -> None:
+    rows = [{**dict(zip(keys, key if isinstance(key, tuple) else (key,))), "builds": delta}
+            for key, delta in deltas.items() if delta]
+    if not rows:
+        return
+    statement = insert(model)
+    db.execute(statement.on_conflict_do_update(index_elements=list(keys),
+                                               set_={"builds": model.builds + statement.excluded.builds}), rows)
+    if any(row["builds"] < 0 for row in rows):
+        touched = list({row["item_id"] for row in rows})
+        db.query(model).filter(model.item_id.in_(touched), model.builds <= 0).delete(synchronize_session=False)
+
+def record_build_changes(db: Session, changes: Iterable[BuildChange]) -> None:
+    """Update the co-occurrence counts for builds that were created, changed or deleted.
+
+    Changes are summed first, so a bulk write costs one executemany per
+    table. Call it inside the transaction that writes the builds; it does
+    not commit.
+
+    Args:
+        db: Database session
+        changes: (before, after) contents of each written build
+    """
+    deltas = _Deltas()
+    for before, after in changes:
+        if before is not None:
+            deltas.add(before, -1)
+        if after is not None:
+            deltas.add(after, 1)
+    _upsert(db, ItemFrequency, ("item_id",), deltas.items)
+    _upsert(db, ItemPair, ("item_id", "partner_id"), deltas.item_pairs)
+    _upsert(db, ItemSkillPair, ("item_id", "skill_id"), deltas.skill_pairs)
+
+def build_contents(db: Session, build_ids: List[int]) -> Dict[int, BuildContents]:
+    """Load the item and skill IDs of stored builds (two statements)."""
+    items: Dict[int, List[int]] = defaultdict(list)
+    skills: Dict[int, List[int]] = defaultdict(list)
+    if build_ids:
+        for build_id, item_id in db.query(BuildItem.build_id, BuildItem.item_id) \
+                .filter(BuildItem.build_id.in_(build_ids)):
+            items[build_id].append(item_id)
+        for build_id, skill_id in db.query(BuildSkill.build_id, BuildSkill.skill_id) \
+                .filter(BuildSkill.build_id.in_(build_ids)):
+            skills[build_id].append(skill_id)
+    return {build_id: (items[build_id], skills[build_id]) for build_id in build_ids}
+
+def rebuild_cooccurrence(db: Session) -> Dict[str, int]:
+    """Recompute every count from the stored builds and commit.
+
+    Returns:
+        Number of rows in each count table
+    """
+    for statement in REBUILD_STATEMENTS:
+        db.execute(text(statement))
+    db.commit()
+    return {model.__tablename__: db.query(model).count() for model in (ItemFrequency, ItemPair, ItemSkillPair)}
+
+def top_partners(db: Session, item_id: int, limit: int) -> Tuple[int, List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """Return how many builds contain an item and its most frequent item and skill partners.
+
+    Both lists are read in order from the ``*_top`` indexes, so the cost
+    depends on ``limit``, not on how many partners the item has.
+
+    Returns:
+        (builds with the item, [(item_id, builds)], [(skill_id, builds)]),
+        most frequent first
+    """
+    frequency = db.query(ItemFrequency.builds).filter(ItemFrequency.item_id == item_id).scalar() or 0
+    items = db.query(ItemPair.partner_id, ItemPair.builds).filter(ItemPair.item_id == item_id) \
+        .order_by(ItemPair.builds.desc(), ItemPair.partner_id).limit(limit).all()
+    skills = db.query(ItemSkillPair.skill_id, ItemSkillPair.builds).filter(ItemSkillPair.item_id == item_id) \
+        .order_by(ItemSkillPair.builds.desc(), ItemSkillPair.skill_id).limit(limit).all()
+    return frequency, [tuple(row) for row in items], [tuple(row) for row in skills]
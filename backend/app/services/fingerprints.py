@@ -0,0 +1,134 @@
+# app/services/fingerprints.py
+
+import hashlib
+import json
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.build import Build, BuildItem, BuildSkill
+from app.schemas.build import BuildCreate
+from app.services.aggregate_stats import record_build_stats
+from app.services.cooccurrence import build_contents, record_build_changes
+
+# Hex digits in a fingerprint (a 128-bit BLAKE2b digest)
+FINGERPRINT_LENGTH = 32
+
+# Builds fingerprinted per transaction by the backfill
+BACKFILL_BATCH_SIZE = 1000
+
+class DuplicateBuild(Exception):
+    """Raised when a write would give a build the fingerprint of another build."""
+
+    def __init__(self, build_id: int):
+        super().__init__(f"Build {build_id} already has the same hero, items and skills")
+        self.build_id = build_id
+
+def build_fingerprint(hero_id: int, items: Iterable[Tuple[int, Optional[str]]], skills: Iterable[int]) -> str:
+    """Hash the parts of a build that make two builds the same build.
+
+    Name, description and the order items and skills were sent in do not
+    count: the hash covers the hero, the (slot, item) pairs ordered by
+    slot and the sorted set of skills.
+
+    Args:
+        hero_id: The build's hero
+        items: (item_id, slot) pairs
+        skills: Skill IDs
+
+    Returns:
+        A hex digest of FINGERPRINT_LENGTH characters
+    """
+    pairs = sorted((slot is None, slot or "", item_id) for item_id, slot in items)
+    canonical = [hero_id, [[None if unslotted else slot, item_id] for unslotted, slot, item_id in pairs],
+                 sorted(set(skills))]
+    payload = json.dumps(canonical, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=FINGERPRINT_LENGTH // 2).hexdigest()
+
+def fingerprint_of(build: BuildCreate) -> str:
+    """Return the fingerprint of a build in a create request."""
+    return build_fingerprint(build.hero_id, ((bi.item_id, bi.slot) for bi in build.build_items),
+                             (bs.skill_id for bs in build.build_skills))
+
+def find_fingerprints(db: Session, fingerprints: Iterable[str]) -> Dict[str, int]:
+    """Return the ID of the build holding each of ``fingerprints`` that is taken (one statement)."""
+    wanted = list(set(fingerprints))
+    if not wanted:
+        return {}
+    return dict(db.query(Build.fingerprint, Build.id).filter(Build.fingerprint.in_(wanted)))
+
+def stored_fingerprints(db: Session, build_ids: List[int]) -> Dict[int, str]:
+    """Compute the fingerprints of stored builds from their rows (three statements)."""
+    if not build_ids:
+        return {}
+    items: Dict[int, List[Tuple[int, Optional[str]]]] = defaultdict(list)
+    for build_id, item_id, slot in db.query(BuildItem.build_id, BuildItem.item_id, BuildItem.slot) \
+            .filter(BuildItem.build_id.in_(build_ids)):
+        items[build_id].append((item_id, slot))
+    skills: Dict[int, List[int]] = defaultdict(list)
+    for build_id, skill_id in db.query(BuildSkill.build_id, BuildSkill.skill_id) \
+            .filter(BuildSkill.build_id.in_(build_ids)):
+        skills[build_id].append(skill_id)
+    return {
+        build_id: build_fingerprint(hero_id, items[build_id], skills[build_id])
+        for build_id, hero_id in db.query(Build.id, Build.hero_id).filter(Build.id.in_(build_ids))
+    }
+
+def backfill_fingerprints(db: Session, batch_size: int = BACKFILL_BATCH_SIZE,
+                          delete_duplicates: bool = False) -> Dict[str, Any]:
+    """Fingerprint every build that has no fingerprint yet.
+
+    Builds are processed in ID order, one transaction per batch. A
+    fingerprint goes to the build that already holds it, else to the
+    oldest of a set of identical builds. The other copies cannot share it
+    (the column is unique); they are left without one and reported, or
+    deleted with ``delete_duplicates``.
+
+    Args:
+        db: Database session
+        batch_size: Builds per transaction
+        delete_duplicates: Delete copies instead of reporting them
+
+    Returns:
+        Dictionary with the number of builds fingerprinted and deleted, and
+        the copies found as {"build_id", "duplicate_of"} entries
+    """
+    fingerprinted = deleted = 0
+    duplicates: List[Dict[str, int]] = []
+    after = 0
+    while True:
+        build_ids = [build_id for (build_id,) in db.query(Build.id)
+                     .filter(Build.fingerprint.is_(None), Build.id > after)
+                     .order_by(Build.id).limit(batch_size)]
+        if not build_ids:
+            break
+        after = build_ids[-1]
+
+        computed = stored_fingerprints(db, build_ids)
+        owners = find_fingerprints(db, computed.values())
+        rows = []
+        copies = []
+        for build_id in build_ids:
+            fingerprint = computed[build_id]
+            if fingerprint in owners:
+                copies.append(build_id)
+                duplicates.append({"build_id": build_id, "duplicate_of": owners[fingerprint]})
+            else:
+                owners[fingerprint] = build_id
+                rows.append({"id": build_id, "fingerprint": fingerprint})
+        if rows:
+            db.execute(update(Build), rows)
+        if copies and delete_duplicates:
+            contents = build_contents(db, copies)
+            heroes = dict(db.query(Build.id, Build.hero_id).filter(Build.id.in_(copies)).all())
+            record_build_changes(db, ((before, None) for before in contents.values()))
+            record_build_stats(db, ((heroes[build_id], before, None) for build_id, before in contents.items()))
+            for model in (BuildItem, BuildSkill):
+                db.query(model).filter(model.build_id.in_(copies)).delete(synchronize_session=False)
+            db.query(Build).filter(Build.id.in_(copies)).delete(synchronize_session=False)
+            deleted += len(copies)
+        db.commit()
+        fingerprinted += len(rows)
+    return {"fingerprinted": fingerprinted, "duplicates": duplicates, "deleted": deleted}
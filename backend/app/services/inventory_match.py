@@ -0,0 +1,277 @@
+# app/services/inventory_match.py
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.build import Build, BuildItem, BuildSkill
+
+# Builds whose match scores a recommendation tries to raise
+DEFAULT_TOP_BUILDS = 20
+MAX_TOP_BUILDS = 500
+
+ITEM = "item"
+SKILL = "skill"
+
+# Builds written this long before the newest change seen are read again
+# when catching up, in case their transaction committed late
+CATCH_UP_WINDOW = timedelta(seconds=60)
+# Replaced entries tolerated before a hero's postings are reloaded
+MAX_DEAD_SHARE = 0.25
+# Share of the builds an inventory change may rescore before re-sorting the
+# whole ranking beats moving each build within it
+RESORT_SHARE = 0.1
+
+def match_percentage(matched_items: int, total_items: int, matched_skills: int, total_skills: int) -> float:
+    """Score how much of a build an inventory already has, from 0 to 100.
+
+    Items and skills count for half each; a build with no items (or no
+    skills) has that half complete.
+    """
+    item_match = matched_items / total_items * 100 if total_items else 100
+    skill_match = matched_skills / total_skills * 100 if total_skills else 100
+    return (item_match + skill_match) / 2
+
+class HeroBuilds:
+    """One hero's builds as posting lists: which builds contain each item and skill.
+
+    Builds are stored by position. A changed build gets a new position and
+    its old one is left dead (positions are live while ``position`` maps
+    their build to them), so catching up with writes only appends.
+    """
+
+    def __init__(self, hero_id: int):
+        self.hero_id = hero_id
+        self.build_ids: List[int] = []
+        self.total_items: List[int] = []
+        self.total_skills: List[int] = []
+        self.postings: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        self.position: Dict[int, int] = {}
+        self.versions: Dict[int, int] = {}
+        self.version_sum = 0
+        # (build count, version sum, newest updated_at) when last synced
+        self.token: Optional[tuple] = None
+
+    def is_live(self, p: int) -> bool:
+        return self.position.get(self.build_ids[p]) == p
+
+    @property
+    def dead(self) -> int:
+        return len(self.build_ids) - len(self.position)
+
+    def _put(self, build_id: int, version: int, item_ids: List[int], skill_ids: List[int]) -> None:
+        p = len(self.build_ids)
+        self.build_ids.append(build_id)
+        self.total_items.append(len(item_ids))
+        self.total_skills.append(len(skill_ids))
+        for kind, ids in ((ITEM, item_ids), (SKILL, skill_ids)):
+            for entity_id in set(ids):
+                self.postings[kind, entity_id].append(p)
+        self.position[build_id] = p
+        self.version_sum += version - self.versions.get(build_id, 0)
+        self.versions[build_id] = version
+
+    def _read(self, db: Session, since=None) -> None:
+        """Read the hero's builds, or those updated since a time, into the postings (three statements)."""
+        builds = db.query(Build.id, Build.version).filter(Build.hero_id == self.hero_id)
+        if since is not None:
+            builds = builds.filter(Build.updated_at >= since)
+        versions = dict(builds.all())
+        if not versions:
+            return
+        items: Dict[int, List[int]] = defaultdict(list)
+        skills: Dict[int, List[int]] = defaultdict(list)
+        item_rows = db.query(BuildItem.build_id, BuildItem.item_id)
+        skill_rows = db.query(BuildSkill.build_id, BuildSkill.skill_id)
+        if since is None:
+            item_rows = item_rows.join(Build, Build.id == BuildItem.build_id).filter(Build.hero_id == self.hero_id)
+            skill_rows = skill_rows.join(Build, Build.id == BuildSkill.build_id).filter(Build.hero_id == self.hero_id)
+        else:
+            item_rows = item_rows.filter(BuildItem.build_id.in_(list(versions)))
+            skill_rows = skill_rows.filter(BuildSkill.build_id.in_(list(versions)))
+        for build_id, item_id in item_rows:
+            items[build_id].append(item_id)
+        for build_id, skill_id in skill_rows:
+            skills[build_id].append(skill_id)
+        for build_id in sorted(versions):
+            self._put(build_id, versions[build_id], items.get(build_id, []), skills.get(build_id, []))
+
+    def sync(self, db: Session) -> bool:
+        """Bring the postings up to date with the database.
+
+        A covering-index query over the hero's builds detects any create,
+        update or delete. Created and updated builds are read again on
+        their own; if the counts still disagree afterwards (a build was
+        deleted), everything is reloaded.
+
+        Returns:
+            True if anything was read
+        """
+        token = tuple(db.query(func.count(Build.id), func.coalesce(func.sum(Build.version), 0),
+                               func.max(Build.updated_at)).filter(Build.hero_id == self.hero_id).one())
+        if token == self.token:
+            return False
+        if self.token is not None and self.token[2] is not None and self.dead <= len(self.position) * MAX_DEAD_SHARE:
+            self._read(db, since=self.token[2] - CATCH_UP_WINDOW)
+            if (len(self.position), self.version_sum) == token[:2]:
+                self.token = token
+                return True
+        self.__init__(self.hero_id)
+        self._read(db)
+        self.token = token
+        return True
+
+class MatchCounters:
+    """Per-build match counters for one inventory against one hero's builds.
+
+    Matched counts are a pass over the postings of the owned items and
+    skills. The effect of adding one more only touches the builds in its
+    posting list, so ranking candidates, or applying an inventory change
+    with ``apply``, never re-runs the whole match.
+
+    Built while holding the cache lock; positions appended by a later
+    sync are ignored, and a full reload replaces the lists held here
+    rather than changing them.
+    """
+
+    def __init__(self, builds: HeroBuilds, owned_items: Iterable[int], owned_skills: Iterable[int]):
+        self.postings = builds.postings
+        self.build_ids = builds.build_ids
+        self.total_items = builds.total_items
+        self.total_skills = builds.total_skills
+        self.size = n = len(builds.build_ids)
+        self.owned = {(ITEM, item_id) for item_id in owned_items} | {(SKILL, skill_id) for skill_id in owned_skills}
+        # Owned items and skills in each build
+        self.matched = {ITEM: [0] * n, SKILL: [0] * n}
+        for kind, entity_id in self.owned:
+            for p in self.postings.get((kind, entity_id), ()):
+                self.matched[kind][p] += 1
+        self.live = [builds.is_live(p) for p in range(n)]
+        self.scores = [self._score(p) for p in range(n)]
+        # Live positions by score, best first
+        self.order = sorted((p for p in range(n) if self.live[p]), key=self._rank_key)
+
+    def _score(self, p: int) -> float:
+        return match_percentage(self.matched[ITEM][p], self.total_items[p],
+                                self.matched[SKILL][p], self.total_skills[p])
+
+    def _rank_key(self, p: int) -> Tuple[float, int]:
+        return -self.scores[p], self.build_ids[p]
+
+    def is_current(self, builds: HeroBuilds) -> bool:
+        """Whether these counters were computed from the builds as they are now."""
+        return self.postings is builds.postings and self.size == len(builds.build_ids)
+
+    def apply(self, kind: str, entity_id: int, owned: bool) -> List[int]:
+        """Add an item or skill to the inventory, or remove it.
+
+        Only the builds containing it are rescored and moved in ``order``
+        (or, if they are a large share of the builds, ``order`` is re-sorted).
+
+        Returns:
+            Positions of the builds whose score changed
+        """
+        if ((kind, entity_id) in self.owned) == owned:
+            return []
+        if owned:
+            self.owned.add((kind, entity_id))
+        else:
+            self.owned.discard((kind, entity_id))
+        n = self.size
+        affected = [p for p in self.postings.get((kind, entity_id), ()) if p < n and self.live[p]]
+        counts = self.matched[kind]
+        step = 1 if owned else -1
+        if len(affected) > len(self.order) * RESORT_SHARE:
+            for p in affected:
+                counts[p] += step
+                self.scores[p] = self._score(p)
+            self.order.sort(key=self._rank_key)
+            return affected
+        for p in affected:
+            del self.order[bisect_left(self.order, self._rank_key(p), key=self._rank_key)]
+            counts[p] += step
+            self.scores[p] = self._score(p)
+            insort(self.order, p, key=self._rank_key)
+        return affected
+
+    def top_score(self, top_builds: int) -> float:
+        """Sum of the ``top_builds`` best match scores."""
+        return sum(self.scores[p] for p in self.order[:top_builds])
+
+    def gain(self, kind: str, entity_id: int, top_builds: int) -> Tuple[float, int]:
+        """How much adding one item or skill raises the sum of the best match scores.
+
+        Builds can enter the top as well as improve within it. Only the
+        builds containing the candidate are rescored.
+
+        Returns:
+            The gain in summed match percentage, and how many builds contain
+            the candidate
+        """
+        if (kind, entity_id) in self.owned:
+            return 0.0, 0
+        n = self.size
+        affected = [p for p in self.postings.get((kind, entity_id), ()) if p < n and self.live[p]]
+        if not affected:
+            return 0.0, 0
+        totals = self.total_items if kind == ITEM else self.total_skills
+        changed = set(affected)
+        # A build's half for this kind goes up by one of its members' share
+        raised = heapq.nlargest(top_builds, (self.scores[p] + 50 / totals[p] for p in affected))
+        unchanged = []
+        for p in self.order:
+            if len(unchanged) == top_builds:
+                break
+            if p not in changed:
+                unchanged.append(self.scores[p])
+        new_top = sum(heapq.nlargest(top_builds, raised + unchanged))
+        return new_top - self.top_score(top_builds), len(affected)
+
+    def recommend(self, top_builds: int, limit: int,
+                  candidates: Optional[Iterable[Tuple[str, int]]] = None) -> List[Tuple[str, int, float, int]]:
+        """Rank candidate items and skills by their gain.
+
+        Args:
+            top_builds: How many of the best-matching builds to improve
+            limit: Most recommendations to return
+            candidates: (ITEM or SKILL, id) pairs to rank; defaults to
+                everything the builds use that the inventory lacks
+
+        Returns:
+            (kind, id, gain, builds containing it), best first, zero gains left out
+        """
+        if candidates is None:
+            candidates = [key for key in list(self.postings) if key not in self.owned]
+        ranked = []
+        for kind, entity_id in dict.fromkeys(candidates):
+            gain, builds = self.gain(kind, entity_id, top_builds)
+            if gain > 0:
+                ranked.append((kind, entity_id, gain, builds))
+        ranked.sort(key=lambda entry: (-entry[2], -entry[3], entry[0], entry[1]))
+        return ranked[:limit]
+
+_heroes: Dict[int, HeroBuilds] = {}
+_heroes_lock = threading.Lock()
+
+def match_counters(db: Session, hero_id: int, owned_items: Iterable[int], owned_skills: Iterable[int],
+                   current: Optional[MatchCounters] = None) -> MatchCounters:
+    """Return match counters for an inventory, from the hero's cached and synced postings.
+
+    Args:
+        current: Counters kept from an earlier call for the same inventory;
+            returned as they are if no build has changed since
+    """
+    with _heroes_lock:
+        builds = _heroes.get(hero_id)
+        if builds is None:
+            builds = _heroes[hero_id] = HeroBuilds(hero_id)
+        builds.sync(db)
+        if current is not None and current.is_current(builds):
+            return current
+        return MatchCounters(builds, owned_items, owned_skills)
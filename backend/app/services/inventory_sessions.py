@@ -0,0 +1,163 @@
+# app/services/inventory_sessions.py
+
+import itertools
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services.inventory_match import ITEM, MatchCounters, match_counters
+
+# Builds a session pushes the ranking of
+DEFAULT_RANKING_SIZE = 20
+MAX_RANKING_SIZE = 100
+
+# Match state all sessions together may hold. Over the cap, the state of
+# the sessions idle longest is dropped; they keep their inventory and
+# recompute the state on their next change.
+SESSION_MEMORY_MB = float(os.environ.get("SESSION_MEMORY_MB", 64))
+# Sessions active more recently than this are never evicted
+SESSION_MIN_IDLE_SECONDS = float(os.environ.get("SESSION_MIN_IDLE_SECONDS", 30))
+# Size of one build's entry in MatchCounters (two counts, a liveness flag,
+# a float score and its slot in the ranking order), measured with tracemalloc
+BYTES_PER_BUILD = 110
+
+# (rank, build_id, match percentage)
+RankingEntry = Tuple[int, int, float]
+
+class SessionsFull(Exception):
+    """Raised when a session's match state does not fit even after evicting idle sessions."""
+
+class InventorySession:
+    """One client's inventory and the match state kept for it between changes."""
+
+    def __init__(self, hero_id: int, ranking_size: int):
+        self.id = next(_session_ids)
+        self.hero_id = hero_id
+        self.ranking_size = ranking_size
+        self.item_ids: set = set()
+        self.skill_ids: set = set()
+        self.counters: Optional[MatchCounters] = None
+        # What the client was last sent: build_id -> (rank, match percentage)
+        self.sent: Dict[int, Tuple[int, float]] = {}
+        self.last_active = time.monotonic()
+
+    @property
+    def memory(self) -> int:
+        return self.counters.size * BYTES_PER_BUILD if self.counters is not None else 0
+
+    def set_inventory(self, item_ids: Iterable[int], skill_ids: Iterable[int]) -> None:
+        """Replace the whole inventory; the match state is recomputed on the next refresh."""
+        self.item_ids = set(item_ids)
+        self.skill_ids = set(skill_ids)
+        self.counters = None
+
+    def change(self, kind: str, entity_id: int, owned: bool) -> int:
+        """Add an item or skill to the inventory, or remove it.
+
+        Returns:
+            Number of builds rescored
+        """
+        owned_ids = self.item_ids if kind == ITEM else self.skill_ids
+        if owned:
+            owned_ids.add(entity_id)
+        else:
+            owned_ids.discard(entity_id)
+        if self.counters is None:
+            return 0
+        return len(self.counters.apply(kind, entity_id, owned))
+
+    def ranking(self) -> List[RankingEntry]:
+        counters = self.counters
+        return [(rank, counters.build_ids[p], round(counters.scores[p], 2))
+                for rank, p in enumerate(counters.order[:self.ranking_size], start=1)]
+
+    def diff(self) -> Tuple[List[RankingEntry], List[int]]:
+        """Compare the ranking with what the client was last sent, and record it as sent.
+
+        Returns:
+            Entries that are new or whose rank or percentage changed, and the
+            build IDs that left the ranking
+        """
+        ranking = self.ranking()
+        current = {build_id: (rank, percentage) for rank, build_id, percentage in ranking}
+        changed = [entry for entry in ranking if self.sent.get(entry[1]) != (entry[0], entry[2])]
+        removed = [build_id for build_id in self.sent if build_id not in current]
+        self.sent = current
+        return changed, removed
+
+class SessionRegistry:
+    """Open inventory sessions and the memory their match state uses."""
+
+    def __init__(self, memory_cap: int, min_idle: float):
+        self.memory_cap = memory_cap
+        self.min_idle = min_idle
+        self.sessions: Dict[int, InventorySession] = {}
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def open(self, hero_id: int, ranking_size: int = DEFAULT_RANKING_SIZE) -> InventorySession:
+        session = InventorySession(hero_id, ranking_size)
+        with self._lock:
+            self.sessions[session.id] = session
+        return session
+
+    def close(self, session: InventorySession) -> None:
+        with self._lock:
+            self.sessions.pop(session.id, None)
+        session.counters = None
+
+    def refresh(self, db: Session, session: InventorySession) -> None:
+        """Make a session's match state current before it is used.
+
+        State dropped by eviction, or computed before a build of the hero
+        changed, is recomputed, evicting idle sessions if that goes over
+        the memory cap.
+
+        Raises:
+            SessionsFull: If the state does not fit
+        """
+        session.last_active = time.monotonic()
+        counters = match_counters(db, session.hero_id, session.item_ids, session.skill_ids, session.counters)
+        if counters is session.counters:
+            return
+        session.counters = None
+        with self._lock:
+            needed = counters.size * BYTES_PER_BUILD
+            used = sum(other.memory for other in self.sessions.values())
+            if used + needed > self.memory_cap:
+                used -= self._evict(used + needed - self.memory_cap, session)
+            if used + needed > self.memory_cap:
+                raise SessionsFull(f"No room for this session under the {self.memory_cap / 2**20:g} MiB session memory cap")
+            session.counters = counters
+
+    def _evict(self, needed: int, keep: InventorySession) -> int:
+        """Drop the state of the sessions idle longest until ``needed`` bytes are free (lock held)."""
+        cutoff = time.monotonic() - self.min_idle
+        idle = sorted((other for other in self.sessions.values()
+                       if other is not keep and other.counters is not None and other.last_active <= cutoff),
+                      key=lambda other: other.last_active)
+        freed = 0
+        for other in idle:
+            if freed >= needed:
+                break
+            freed += other.memory
+            other.counters = None
+            self.evictions += 1
+        return freed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self.sessions),
+                "holding_state": sum(1 for session in self.sessions.values() if session.counters is not None),
+                "memory_bytes": sum(session.memory for session in self.sessions.values()),
+                "memory_cap_bytes": self.memory_cap,
+                "evictions": self.evictions,
+            }
+
+_session_ids = itertools.count(1)
+
+inventory_sessions = SessionRegistry(int(SESSION_MEMORY_MB * 2**20), SESSION_MIN_IDLE_SECONDS)
@@ -0,0 +1,315 @@
+# app/services/jobs.py
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database.database import SessionLocal
+from app.models.job import Job
+from app.schemas.optimizer import OptimizerRequest
+from app.schemas.simulation import SimulationRequest
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+TERMINAL_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested."""
+
+Reporter = Callable[[float, Optional[str]], None]
+
+def _make_reporter(db: Session, job_id: int) -> Reporter:
+    def report(progress: float, message: Optional[str] = None) -> None:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        db.refresh(job)
+        if job.cancel_requested:
+            raise JobCancelled()
+        job.progress = max(0.0, min(1.0, progress))
+        job.message = message
+        db.commit()
+    return report
+
+def _run_simulation(params: Dict[str, Any], report: Reporter) -> Dict[str, Any]:
+    from app.routes.simulation_routes import run_cached_simulation
+    from app.services.catalog import load_catalog
+
+    db = SessionLocal()
+    try:
+        catalog = load_catalog(db)
+    finally:
+        db.close()
+    report(0.1, "Simulating")
+    return run_cached_simulation(catalog, **SimulationRequest(**params).model_dump())
+
+def _run_optimization(params: Dict[str, Any], report: Reporter) -> Dict[str, Any]:
+    from dataclasses import asdict
+    from app.services.catalog import load_catalog
+    from app.simulation.optimizer import IslandOptimizer, OptimizerConfig
+
+    db = SessionLocal()
+    try:
+        catalog = load_catalog(db)
+    finally:
+        db.close()
+    config = OptimizerConfig(**OptimizerRequest(**params).model_dump())
+    result = IslandOptimizer(catalog, config).run(progress=report)
+    return asdict(result)
+
+def _run_import(params: Dict[str, Any], report: Reporter) -> Dict[str, Any]:
+    from app.utils.data_importer import DataImporter
+
+    # Always the server's own data files; clients never name paths to read
+    importer = DataImporter()
+    importer.run(
+        heroes_file=str(DATA_DIR / "heroes.json"),
+        items_file=str(DATA_DIR / "items.json"),
+        skills_file=str(DATA_DIR / "skills.json"),
+        progress=report,
+    )
+    return importer.counts
+
+# Job kind -> handler(params, report) -> JSON-serializable result
+HANDLERS: Dict[str, Callable[[Dict[str, Any], Reporter], Dict[str, Any]]] = {
+    "simulate": _run_simulation,
+    "optimize": _run_optimization,
+    "import": _run_import,
+}
+
+# Jobs whose completion changes the catalog the server process has cached
+CATALOG_CHANGING_KINDS = {"import"}
+
+# Job kind -> request schema its parameters must satisfy (None: takes no parameters)
+PARAM_SCHEMAS = {
+    "simulate": SimulationRequest,
+    "optimize": OptimizerRequest,
+    "import": None,
+}
+
+def validate_params(kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Check a submission's parameters against its kind's request schema.
+
+    Jobs get the same bounds as the matching synchronous routes.
+
+    Returns:
+        The parameters with defaults filled in, as stored and passed to the handler
+
+    Raises:
+        ValueError: If the kind has no handler, or a parameter is unknown or invalid
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    schema = PARAM_SCHEMAS[kind]
+    unknown = set(params) - (set(schema.model_fields) if schema is not None else set())
+    if unknown:
+        raise ValueError(f"Unknown parameters for {kind} jobs: {sorted(unknown)}")
+    if schema is None:
+        return {}
+    # pydantic's ValidationError is a ValueError
+    return schema(**params).model_dump()
+
+def dedupe_key(kind: str, params: Dict[str, Any]) -> str:
+    """Return the coalescing key of a submission."""
+    encoded = json.dumps({"kind": kind, "params": params}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def execute_job(job_id: int) -> str:
+    """Run a claimed job to completion; executed in a worker process.
+
+    Returns:
+        The job's final status
+    """
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job is None:
+            return FAILED
+        handler = HANDLERS.get(job.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job.kind}")
+            result = handler(json.loads(job.params or "{}"), _make_reporter(db, job_id))
+            job.status = SUCCEEDED
+            job.progress = 1.0
+            job.result = json.dumps(result)
+        except JobCancelled:
+            db.rollback()
+            job.status = CANCELLED
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"Job {job_id} failed")
+            job.status = FAILED
+            job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        return job.status
+    finally:
+        db.close()
+
+class JobManager:
+    """In-process job queue backed by the jobs table and a process pool.
+
+    A dispatcher thread claims queued jobs (highest priority first, then
+    oldest) and hands them to worker processes. Jobs that were running or
+    queued when the server stopped are requeued on start.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.environ.get("JOB_WORKERS", 0)) or max(1, (os.cpu_count() or 2) // 2)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._running: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        requeued = self.requeue_unfinished()
+        if requeued:
+            logger.info(f"Requeued {requeued} unfinished jobs")
+        # Spawned workers get their own database engine instead of a forked copy
+        self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        if self._executor is not None:
+            # Running jobs are left as "running" and requeued on the next start
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def requeue_unfinished() -> int:
+        db = SessionLocal()
+        try:
+            db.query(Job).filter(Job.status == RUNNING, Job.cancel_requested.is_(True)).update(
+                {Job.status: CANCELLED, Job.finished_at: datetime.utcnow()}, synchronize_session=False
+            )
+            count = db.query(Job).filter(Job.status == RUNNING).update(
+                {Job.status: QUEUED, Job.started_at: None}, synchronize_session=False
+            )
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+    def submit(self, db: Session, kind: str, params: Dict[str, Any], priority: int = 0) -> Job:
+        """Queue a job, or return the active job with the same kind and parameters.
+
+        Raises:
+            ValueError: If the kind has no handler or the parameters are invalid
+        """
+        params = validate_params(kind, params)
+        key = dedupe_key(kind, params)
+        existing = db.query(Job).filter(Job.dedupe_key == key, Job.status.in_(ACTIVE_STATUSES)).first()
+        if existing is not None:
+            if priority > (existing.priority or 0) and existing.status == QUEUED:
+                existing.priority = priority
+                db.commit()
+            return existing
+
+        job = Job(kind=kind, params=json.dumps(params), dedupe_key=key, priority=priority, status=QUEUED)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self._wakeup.set()
+        return job
+
+    def cancel(self, db: Session, job: Job) -> Job:
+        """Cancel a queued job immediately, or ask a running one to stop."""
+        if job.status == QUEUED:
+            job.status = CANCELLED
+            job.finished_at = datetime.utcnow()
+        elif job.status == RUNNING:
+            job.cancel_requested = True
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def _claim_next(self, db: Session) -> Optional[int]:
+        candidate = (
+            db.query(Job.id)
+            .filter(Job.status == QUEUED)
+            .order_by(Job.priority.desc(), Job.id.asc())
+            .first()
+        )
+        if candidate is None:
+            return None
+        # Conditional update so two dispatchers never claim the same job
+        claimed = db.query(Job).filter(Job.id == candidate.id, Job.status == QUEUED).update(
+            {Job.status: RUNNING, Job.started_at: datetime.utcnow(), Job.attempts: Job.attempts + 1},
+            synchronize_session=False,
+        )
+        db.commit()
+        return candidate.id if claimed else None
+
+    def _dispatch_loop(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(timeout=1.0)
+            self._wakeup.clear()
+            db = SessionLocal()
+            try:
+                while not self._stopping.is_set():
+                    with self._lock:
+                        if len(self._running) >= self.max_workers:
+                            break
+                    job_id = self._claim_next(db)
+                    if job_id is None:
+                        break
+                    future = self._executor.submit(execute_job, job_id)
+                    with self._lock:
+                        self._running[job_id] = future
+                    future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+            except Exception:
+                logger.exception("Job dispatcher error")
+            finally:
+                db.close()
+
+    def _on_done(self, job_id: int, future: Future) -> None:
+        with self._lock:
+            self._running.pop(job_id, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            if error is not None and job is not None and job.status == RUNNING:
+                # The worker process died before it could record the outcome
+                job.status = FAILED
+                job.error = str(error)
+                job.finished_at = datetime.utcnow()
+                db.commit()
+            if job is not None and job.status == SUCCEEDED and job.kind in CATALOG_CHANGING_KINDS:
+                from app.services.catalog import invalidate_catalog
+                invalidate_catalog()
+        finally:
+            db.close()
+        self._wakeup.set()
+
+job_manager = JobManager()
@@ -0,0 +1,205 @@
+# app/services/metrics.py
+
+import bisect
+import contextvars
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram bucket upper bounds, Prometheus style (+Inf is implicit)
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+class RequestMetrics:
+    """Counters for the request currently being served."""
+    __slots__ = ("started", "sql_seconds", "sql_statements", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.started = time.perf_counter()
+        # ASGI scope, so SQL hooks can see the matched route
+        self.scope = scope
+        self.sql_seconds = 0.0
+        self.sql_statements = 0
+
+# The request being served; None outside requests (jobs, scripts, startup)
+current_request: contextvars.ContextVar[Optional[RequestMetrics]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[Tuple[str, str], ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Tuple[Tuple[str, str], ...], value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        # Counts are stored per bucket and accumulated when rendered
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels in sorted(self._series):
+            counts, total = self._series[labels]
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{_format(bound)}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {_format(total[0])}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+class Counter:
+    """Monotonic counter, one series per label set."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._series: Dict[Tuple[Tuple[str, str], ...], float] = {}
+
+    def inc(self, labels: Tuple[Tuple[str, str], ...], amount: float = 1) -> None:
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels in sorted(self._series):
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+            lines.append(f"{self.name}{{{label_text}}} {_format(self._series[labels])}")
+        return lines
+
+class Gauge:
+    """Value that goes up and down, one series per label set."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._series: Dict[Tuple[Tuple[str, str], ...], float] = {}
+
+    def set(self, labels: Tuple[Tuple[str, str], ...], value: float) -> None:
+        self._series[labels] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for labels in sorted(self._series):
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+            lines.append(f"{self.name}{{{label_text}}} {_format(self._series[labels])}")
+        return lines
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class MetricsRegistry:
+    """Process-wide request metrics, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter("http_requests_total", "Requests by route template and status")
+        self.duration = Histogram("http_request_duration_seconds", "Wall time per request", DURATION_BUCKETS)
+        self.sql_duration = Histogram("http_request_sql_duration_seconds", "Time spent in SQL per request",
+                                      DURATION_BUCKETS)
+        self.sql_statements = Histogram("http_request_sql_statements", "SQL statements per request",
+                                        STATEMENT_BUCKETS)
+        self.response_size = Histogram("http_response_size_bytes", "Response body size", SIZE_BUCKETS)
+        self.compression_bytes = Counter("http_compression_bytes_total",
+                                         "Bytes before (in) and after (out) compression, by encoding and kind")
+        self.compression_seconds = Counter("http_compression_cpu_seconds_total", "CPU time spent compressing")
+        self.compression_skipped = Counter("http_compression_skipped_total",
+                                           "Compressible responses sent uncompressed, by reason")
+        self.admission_in_flight = Gauge("http_admission_in_flight", "Requests being served, by route class")
+        self.admission_queue_depth = Gauge("http_admission_queue_depth", "Requests waiting for a slot, by route class")
+        self.admission_wait = Histogram("http_admission_wait_seconds", "Time admitted requests waited for a slot",
+                                        DURATION_BUCKETS)
+        self.admission_rejected = Counter("http_admission_rejected_total",
+                                          "Requests turned away, by route class and reason")
+        self._metrics = (self.requests, self.duration, self.sql_duration, self.sql_statements, self.response_size,
+                         self.compression_bytes, self.compression_seconds, self.compression_skipped,
+                         self.admission_in_flight, self.admission_queue_depth, self.admission_wait,
+                         self.admission_rejected)
+
+    def record(self, method: str, route: str, status: int, metrics: RequestMetrics, duration: float,
+               size: int) -> None:
+        labels = (("method", method), ("route", route))
+        with self._lock:
+            self.requests.inc(labels + (("status", str(status)),))
+            self.duration.observe(labels, duration)
+            self.sql_duration.observe(labels, metrics.sql_seconds)
+            self.sql_statements.observe(labels, metrics.sql_statements)
+            self.response_size.observe(labels, size)
+
+    def record_compression(self, encoding: str, kind: str, size_in: int, size_out: int, seconds: float) -> None:
+        labels = (("encoding", encoding), ("kind", kind))
+        with self._lock:
+            self.compression_bytes.inc(labels + (("stage", "in"),), size_in)
+            self.compression_bytes.inc(labels + (("stage", "out"),), size_out)
+            self.compression_seconds.inc(labels, seconds)
+
+    def record_compression_skip(self, reason: str) -> None:
+        with self._lock:
+            self.compression_skipped.inc((("reason", reason),))
+
+    def record_admission_state(self, route_class: str, in_flight: int, queued: int) -> None:
+        labels = (("class", route_class),)
+        with self._lock:
+            self.admission_in_flight.set(labels, in_flight)
+            self.admission_queue_depth.set(labels, queued)
+
+    def record_admission_wait(self, route_class: str, seconds: float) -> None:
+        with self._lock:
+            self.admission_wait.observe((("class", route_class),), seconds)
+
+    def record_admission_rejection(self, route_class: str, reason: str) -> None:
+        with self._lock:
+            self.admission_rejected.inc((("class", route_class), ("reason", reason)))
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [line for metric in self._metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+_instrumented_engines = set()
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute SQL statements and their time to the request being served."""
+    if id(engine) in _instrumented_engines:
+        return
+    _instrumented_engines.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if current_request.get() is not None:
+            conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        metrics = current_request.get()
+        started = conn.info.get("metrics_started")
+        if metrics is None or not started:
+            return
+        metrics.sql_seconds += time.perf_counter() - started.pop()
+        metrics.sql_statements += 1
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("metrics_started"):
+            connection.info["metrics_started"].pop()
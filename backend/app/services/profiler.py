@@ -0,0 +1,223 @@
+# app/services/profiler.py
+
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, List, Optional
+
+from app.database.database import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", str(BASE_DIR / "profiles")))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 2))
+# Profile 1 in N requests in the background (0 turns background sampling off)
+PROFILE_SAMPLE_RATE = int(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 200))
+TOP_FRAMES = 25
+
+_labels: Dict[CodeType, str] = {}
+_search_roots = sorted({os.path.abspath(p or ".") for p in sys.path if os.path.isdir(p or ".")}, key=len, reverse=True)
+
+def debug_access_allowed(token: Optional[str], client_host: Optional[str]) -> bool:
+    """Return whether a request may use debug features.
+
+    With DEBUG_TOKEN set, the request must carry the matching token. Without
+    it, only loopback clients (local development) are allowed.
+
+    Args:
+        token: The request's X-Debug-Token header, if any
+        client_host: The peer address of the request, if known
+    """
+    expected = os.environ.get("DEBUG_TOKEN")
+    if expected:
+        return token is not None and hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+    try:
+        return client_host is not None and ipaddress.ip_address(client_host).is_loopback
+    except ValueError:
+        return False
+
+def frame_label(code: CodeType) -> str:
+    """Return "package/module.py:function" for a code object."""
+    label = _labels.get(code)
+    if label is None:
+        filename = os.path.abspath(code.co_filename)
+        for root in _search_roots:
+            if filename.startswith(root + os.sep):
+                filename = filename[len(root) + 1:]
+                break
+        label = _labels[code] = f"{filename}:{code.co_name}".replace(";", ",")
+    return label
+
+class SamplingProfiler:
+    """Periodically sample the stacks that belong to one request.
+
+    A request's async code runs on the event loop thread, so samples of
+    that thread are kept only while the request's own middleware frame is
+    on the stack. Sync endpoints run in threadpool threads; samples of
+    those are kept when the endpoint function is on the stack, so
+    concurrent requests to the same sync endpoint can be mixed in.
+    """
+
+    def __init__(self, request_frame: FrameType, endpoint: Callable[[], Optional[Callable]],
+                 interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.request_frame = request_frame
+        self.endpoint = endpoint
+        self.interval = interval
+        self.loop_thread = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            endpoint = self.endpoint()
+            endpoint_code = getattr(endpoint, "__code__", None)
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = self._stack(frame, self.request_frame if thread_id == self.loop_thread else None,
+                                    endpoint_code if thread_id != self.loop_thread else None)
+                if stack:
+                    self.stacks[";".join(stack)] += 1
+                    self.samples += 1
+
+    @staticmethod
+    def _stack(frame: Optional[FrameType], root_frame: Optional[FrameType],
+               root_code: Optional[CodeType]) -> Optional[List[str]]:
+        """Return the labels from the root frame down to the leaf, or None if the root is not on the stack."""
+        labels = []
+        while frame is not None:
+            labels.append(frame_label(frame.f_code))
+            if frame is root_frame or (root_code is not None and frame.f_code is root_code):
+                labels.reverse()
+                return labels
+            frame = frame.f_back
+        return None
+
+def summarize(stacks: Counter, limit: int = TOP_FRAMES) -> Dict[str, List[Dict[str, Any]]]:
+    """Return the frames with the most self and total samples."""
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+    samples = sum(stacks.values()) or 1
+
+    def rows(counts: Counter) -> List[Dict[str, Any]]:
+        return [{"frame": frame, "samples": count, "percent": round(100 * count / samples, 1)}
+                for frame, count in counts.most_common(limit)]
+
+    return {"self": rows(self_counts), "total": rows(total_counts)}
+
+class ProfileStore:
+    """Profiles on disk: <id>.collapsed (flamegraph input) and <id>.json (summary)."""
+
+    def __init__(self, directory: Path = PROFILE_DIR, keep: int = PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        """Return a new profile ID; IDs sort by creation time."""
+        return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id: str, profiler: SamplingProfiler, meta: Dict[str, Any]) -> None:
+        summary = {
+            "id": profile_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "samples": profiler.samples,
+            "interval_ms": profiler.interval * 1000,
+            **meta,
+            "top_frames": summarize(profiler.stacks),
+        }
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / f"{profile_id}.collapsed", 'w', encoding='utf-8') as f:
+                for stack, count in profiler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            with open(self.directory / f"{profile_id}.json", 'w', encoding='utf-8') as f:
+                json.dump(summary, f)
+            self._prune()
+
+    def _prune(self) -> None:
+        summaries = sorted(self.directory.glob("*.json"))
+        for path in summaries[:max(0, len(summaries) - self.keep)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".collapsed").unlink(missing_ok=True)
+
+    def list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return profile summaries without their top frames, newest first."""
+        if not self.directory.exists():
+            return []
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True)[:limit]:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    summary = json.load(f)
+            except (OSError, ValueError):
+                continue
+            summary.pop("top_frames", None)
+            summaries.append(summary)
+        return summaries
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        # IDs come from URLs, so only accept names this store could have written
+        if not profile_id or "/" in profile_id or "\\" in profile_id or profile_id.startswith("."):
+            return None
+        path = self.directory / f"{profile_id}{suffix}"
+        return path if path.exists() else None
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(profile_id, ".json")
+        if path is None:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def collapsed_path(self, profile_id: str) -> Optional[Path]:
+        return self._path(profile_id, ".collapsed")
+
+profile_store = ProfileStore()
+
+class RequestSampler:
+    """Decide which requests are profiled in the background: every Nth one."""
+
+    def __init__(self, rate: int = PROFILE_SAMPLE_RATE):
+        self.rate = rate
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def should_profile(self) -> bool:
+        if self.rate <= 0:
+            return False
+        with self._lock:
+            self._count += 1
+            return self._count % self.rate == 0
+
+request_sampler = RequestSampler()
+
+def elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
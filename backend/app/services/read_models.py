@@ -0,0 +1,146 @@
+# app/services/read_models.py
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from sqlalchemy.orm import Query, Session
+
+from app.models.build import Build, BuildItem, BuildSkill
+from app.models.item import Item
+from app.models.skill import Skill
+
+# Most IDs one batch lookup may ask for
+MAX_BATCH_IDS = 1000
+
+class ReadModel:
+    """Base class for read-only records built from column projections.
+
+    Read routes select only the columns a record needs and map each row
+    straight into a ``__slots__`` instance. Nothing enters the session's
+    identity map, nothing is change-tracked and there are no lazy
+    relationships to trigger extra queries. Write routes keep using the
+    ORM models.
+    """
+
+    __slots__ = ()
+    # Mapped columns in the order of __slots__
+    columns: Sequence[Any] = ()
+
+    def __init__(self, *values: Any):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name, None)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+R = TypeVar("R", bound=ReadModel)
+
+class ItemRecord(ReadModel):
+    """Item columns used by the item read routes."""
+    __slots__ = ("id", "name", "description", "size", "source", "hero_id", "monster_id", "cooldown", "effect",
+                 "cost", "types")
+    columns = (Item.id, Item.name, Item.description, Item.size, Item.source, Item.hero_id, Item.monster_id,
+               Item.cooldown, Item.effect, Item.cost, Item.types)
+
+class SkillRecord(ReadModel):
+    """Skill columns used by the skill read routes."""
+    __slots__ = ("id", "name", "description", "source", "hero_id", "monster_id", "tier", "effect", "types")
+    columns = (Skill.id, Skill.name, Skill.description, Skill.source, Skill.hero_id, Skill.monster_id, Skill.tier,
+               Skill.effect, Skill.types)
+
+class BuildItemRecord(ReadModel):
+    __slots__ = ("id", "build_id", "item_id", "slot")
+    columns = (BuildItem.id, BuildItem.build_id, BuildItem.item_id, BuildItem.slot)
+
+class BuildSkillRecord(ReadModel):
+    __slots__ = ("id", "build_id", "skill_id")
+    columns = (BuildSkill.id, BuildSkill.build_id, BuildSkill.skill_id)
+
+class BuildRecord(ReadModel):
+    """A build with its item and skill rows, shaped like BuildResponse."""
+    __slots__ = ("id", "name", "description", "hero_id", "created_at", "updated_at", "version", "fingerprint",
+                 "build_items", "build_skills")
+    columns = (Build.id, Build.name, Build.description, Build.hero_id, Build.created_at, Build.updated_at,
+               Build.version, Build.fingerprint)
+
+def project(query: Query, model: Type[R]) -> List[R]:
+    """Run a query as a projection onto a record type.
+
+    Args:
+        query: Any query over the record's table, filters included
+        model: Record type whose columns are selected
+
+    Returns:
+        One record per row, in query order
+    """
+    return [model(*row) for row in query.with_entities(*model.columns)]
+
+def project_one(query: Query, model: Type[R]) -> Optional[R]:
+    """Return the first row of a query as a record, or None."""
+    row = query.with_entities(*model.columns).first()
+    return model(*row) if row is not None else None
+
+def load_builds(db: Session, query: Query) -> List[BuildRecord]:
+    """Project builds and attach their item and skill rows.
+
+    Three statements in total, however many builds the query returns.
+
+    Args:
+        db: Database session
+        query: Query over Build, filters, ordering and paging included
+
+    Returns:
+        Build records with ``build_items`` and ``build_skills`` filled in
+    """
+    rows = query.with_entities(*BuildRecord.columns).all()
+    if not rows:
+        return []
+    build_ids = [row[0] for row in rows]
+    items: Dict[int, List[BuildItemRecord]] = defaultdict(list)
+    for record in project(db.query(BuildItem).filter(BuildItem.build_id.in_(build_ids)).order_by(BuildItem.id),
+                          BuildItemRecord):
+        items[record.build_id].append(record)
+    skills: Dict[int, List[BuildSkillRecord]] = defaultdict(list)
+    for record in project(db.query(BuildSkill).filter(BuildSkill.build_id.in_(build_ids)).order_by(BuildSkill.id),
+                          BuildSkillRecord):
+        skills[record.build_id].append(record)
+    return [BuildRecord(*row, items.get(row[0], []), skills.get(row[0], [])) for row in rows]
+
+def records_by_id(db: Session, model: Type[R], ids: Iterable[int]) -> Dict[int, R]:
+    """Project the rows with the given IDs into a {id: record} dict (one statement)."""
+    ids = list(set(ids))
+    if not ids:
+        return {}
+    table = model.columns[0].class_
+    return {record.id: record for record in project(db.query(table).filter(model.columns[0].in_(ids)), model)}
+
+def parse_id_list(ids: Optional[str]) -> List[int]:
+    """Split a comma-separated query parameter into integer IDs.
+
+    Raises:
+        ValueError: If a value is not an integer
+    """
+    if not ids:
+        return []
+    return [int(value) for value in ids.split(",") if value.strip()]
+
+def lookup_batch(db: Session, model: Type[R], ids: Iterable[int]) -> Tuple[Dict[int, R], List[int]]:
+    """Resolve many IDs with one statement.
+
+    Args:
+        db: Database session
+        model: Record type to project into
+        ids: Requested IDs, possibly repeated
+
+    Returns:
+        The found records keyed by ID and the IDs that were not found,
+        both in request order
+    """
+    requested = list(dict.fromkeys(ids))
+    records = records_by_id(db, model, requested)
+    found = {record_id: records[record_id] for record_id in requested if record_id in records}
+    return found, [record_id for record_id in requested if record_id not in records]
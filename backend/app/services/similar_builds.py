@@ -0,0 +1,310 @@
+# app/services/similar_builds.py
+
+import random
+import threading
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.build import Build, BuildItem, BuildSkill
+
+# MinHash signature length, split into BANDS bands of ROWS rows. Two builds
+# become candidates when all rows of one band agree, which for Jaccard
+# similarity s happens with probability 1 - (1 - s^ROWS)^BANDS: about 0.15
+# at s = 0.2, 0.42 at s = 0.3 and 0.93 at s = 0.5.
+BANDS = 20
+ROWS = 3
+
+# Writes are merged into the sorted bucket arrays once this many builds (or
+# this share of the indexed builds, if more) have been added since the last merge
+COMPACT_MIN_BUILDS = 1000
+COMPACT_RATIO = 0.25
+
+# Most neighbours one query may ask for
+MAX_SIMILAR_BUILDS = 100
+
+# Builds written this long before the newest change seen are read again
+# when catching up, in case their transaction committed late
+CATCH_UP_WINDOW = timedelta(seconds=60)
+
+# Largest Mersenne prime below 2^64, the modulus of the hash family
+_PRIME = (1 << 61) - 1
+_SEED = 1234
+
+Features = Tuple[int, ...]
+# A bucket with one build holds its ID; a set only once a second build arrives
+Bucket = Union[int, Set[int]]
+
+def build_features(item_ids: Iterable[int], skill_ids: Iterable[int]) -> Features:
+    """Return the set a build is compared by: its distinct items and skills, slots ignored."""
+    return tuple(sorted({item_id * 2 for item_id in item_ids} | {skill_id * 2 + 1 for skill_id in skill_ids}))
+
+def jaccard(a: Features, b: Features) -> float:
+    if not a and not b:
+        return 1.0
+    common = len(set(a).intersection(b))
+    return common / (len(a) + len(b) - common)
+
+class MinHashLSH:
+    """MinHash signatures of builds in a banded locality-sensitive hash index.
+
+    Each band of a build's signature is hashed into a bucket; a query
+    looks only at the builds sharing at least one bucket with it and
+    ranks those by their exact Jaccard similarity. The work per query
+    grows with the number of similar builds, not with the library.
+
+    Buckets of the builds indexed by ``load`` are kept as sorted
+    (band key, build ID) arrays, 16 bytes per entry. Writes go to small
+    per-band dicts on top; the entries they replace are skipped through a
+    set of stale build IDs until the next compaction merges the dicts
+    back into the arrays.
+    """
+
+    def __init__(self):
+        rng = random.Random(_SEED)
+        self._params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(BANDS * ROWS)]
+        self.features: Dict[int, Features] = {}
+        # Per-feature hash vectors; the catalog is far smaller than the library
+        self._hashes: Dict[int, array] = {}
+        self._keys: List[array] = [array("q") for _ in range(BANDS)]
+        self._ids: List[array] = [array("q") for _ in range(BANDS)]
+        self._overlay: List[Dict[int, Bucket]] = [{} for _ in range(BANDS)]
+        self._overlay_builds = 0
+        # Builds whose entries in the sorted arrays no longer apply
+        self._stale: Set[int] = set()
+        # Newest Build.updated_at read from the database
+        self.synced_until: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def __contains__(self, build_id: int) -> bool:
+        return build_id in self.features
+
+    def _feature_hashes(self, feature: int) -> array:
+        hashes = self._hashes.get(feature)
+        if hashes is None:
+            hashes = self._hashes[feature] = array("Q", ((a * feature + b) % _PRIME for a, b in self._params))
+        return hashes
+
+    def signature(self, features: Features) -> Tuple[int, ...]:
+        """Return the MinHash signature of a feature set."""
+        if not features:
+            return (_PRIME,) * len(self._params)
+        return tuple(map(min, zip(*(self._feature_hashes(feature) for feature in features))))
+
+    def _band_keys(self, features: Features) -> List[int]:
+        signature = self.signature(features)
+        return [hash(signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+    def add(self, build_id: int, features: Features) -> None:
+        """Index a build, replacing what was indexed for it before."""
+        if self.features.get(build_id) == features:
+            return
+        self.remove(build_id)
+        self.features[build_id] = features
+        for overlay, key in zip(self._overlay, self._band_keys(features)):
+            bucket = overlay.get(key)
+            if bucket is None:
+                overlay[key] = build_id
+            elif isinstance(bucket, int):
+                overlay[key] = {bucket, build_id}
+            else:
+                bucket.add(build_id)
+        self._overlay_builds += 1
+        if self._overlay_builds > max(COMPACT_MIN_BUILDS, len(self._keys[0]) * COMPACT_RATIO):
+            self.compact()
+
+    def remove(self, build_id: int) -> None:
+        features = self.features.pop(build_id, None)
+        if features is None:
+            return
+        self._stale.add(build_id)
+        for overlay, key in zip(self._overlay, self._band_keys(features)):
+            bucket = overlay.get(key)
+            if bucket == build_id:
+                del overlay[key]
+            elif isinstance(bucket, set):
+                bucket.discard(build_id)
+                if len(bucket) == 1:
+                    overlay[key] = bucket.pop()
+
+    def candidates(self, features: Features) -> Set[int]:
+        """Return every build sharing at least one band bucket with a feature set."""
+        found: Set[int] = set()
+        for band, key in enumerate(self._band_keys(features)):
+            keys, ids = self._keys[band], self._ids[band]
+            position = bisect_left(keys, key)
+            while position < len(keys) and keys[position] == key:
+                if ids[position] not in self._stale:
+                    found.add(ids[position])
+                position += 1
+            bucket = self._overlay[band].get(key)
+            if isinstance(bucket, int):
+                found.add(bucket)
+            elif bucket:
+                found |= bucket
+        return found
+
+    def similar(self, build_id: int, k: int) -> Tuple[List[Tuple[int, float]], int]:
+        """Return up to ``k`` approximate nearest neighbours of an indexed build.
+
+        Returns:
+            (build_id, Jaccard similarity) pairs, most similar first, and
+            the number of candidates that were compared
+        """
+        features = self.features[build_id]
+        candidates = self.candidates(features)
+        candidates.discard(build_id)
+        scored = [(candidate, jaccard(features, self.features[candidate])) for candidate in candidates]
+        scored.sort(key=lambda entry: (-entry[1], entry[0]))
+        return scored[:k], len(candidates)
+
+    def _set_sorted(self, band: int, keys: array, ids: array) -> None:
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys[band] = array("q", (keys[i] for i in order))
+        self._ids[band] = array("q", (ids[i] for i in order))
+
+    def compact(self) -> None:
+        """Merge the write dicts into the sorted arrays and drop stale entries."""
+        for band in range(BANDS):
+            keys, ids = array("q"), array("q")
+            for key, build_id in zip(self._keys[band], self._ids[band]):
+                if build_id not in self._stale:
+                    keys.append(key)
+                    ids.append(build_id)
+            for key, bucket in self._overlay[band].items():
+                for build_id in ((bucket,) if isinstance(bucket, int) else bucket):
+                    keys.append(key)
+                    ids.append(build_id)
+            self._set_sorted(band, keys, ids)
+        self._overlay = [{} for _ in range(BANDS)]
+        self._overlay_builds = 0
+        self._stale = set()
+
+    @staticmethod
+    def _read_features(db: Session, *criteria) -> Dict[int, Features]:
+        """Return the features of the builds matching ``criteria``, or of every build (one statement per table)."""
+        builds = db.query(Build.id)
+        item_rows = db.query(BuildItem.build_id, BuildItem.item_id)
+        skill_rows = db.query(BuildSkill.build_id, BuildSkill.skill_id)
+        if criteria:
+            builds = builds.filter(*criteria)
+            item_rows = item_rows.join(Build, Build.id == BuildItem.build_id).filter(*criteria)
+            skill_rows = skill_rows.join(Build, Build.id == BuildSkill.build_id).filter(*criteria)
+        items: Dict[int, List[int]] = defaultdict(list)
+        for build_id, item_id in item_rows:
+            items[build_id].append(item_id)
+        skills: Dict[int, List[int]] = defaultdict(list)
+        for build_id, skill_id in skill_rows:
+            skills[build_id].append(skill_id)
+        return {
+            build_id: build_features(items.pop(build_id, ()), skills.pop(build_id, ()))
+            for (build_id,) in builds.order_by(Build.id)
+        }
+
+    @classmethod
+    def load(cls, db: Session) -> "MinHashLSH":
+        """Index every stored build (one statement per table)."""
+        index = cls()
+        # Read first, so writes made while loading are caught up with later
+        index.synced_until = db.query(func.max(Build.updated_at)).scalar()
+        keys = [array("q") for _ in range(BANDS)]
+        ids = array("q")
+        for build_id, features in cls._read_features(db).items():
+            index.features[build_id] = features
+            ids.append(build_id)
+            for band_keys, key in zip(keys, index._band_keys(features)):
+                band_keys.append(key)
+        for band in range(BANDS):
+            index._set_sorted(band, keys[band], ids)
+        return index
+
+    def catch_up(self, db: Session) -> int:
+        """Index builds created or updated since the last load or catch-up.
+
+        The newest ``updated_at`` is one lookup in its index, so this costs
+        a single small query when nothing has changed. Writes made through
+        this process are already indexed and read again as no-ops. Deletes
+        are not seen here; find_similar drops them as it meets them.
+
+        Returns:
+            Number of builds read
+        """
+        newest = db.query(func.max(Build.updated_at)).scalar()
+        if newest is None or newest == self.synced_until:
+            return 0
+        criteria = ()
+        if self.synced_until is not None:
+            criteria = (Build.updated_at >= self.synced_until - CATCH_UP_WINDOW,)
+        changed = self._read_features(db, *criteria)
+        for build_id, features in changed.items():
+            self.add(build_id, features)
+        self.synced_until = newest
+        return len(changed)
+
+_index: Optional[MinHashLSH] = None
+_index_lock = threading.Lock()
+
+def get_similarity_index(db: Session) -> MinHashLSH:
+    """Return the similar-build index, loading it from the database on first use.
+
+    Each process keeps its own index. Write routes update it through
+    index_build and forget_build; builds written through other worker
+    processes (or other tools) are caught up with on every call, from
+    the newest ``updated_at`` the index has read.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = MinHashLSH.load(db)
+        else:
+            _index.catch_up(db)
+        return _index
+
+def index_build(build_id: int, item_ids: Iterable[int], skill_ids: Iterable[int]) -> None:
+    """Add or replace a build in the index, if it has been loaded."""
+    features = build_features(item_ids, skill_ids)
+    with _index_lock:
+        if _index is not None:
+            _index.add(build_id, features)
+
+def forget_build(build_id: int) -> None:
+    """Remove a deleted build from the index, if it has been loaded."""
+    with _index_lock:
+        if _index is not None:
+            _index.remove(build_id)
+
+def find_similar(db: Session, build_id: int, k: int) -> Optional[Tuple[List[Tuple[int, float]], int]]:
+    """Return the ``k`` builds most like a build, or None if it does not exist.
+
+    The index catches up with builds written elsewhere first. Builds
+    deleted through another process are still indexed until a query
+    returns them; they are checked against the database and dropped, and
+    the query repeated. See MinHashLSH.similar for the result.
+    """
+    index = get_similarity_index(db)
+    while True:
+        with _index_lock:
+            if build_id not in index:
+                break
+            found = index.similar(build_id, k)
+        wanted = [build_id] + [neighbour_id for neighbour_id, _ in found[0]]
+        existing = {found_id for (found_id,) in db.query(Build.id).filter(Build.id.in_(wanted))}
+        if len(existing) == len(wanted):
+            return found
+        with _index_lock:
+            for gone_id in set(wanted) - existing:
+                index.remove(gone_id)
+    # Not indexed: missing, or committed too late for the catch-up window
+    features = MinHashLSH._read_features(db, Build.id == build_id).get(build_id)
+    if features is None:
+        return None
+    with _index_lock:
+        index.add(build_id, features)
+        return index.similar(build_id, k)
@@ -0,0 +1,176 @@
+# app/services/slow_queries.py
+
+import logging
+import os
+import re
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.services.metrics import current_request
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 100))
+SLOW_QUERY_LOG_SIZE = int(os.environ.get("SLOW_QUERY_LOG_SIZE", 200))
+
+# Full scans of these tables are flagged: they grow with the catalog and the build count
+WATCHED_TABLES = ("items", "skills", "build_items")
+
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+# Frames in these files are plumbing, not call sites
+_SKIPPED_FILES = (str(Path(__file__).resolve()), str(Path(APP_DIR) / "database" / "database.py"))
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_TABLE_REFERENCE = re.compile(r'\b(?:FROM|JOIN)\s+"?(\w+)"?(?:\s+(?:AS\s+)?"?(\w+)"?)?', re.IGNORECASE)
+_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+_KEYWORDS = {"where", "join", "left", "right", "inner", "outer", "cross", "on", "group", "order", "limit",
+             "union", "natural", "using", "set", "values", "having", "offset", "as"}
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace, replace literals with ? and shorten IN lists to (?...)."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return _PLACEHOLDER_LIST.sub("(?...)", normalized)
+
+def parameter_shape(parameters: Any, executemany: bool) -> str:
+    """Describe parameter types without recording their values, e.g. "(int, str)" or "50 x (int, int)"."""
+    def shape(row: Any) -> str:
+        if isinstance(row, dict):
+            return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in row.items()) + "}"
+        if isinstance(row, (list, tuple)):
+            return "(" + ", ".join(type(value).__name__ for value in row) + ")"
+        return type(row).__name__
+
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {shape(rows[0])}" if rows else "0 rows"
+    return shape(parameters or ())
+
+def _table_aliases(statement: str) -> Dict[str, str]:
+    aliases = {}
+    for table, alias in _TABLE_REFERENCE.findall(statement):
+        aliases[table.lower()] = table.lower()
+        if alias and alias.lower() not in _KEYWORDS:
+            aliases[alias.lower()] = table.lower()
+    return aliases
+
+def full_scans(plan: Sequence[str], statement: str) -> List[str]:
+    """Return the tables a query plan scans without an index."""
+    aliases = _table_aliases(statement)
+    tables = []
+    for detail in plan:
+        match = _FULL_SCAN.match(detail.strip())
+        if match:
+            name = match.group(1).lower()
+            tables.append(aliases.get(name, name))
+    return tables
+
+def _call_site() -> Optional[str]:
+    """Return "module.py:line in function" for the innermost application frame."""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(APP_DIR) and frame.filename not in _SKIPPED_FILES:
+            return f"{os.path.relpath(frame.filename, os.path.dirname(APP_DIR))}:{frame.lineno} in {frame.name}"
+    return None
+
+def _explain(cursor: Any, statement: str, parameters: Any) -> List[str]:
+    try:
+        explain_cursor = cursor.connection.cursor()
+        try:
+            explain_cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            return [row[-1] for row in explain_cursor.fetchall()]
+        finally:
+            explain_cursor.close()
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+
+class SlowQueryLog:
+    """Bounded ring buffer of statements that took longer than a threshold."""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, size: int = SLOW_QUERY_LOG_SIZE):
+        self.threshold_ms = threshold_ms
+        self._entries: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.total = 0
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            entry["id"] = self._next_id
+            self._next_id += 1
+            self.total += 1
+            self._entries.append(entry)
+
+    def entries(self, limit: Optional[int] = None, flagged_only: bool = False) -> List[Dict[str, Any]]:
+        """Return logged statements, newest first."""
+        with self._lock:
+            entries = [entry for entry in reversed(self._entries) if entry["flagged"] or not flagged_only]
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def observe(self, cursor: Any, statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+        duration_ms = seconds * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        plan = [] if executemany else _explain(cursor, statement, parameters)
+        scans = full_scans(plan, statement)
+        flagged = sorted({table for table in scans if table in WATCHED_TABLES})
+        request = current_request.get()
+        route = request.scope.get("route") if request is not None and request.scope is not None else None
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "statement": normalize_sql(statement),
+            "parameters": parameter_shape(parameters, executemany),
+            "method": request.scope.get("method") if request is not None and request.scope is not None else None,
+            "route": getattr(route, "path", None),
+            "call_site": _call_site(),
+            "plan": plan,
+            "full_scans": scans,
+            "flagged_tables": flagged,
+            "flagged": bool(flagged),
+        }
+        self.record(entry)
+        if flagged:
+            logger.warning(f"Slow query ({duration_ms:.1f} ms) scans {', '.join(flagged)}: {entry['statement'][:200]}")
+
+slow_query_log = SlowQueryLog()
+
+_instrumented_engines = set()
+
+def instrument_slow_queries(engine: Engine, log: SlowQueryLog = slow_query_log) -> None:
+    """Time every statement on ``engine`` and log the ones over the threshold."""
+    if id(engine) in _instrumented_engines:
+        return
+    _instrumented_engines.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        log.observe(cursor, statement, parameters, executemany, time.perf_counter() - started.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("slow_query_started"):
+            connection.info["slow_query_started"].pop()
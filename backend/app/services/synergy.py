@@ -0,0 +1,199 @@
+# app/services/synergy.py
+
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.catalog import Catalog
+
+# Actions an effect can react to with "When you <action>"
+ACTIONS = ("shield", "heal", "burn", "poison", "haste", "slow", "freeze", "charge", "crit", "regen")
+
+# Link weights by the kind of reference that created them
+TRIGGER_WEIGHT = 1.0
+BUFF_WEIGHT = 0.75
+REFERENCE_WEIGHT = 0.5
+
+def _singular(word: str) -> str:
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+class SynergyGraph:
+    """Directed, weighted "needs / is satisfied by" graph over catalog items.
+
+    Links are stored as compressed sparse rows over item positions: the
+    outgoing row of item ``i`` lists the items that satisfy a trigger,
+    buff or reference on it, sorted by position, and ``_in_*`` holds the
+    same links transposed. Memory grows with the number of links rather
+    than with the square of the catalog, and a pair's weight is two
+    binary searches. Symmetric partner lists (both directions summed) are
+    merged from an item's two rows when asked for.
+    """
+
+    def __init__(self, catalog: Catalog):
+        self.version = catalog.version
+        self.item_ids: List[int] = sorted(catalog.items)
+        self.index: Dict[int, int] = {item_id: i for i, item_id in enumerate(self.item_ids)}
+        self.size = len(self.item_ids)
+        # Row i spans [offsets[i], offsets[i + 1]) of targets and weights
+        self._out_offsets = array("l", [0])
+        self._out_targets = array("l")
+        self._out_weights = array("f")
+        self._in_offsets = array("l", [0])
+        self._in_sources = array("l")
+        self._in_weights = array("f")
+        self.skill_links: Dict[int, Dict[int, float]] = {}
+        self._build(catalog)
+
+    def _build(self, catalog: Catalog) -> None:
+        # Which items carry each type, and which perform each action
+        by_type: Dict[str, Set[int]] = defaultdict(set)
+        for item_id, item in catalog.items.items():
+            for type_name in item.types:
+                key = type_name.lower()
+                if not key.endswith("reference"):
+                    by_type[key].add(item_id)
+            if item.size:
+                by_type[item.size].add(item_id)
+        known_types = set(by_type)
+
+        incoming = array("l", bytes(array("l").itemsize * self.size))
+        for item_id in self.item_ids:
+            item = catalog.items[item_id]
+            links = self._requirements(item.effect, item.types, by_type, known_types)
+            row = sorted((self.index[target_id], weight) for target_id, weight in links.items() if target_id != item_id)
+            for j, weight in row:
+                self._out_targets.append(j)
+                self._out_weights.append(weight)
+                incoming[j] += 1
+            self._out_offsets.append(len(self._out_targets))
+
+        # Transpose: rows are filled in source order, so each stays sorted
+        for count in incoming:
+            self._in_offsets.append(self._in_offsets[-1] + count)
+        self._in_sources = array("l", bytes(array("l").itemsize * len(self._out_targets)))
+        self._in_weights = array("f", bytes(4 * len(self._out_targets)))
+        fill = array("l", self._in_offsets[:-1])
+        for i in range(self.size):
+            for k in range(self._out_offsets[i], self._out_offsets[i + 1]):
+                j = self._out_targets[k]
+                self._in_sources[fill[j]] = i
+                self._in_weights[fill[j]] = self._out_weights[k]
+                fill[j] += 1
+
+        for skill_id, skill in catalog.skills.items():
+            links = self._requirements(skill.effect, skill.types, by_type, known_types)
+            if links:
+                self.skill_links[skill_id] = links
+
+    @staticmethod
+    def _requirements(effect: str, types: Iterable[str], by_type: Dict[str, Set[int]],
+                      known_types: Set[str]) -> Dict[int, float]:
+        """Return {item_id: weight} for every item that satisfies something in an effect."""
+        text = re.sub(r"\s+", " ", effect or "").lower()
+        links: Dict[int, float] = defaultdict(float)
+
+        def link(type_name: str, weight: float) -> None:
+            for target_id in by_type.get(type_name, ()):
+                links[target_id] += weight
+
+        def types_in(clause: str) -> Set[str]:
+            return {_singular(word) for word in re.findall(r"[a-z]+", clause)} & known_types
+
+        # "When you use another Tech", "When you use the Core or any other Ray"
+        for clause in re.findall(r"when (?:you|any player) uses? ([^,.]+)", text):
+            for type_name in types_in(clause):
+                link(type_name, TRIGGER_WEIGHT)
+        # "When you Shield", "When you Burn or Poison"
+        for clause in re.findall(r"when you ((?:%s)(?: or (?:%s))*)\b" % ("|".join(ACTIONS), "|".join(ACTIONS)), text):
+            for action in re.findall(r"[a-z]+", clause):
+                link(action, TRIGGER_WEIGHT)
+        # "Your Weapons gain", "adjacent Tools", "Charge adjacent Large items"
+        for clause in re.findall(r"(?:your(?: other)?|adjacent|each|the \w+ to the (?:left|right) of this) ([a-z ]+?)(?: items?)? (?:gain|have|has|are|is)\b", text):
+            for type_name in types_in(clause):
+                link(type_name, BUFF_WEIGHT)
+        for clause in re.findall(r"charge adjacent ([a-z]+) items?", text):
+            for type_name in types_in(clause):
+                link(type_name, BUFF_WEIGHT)
+        # "ShieldReference" and friends in the scraped types
+        for type_name in types:
+            lowered = type_name.lower()
+            if lowered.endswith("reference"):
+                link(lowered[:-len("reference")], REFERENCE_WEIGHT)
+        return dict(links)
+
+    def _out_weight(self, i: int, j: int) -> float:
+        lo, hi = self._out_offsets[i], self._out_offsets[i + 1]
+        k = bisect_left(self._out_targets, j, lo, hi)
+        return self._out_weights[k] if k < hi and self._out_targets[k] == j else 0.0
+
+    def weight(self, item_a: int, item_b: int) -> float:
+        """Return the symmetric synergy weight between two items."""
+        i, j = self.index.get(item_a), self.index.get(item_b)
+        if i is None or j is None:
+            return 0.0
+        return self._out_weight(i, j) + self._out_weight(j, i)
+
+    def synergies(self, item_id: int, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return (partner_id, weight) pairs for an item, strongest first."""
+        i = self.index.get(item_id)
+        if i is None:
+            return []
+        combined: Dict[int, float] = defaultdict(float)
+        for k in range(self._out_offsets[i], self._out_offsets[i + 1]):
+            combined[self._out_targets[k]] += self._out_weights[k]
+        for k in range(self._in_offsets[i], self._in_offsets[i + 1]):
+            combined[self._in_sources[k]] += self._in_weights[k]
+        partners = [(self.item_ids[j], round(weight, 3)) for j, weight in combined.items()]
+        partners.sort(key=lambda entry: (-entry[1], entry[0]))
+        return partners[:limit] if limit is not None else partners
+
+    def score_build(self, item_ids: Iterable[int], skill_ids: Iterable[int] = ()) -> Dict[str, object]:
+        """Score how well a set of items and skills feed each other.
+
+        Args:
+            item_ids: Items on the board
+            skill_ids: Skills taken
+
+        Returns:
+            Dictionary with the total score and the contributing pairs
+        """
+        items = list(dict.fromkeys(item_ids))
+        pairs = []
+        for a_index, item_a in enumerate(items):
+            for item_b in items[a_index + 1:]:
+                weight = self.weight(item_a, item_b)
+                if weight:
+                    pairs.append({"item_ids": [item_a, item_b], "weight": round(weight, 3)})
+        skill_pairs = []
+        for skill_id in dict.fromkeys(skill_ids):
+            links = self.skill_links.get(skill_id, {})
+            for item_id in items:
+                weight = links.get(item_id)
+                if weight:
+                    skill_pairs.append({"skill_id": skill_id, "item_id": item_id, "weight": round(weight, 3)})
+        total = sum(p["weight"] for p in pairs) + sum(p["weight"] for p in skill_pairs)
+        pairs.sort(key=lambda p: -p["weight"])
+        skill_pairs.sort(key=lambda p: -p["weight"])
+        return {
+            "score": round(total, 3),
+            "item_pairs": pairs,
+            "skill_item_pairs": skill_pairs,
+        }
+
+_graph: Optional[SynergyGraph] = None
+_graph_lock = threading.Lock()
+
+def get_synergy_graph(catalog: Catalog) -> SynergyGraph:
+    """Return the synergy graph for a catalog, building it once per catalog version."""
+    global _graph
+    with _graph_lock:
+        if _graph is None or _graph.version != catalog.version:
+            _graph = SynergyGraph(catalog)
+        return _graph
@@ -0,0 +1,173 @@
+# app/services/tag_index.py
+
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm import Session
+
+from app.models.item import Item
+from app.models.skill import Skill
+from app.models.tag import Tag, ItemTag, SkillTag
+from app.services.bitmap import Bitmap
+from app.services.catalog import get_catalog, split_types
+
+ITEM = "item"
+SKILL = "skill"
+
+_ASSOCIATIONS = {
+    ITEM: (ItemTag, ItemTag.item_id, Item),
+    SKILL: (SkillTag, SkillTag.skill_id, Skill),
+}
+
+def tag_key(name: str) -> str:
+    """Return the matching key for a tag name ("SLow" and "Slow" share one)."""
+    return name.strip().lower()
+
+def parse_tag_list(tags: Optional[str]) -> List[str]:
+    """Split a comma-separated query parameter into tag keys."""
+    return [tag_key(t) for t in split_types(tags)]
+
+def _get_or_create_tags(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    # New tags are named after the most common spelling of their key
+    spellings = Counter(names)
+    keys: Dict[str, str] = {}
+    for name, _ in spellings.most_common():
+        keys.setdefault(tag_key(name), name)
+    existing = {tag.key: tag.id for tag in db.query(Tag).filter(Tag.key.in_(list(keys))).all()} if keys else {}
+    for key, name in keys.items():
+        if key not in existing:
+            tag = Tag(name=name, key=key)
+            db.add(tag)
+            db.flush()
+            existing[key] = tag.id
+    return existing
+
+def set_tags(db: Session, kind: str, entity_id: int, types: Optional[str]) -> None:
+    """Replace the tag associations of one item or skill from its types string.
+
+    The caller is responsible for committing.
+    """
+    model, id_column, _ = _ASSOCIATIONS[kind]
+    db.query(model).filter(id_column == entity_id).delete(synchronize_session=False)
+    names = split_types(types)
+    if not names:
+        return
+    tag_ids = _get_or_create_tags(db, names)
+    for tag_id in sorted(set(tag_ids[tag_key(name)] for name in names)):
+        db.add(model(**{id_column.key: entity_id, "tag_id": tag_id}))
+
+def sync_all_tags(db: Session) -> int:
+    """Rebuild every item and skill tag association from the types strings.
+
+    Args:
+        db: Database session; committed on success
+
+    Returns:
+        Number of associations written
+    """
+    rows = {
+        ITEM: db.query(Item.id, Item.types).all(),
+        SKILL: db.query(Skill.id, Skill.types).all(),
+    }
+    tag_ids = _get_or_create_tags(db, (name for kind_rows in rows.values() for _, types in kind_rows
+                                       for name in split_types(types)))
+    count = 0
+    for kind, kind_rows in rows.items():
+        model, id_column, _ = _ASSOCIATIONS[kind]
+        db.query(model).delete(synchronize_session=False)
+        mappings = []
+        for entity_id, types in kind_rows:
+            for tag_id in sorted(set(tag_ids[tag_key(name)] for name in split_types(types))):
+                mappings.append({id_column.key: entity_id, "tag_id": tag_id})
+        db.bulk_insert_mappings(model, mappings)
+        count += len(mappings)
+    db.commit()
+    return count
+
+def in_bitmap(column, ids: Bitmap):
+    """Return a ``column IN (ids)`` filter clause.
+
+    The IDs are rendered inline rather than bound one parameter each, so
+    large tag matches do not run into SQLite's bound-parameter limit.
+    """
+    return column.in_(bindparam(f"{column.key}_tag_ids", list(ids), expanding=True, literal_execute=True))
+
+class TagIndex:
+    """In-memory tag → member-ID bitmaps for items and skills."""
+
+    def __init__(self, version: str, names: Dict[str, str], members: Dict[str, Dict[str, Bitmap]],
+                 universe: Dict[str, Bitmap]):
+        self.version = version
+        self.names = names
+        self.members = members
+        self.universe = universe
+
+    @classmethod
+    def load(cls, db: Session, version: str) -> "TagIndex":
+        names = {key: name for key, name in db.query(Tag.key, Tag.name).all()}
+        tag_keys = {tag_id: key for tag_id, key in db.query(Tag.id, Tag.key).all()}
+        members: Dict[str, Dict[str, Bitmap]] = {}
+        universe: Dict[str, Bitmap] = {}
+        for kind, (model, id_column, entity) in _ASSOCIATIONS.items():
+            grouped: Dict[str, List[int]] = {}
+            for entity_id, tag_id in db.query(id_column, model.tag_id).all():
+                grouped.setdefault(tag_keys[tag_id], []).append(entity_id)
+            members[kind] = {key: Bitmap(ids) for key, ids in grouped.items()}
+            universe[kind] = Bitmap(entity_id for (entity_id,) in db.query(entity.id).all())
+        return cls(version, names, members, universe)
+
+    def match(self, kind: str, any_of: Iterable[str] = (), all_of: Iterable[str] = (),
+              none_of: Iterable[str] = (), candidates: Optional[Bitmap] = None) -> Bitmap:
+        """Return the IDs matching a tag query.
+
+        Args:
+            kind: ITEM or SKILL
+            any_of: Keep IDs with at least one of these tags
+            all_of: Keep IDs with every one of these tags
+            none_of: Drop IDs with any of these tags
+            candidates: Restrict the result to these IDs (defaults to all)
+
+        Returns:
+            Bitmap of matching IDs
+        """
+        members = self.members[kind]
+        empty = Bitmap()
+        result = candidates if candidates is not None else self.universe[kind]
+        any_of, all_of, none_of = list(any_of), list(all_of), list(none_of)
+        if any_of:
+            union = empty
+            for key in any_of:
+                union = union | members.get(key, empty)
+            result = result & union
+        for key in all_of:
+            result = result & members.get(key, empty)
+        for key in none_of:
+            result = result - members.get(key, empty)
+        return result
+
+    def facets(self, kind: str, ids: Bitmap) -> Dict[str, int]:
+        """Count how many of the given IDs carry each tag."""
+        counts = {}
+        for key, bitmap in self.members[kind].items():
+            count = len(bitmap & ids)
+            if count:
+                counts[self.names.get(key, key)] = count
+        return dict(sorted(counts.items(), key=lambda entry: (-entry[1], entry[0])))
+
+_index: Optional[TagIndex] = None
+_index_lock = threading.Lock()
+
+def get_tag_index(db: Session) -> TagIndex:
+    """Return the tag index for the current catalog version.
+
+    Databases imported before tags existed get their association tables
+    filled at startup by the "tags" backfill (app.services.backfills).
+    """
+    global _index
+    version = get_catalog(db).version
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = TagIndex.load(db, version)
+        return _index
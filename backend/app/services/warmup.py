@@ -0,0 +1,36 @@
+# app/services/warmup.py
+
+import logging
+import os
+import time
+
+from app.database.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# "before": warm while starting up, before connections are accepted
+# "after": warm in the background once the server is accepting connections
+# "off": build everything on first use
+WARM_CACHES = os.environ.get("WARM_CACHES", "after").lower()
+
+def warm_caches() -> None:
+    """Build the catalog snapshot, tag index, synergy graph and similar-build index ahead of the first request."""
+    from app.services.catalog import get_catalog
+    from app.services.similar_builds import get_similarity_index
+    from app.services.synergy import get_synergy_graph
+    from app.services.tag_index import get_tag_index
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        catalog = get_catalog(db)
+        get_tag_index(db)
+        get_synergy_graph(catalog)
+        get_similarity_index(db)
+    except Exception:
+        # A cold cache is only slower; the first request will build it again
+        logger.exception("Cache warm-up failed")
+        return
+    finally:
+        db.close()
+    logger.info(f"Warmed caches for catalog {catalog.version} in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,4 @@
+# app/simulation/__init__.py
+
+from app.simulation.engine import ENGINE_VERSION, Board, BoardSlot, simulate_fight, win_rate
+from app.simulation.optimizer import IslandOptimizer, OptimizerConfig, OptimizerResult
@@ -0,0 +1,268 @@
+# app/simulation/cache.py
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.database.database import DATABASE_DIR
+from app.services.catalog import Catalog
+from app.simulation.engine import ENGINE_VERSION, Board, win_rate
+
+logger = logging.getLogger(__name__)
+
+# Results are only valid for the catalog they were computed from, so the cache
+# sits beside the database it was filled from
+DEFAULT_CACHE_PATH = os.environ.get("SIMULATION_CACHE_PATH", str(DATABASE_DIR / "simulation_cache.db"))
+DEFAULT_MEMORY_ENTRIES = 50_000
+# Seconds an engine/effect-data version may go unused before its rows are expired
+SIMULATION_CACHE_VERSION_TTL = float(os.environ.get("SIMULATION_CACHE_VERSION_TTL", 86400))
+# Expiry runs at most this often, deleting at most this many rows each time
+EXPIRY_INTERVAL = 60.0
+EXPIRY_BATCH = 1000
+
+def _canonical_board(board: Board) -> list:
+    return [[[slot.item_id, slot.tier] for slot in board.slots], sorted(board.skill_ids)]
+
+def simulation_key(board: Board, opponents: Sequence[Board], catalog: Catalog, fights_per_opponent: int,
+                   seed: int, base_health: float) -> str:
+    """Return the content address of a win-rate simulation.
+
+    The key covers everything that can change the result: the board layout
+    and tiers, the skills, the opponents, the engine version, the effect
+    data the engine reads, and the seed policy.
+    """
+    payload = {
+        "board": _canonical_board(board),
+        "opponents": [_canonical_board(opponent) for opponent in opponents],
+        "engine": ENGINE_VERSION,
+        "effects": catalog.effects_version,
+        "seed": {"seed": seed, "fights": fights_per_opponent, "health": base_health},
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+class SimulationCache:
+    """Two-tier cache of simulation results: an in-memory LRU over SQLite.
+
+    Entries are tagged with the engine and effect-data versions, and only
+    entries of the caller's versions are returned. Several processes may
+    share the disk tier while they run different versions (during a
+    reload, or with workers that saw a catalog change at different
+    times), so other versions' rows are never deleted on sight. Each
+    process records when it last used its versions, and rows of versions
+    nobody has used for SIMULATION_CACHE_VERSION_TTL seconds are expired
+    a batch at a time as results are stored.
+
+    The SQLite connection is opened on first use. Use get_simulation_cache
+    rather than sharing one instance across fork.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, max_memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._effects_version: Optional[str] = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "purged": 0}
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_opened = False
+        # effects version -> when this process last recorded it as in use
+        self._touched: Dict[str, float] = {}
+        self._next_expiry = 0.0
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Return the disk tier's connection, opening it on first use (None if disabled)."""
+        if not self._disk_opened:
+            self._disk_opened = True
+            self._disk = self._open_disk(self.path) if self.path else None
+        return self._disk
+
+    def _open_disk(self, path: str) -> Optional[sqlite3.Connection]:
+        try:
+            connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS simulation_results ("
+                "key TEXT PRIMARY KEY, engine_version TEXT NOT NULL, effects_version TEXT NOT NULL, "
+                "result TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_simulation_results_version "
+                "ON simulation_results (engine_version, effects_version)"
+            )
+            has_versions = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'simulation_versions'"
+            ).fetchone()
+            if not has_versions:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS simulation_versions ("
+                    "engine_version TEXT NOT NULL, effects_version TEXT NOT NULL, last_used REAL NOT NULL, "
+                    "PRIMARY KEY (engine_version, effects_version))"
+                )
+                # Rows written before versions were tracked start their TTL now
+                connection.execute(
+                    "INSERT OR IGNORE INTO simulation_versions (engine_version, effects_version, last_used) "
+                    "SELECT DISTINCT engine_version, effects_version, ? FROM simulation_results",
+                    (time.time(),),
+                )
+            return connection
+        except sqlite3.Error as e:
+            logger.warning(f"Simulation cache disk tier disabled: {e}")
+            return None
+
+    def _touch(self, disk: sqlite3.Connection, effects_version: str) -> None:
+        """Record that this process uses ``effects_version``, at most a few times per TTL."""
+        self._effects_version = effects_version
+        now = time.time()
+        if now - self._touched.get(effects_version, 0.0) < SIMULATION_CACHE_VERSION_TTL / 24:
+            return
+        self._touched[effects_version] = now
+        disk.execute(
+            "INSERT OR REPLACE INTO simulation_versions (engine_version, effects_version, last_used) "
+            "VALUES (?, ?, ?)",
+            (ENGINE_VERSION, effects_version, now),
+        )
+
+    def _expire(self, disk: sqlite3.Connection) -> None:
+        """Delete a batch of rows belonging to versions nobody has used within the TTL."""
+        now = time.time()
+        if now < self._next_expiry:
+            return
+        self._next_expiry = now + EXPIRY_INTERVAL
+        stale = disk.execute(
+            "SELECT engine_version, effects_version FROM simulation_versions WHERE last_used < ?",
+            (now - SIMULATION_CACHE_VERSION_TTL,),
+        ).fetchall()
+        budget = EXPIRY_BATCH
+        for engine_version, effects_version in stale:
+            purged = disk.execute(
+                "DELETE FROM simulation_results WHERE rowid IN (SELECT rowid FROM simulation_results "
+                "WHERE engine_version = ? AND effects_version = ? LIMIT ?)",
+                (engine_version, effects_version, budget),
+            ).rowcount
+            self.stats["purged"] += max(purged, 0)
+            if purged < budget:
+                disk.execute(
+                    "DELETE FROM simulation_versions WHERE engine_version = ? AND effects_version = ? "
+                    "AND last_used < ?",
+                    (engine_version, effects_version, now - SIMULATION_CACHE_VERSION_TTL),
+                )
+            budget -= purged
+            if budget <= 0:
+                break
+
+    def get(self, key: str, effects_version: str) -> Optional[Any]:
+        """Return a cached result, or None on a miss."""
+        with self._lock:
+            self._effects_version = effects_version
+            entry = (effects_version, key)
+            if entry in self._memory:
+                self._memory.move_to_end(entry)
+                self.stats["memory_hits"] += 1
+                return self._memory[entry]
+            disk = self._connection()
+            if disk is not None:
+                self._touch(disk, effects_version)
+                row = disk.execute(
+                    "SELECT result FROM simulation_results WHERE key = ? AND engine_version = ? "
+                    "AND effects_version = ?",
+                    (key, ENGINE_VERSION, effects_version),
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(entry, value)
+                    self.stats["disk_hits"] += 1
+                    return value
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, effects_version: str, value: Any) -> None:
+        """Store a result in both tiers."""
+        with self._lock:
+            self._effects_version = effects_version
+            self._remember((effects_version, key), value)
+            self.stats["stores"] += 1
+            disk = self._connection()
+            if disk is not None:
+                self._touch(disk, effects_version)
+                disk.execute(
+                    "INSERT OR REPLACE INTO simulation_results (key, engine_version, effects_version, result) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, ENGINE_VERSION, effects_version, json.dumps(value)),
+                )
+                self._expire(disk)
+
+    def _remember(self, entry: tuple, value: Any) -> None:
+        self._memory[entry] = value
+        self._memory.move_to_end(entry)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Empty both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            disk = self._connection()
+            if disk is not None:
+                disk.execute("DELETE FROM simulation_results")
+                disk.execute("DELETE FROM simulation_versions")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the hit/miss counters and tier sizes."""
+        with self._lock:
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            disk_entries = None
+            disk = self._connection()
+            if disk is not None:
+                disk_entries = disk.execute("SELECT COUNT(*) FROM simulation_results").fetchone()[0]
+            return {
+                **self.stats,
+                "hit_rate": round((lookups - self.stats["misses"]) / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "engine_version": ENGINE_VERSION,
+                "effects_version": self._effects_version,
+            }
+
+    def win_rate(self, board: Board, opponents: Sequence[Board], catalog: Catalog, fights_per_opponent: int = 1,
+                 seed: int = 0, base_health: float = 300.0) -> float:
+        """Cached version of engine.win_rate."""
+        key = simulation_key(board, opponents, catalog, fights_per_opponent, seed, base_health)
+        cached = self.get(key, catalog.effects_version)
+        if cached is not None:
+            return cached["win_rate"]
+        score = win_rate(board, opponents, catalog, fights_per_opponent, seed, base_health)
+        self.put(key, catalog.effects_version, {"win_rate": score})
+        return score
+
+_cache: Optional[SimulationCache] = None
+_cache_pid: Optional[int] = None
+_cache_lock = threading.Lock()
+# Caches inherited through fork. They are kept but never used: closing a
+# SQLite connection in the child could checkpoint or remove the parent's WAL.
+_inherited: List[SimulationCache] = []
+
+def get_simulation_cache() -> SimulationCache:
+    """Return this process's simulation cache, opening it on first use.
+
+    SQLite connections must not cross fork, so a forked child (a server
+    worker or a fork-started pool) gets a cache of its own rather than the
+    parent's connection, lock and memory tier.
+    """
+    global _cache, _cache_pid
+    with _cache_lock:
+        if _cache_pid != os.getpid():
+            if _cache is not None:
+                _inherited.append(_cache)
+            _cache = SimulationCache()
+            _cache_pid = os.getpid()
+        return _cache
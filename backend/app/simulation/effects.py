@@ -0,0 +1,181 @@
+# app/simulation/effects.py
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+TIER_INDEX = {
+    "Bronze": 0,
+    "Silver": 1,
+    "Gold": 2,
+    "Diamond": 3,
+    "Legendary": 4,
+}
+
+# A tiered value such as "8/12/16/20" or "4 / 6 / 8"
+_VALUE = r"(\d+(?:\.\d+)?(?:\s*/\s*\d+(?:\.\d+)?)*)"
+_COUNT = r"(\d+(?:\s*/\s*\d+)*|one|an?|two|three)"
+_SECONDS = _VALUE + r" second"
+
+_WORD_NUMBERS = {"a": "1", "an": "1", "one": "1", "two": "2", "three": "3"}
+
+@dataclass(frozen=True)
+class ItemProfile:
+    """Combat-relevant numbers parsed from an item's effect text at one tier."""
+    damage: float = 0.0
+    shield: float = 0.0
+    heal: float = 0.0
+    burn: float = 0.0
+    poison: float = 0.0
+    crit_chance: float = 0.0
+    board_crit_chance: float = 0.0
+    multicast: int = 1
+    charge_left: float = 0.0
+    charge_right: float = 0.0
+    charge_adjacent: float = 0.0
+    charge_adjacent_filter: Optional[str] = None
+    haste_adjacent: float = 0.0
+    slow_count: int = 0
+    slow_seconds: float = 0.0
+    freeze_count: int = 0
+    freeze_seconds: float = 0.0
+    weapons_gain: float = 0.0
+    right_weapon_gain: float = 0.0
+    adjacent_weapon_bonus: float = 0.0
+    charge_self_trigger: Optional[str] = None
+    charge_self_seconds: float = 0.0
+    use_at_start: bool = False
+
+@dataclass(frozen=True)
+class SkillModifiers:
+    """Board-wide bonuses parsed from a skill's effect text."""
+    crit_chance: float = 0.0
+    weapon_damage: float = 0.0
+    shield: float = 0.0
+    heal: float = 0.0
+    burn: float = 0.0
+    poison: float = 0.0
+    cooldown_reduction: float = 0.0
+    max_health: float = 0.0
+
+def tier_value(values: str, tier_index: int) -> float:
+    """Pick the value for a tier out of a slash-separated value list.
+
+    Args:
+        values: Value list such as "8/12/16/20"
+        tier_index: Index of the tier (0 = Bronze)
+
+    Returns:
+        The value for that tier, or the highest listed value if the list is shorter
+    """
+    parts = [p.strip() for p in values.split("/") if p.strip()]
+    if not parts:
+        return 0.0
+    word = parts[min(tier_index, len(parts) - 1)].lower()
+    return float(_WORD_NUMBERS.get(word, word))
+
+def _normalize(effect: str) -> str:
+    text = re.sub(r"\s+", " ", effect or "")
+    return text.lower()
+
+def _sum(pattern: str, text: str, tier_index: int) -> float:
+    return sum(tier_value(match, tier_index) for match in re.findall(pattern, text))
+
+def _first(pattern: str, text: str, tier_index: int, group: int = 1) -> float:
+    match = re.search(pattern, text)
+    if not match:
+        return 0.0
+    return tier_value(match.group(group), tier_index)
+
+@lru_cache(maxsize=4096)
+def parse_item_effect(effect: str, tier: str = "Bronze") -> ItemProfile:
+    """Parse an item's effect text into an ItemProfile.
+
+    Only the common, board-relevant phrasings are recognised; anything
+    else (economy, sell triggers, enchantments) is ignored.
+
+    Args:
+        effect: Effect text as scraped from the wiki
+        tier: Tier name used to pick values out of tiered lists
+
+    Returns:
+        The parsed profile
+    """
+    text = _normalize(effect)
+    t = TIER_INDEX.get(tier, 0)
+
+    damage = _sum(r"deal " + _VALUE + r" damage", text, t)
+    if "this has double damage" in text:
+        damage *= 2
+
+    crit = _first(_VALUE + r" ?% crit chance", text, t) / 100
+    board_crit = 0.0
+    if re.search(r"your items have \+?" + _VALUE + r" ?% crit chance", text):
+        board_crit, crit = crit, 0.0
+
+    charge_adjacent_match = re.search(r"charge adjacent (?:(\w+) )?items? (?:for )?" + _SECONDS, text)
+    charge_adjacent_filter = None
+    charge_adjacent = 0.0
+    if charge_adjacent_match:
+        charge_adjacent_filter = charge_adjacent_match.group(1)
+        charge_adjacent = tier_value(charge_adjacent_match.group(2), t)
+
+    slow = re.search(r"slow " + _COUNT + r" items?(?:\(s\))? for " + _SECONDS, text)
+    freeze = re.search(r"freeze " + _COUNT + r" items?(?:\(s\))? for " + _SECONDS, text)
+
+    trigger = re.search(
+        r"when you use (?:another|any other) (\w+)(?: item)?, charge this " + _SECONDS, text
+    )
+
+    multicast = 1 + int(_first(r"this has \+" + _VALUE + r" multicast", text, t))
+
+    return ItemProfile(
+        damage=damage,
+        shield=_sum(r"(?<!when you )(?<!\+)\bshield " + _VALUE, text, t),
+        heal=_sum(r"(?<!\+)\bheal " + _VALUE, text, t),
+        burn=_sum(r"(?<!\+)\bburn " + _VALUE, text, t),
+        poison=_sum(r"(?<!\+)\bpoison " + _VALUE, text, t) + _sum(_VALUE + r" poison\b", text, t),
+        crit_chance=crit,
+        board_crit_chance=board_crit,
+        multicast=multicast,
+        charge_left=_first(r"charge the \w+ to the left of this " + _SECONDS, text, t),
+        charge_right=_first(r"charge the \w+ to the right of this " + _SECONDS, text, t),
+        charge_adjacent=charge_adjacent,
+        charge_adjacent_filter=charge_adjacent_filter,
+        haste_adjacent=_first(r"haste adjacent items? (?:for )?" + _SECONDS, text, t),
+        slow_count=int(tier_value(slow.group(1), t)) if slow else 0,
+        slow_seconds=tier_value(slow.group(2), t) if slow else 0.0,
+        freeze_count=int(tier_value(freeze.group(1), t)) if freeze else 0,
+        freeze_seconds=tier_value(freeze.group(2), t) if freeze else 0.0,
+        weapons_gain=_first(r"your weapons gain \+? ?" + _VALUE + r" damage for the fight", text, t),
+        right_weapon_gain=_first(r"the weapon to the right of this gains \+? ?" + _VALUE + r" damage", text, t),
+        adjacent_weapon_bonus=_first(r"adjacent weapons (?:have|gain) \+? ?" + _VALUE + r" damage", text, t),
+        charge_self_trigger=trigger.group(1) if trigger else None,
+        charge_self_seconds=tier_value(trigger.group(2), t) if trigger else 0.0,
+        use_at_start="start of the fight, use this" in text or "start of each fight, use this" in text,
+    )
+
+@lru_cache(maxsize=4096)
+def parse_skill_effect(effect: str, tier: Optional[str] = None) -> SkillModifiers:
+    """Parse a skill's effect text into board-wide SkillModifiers.
+
+    Args:
+        effect: Effect text as scraped from the wiki
+        tier: Tier name used to pick values out of tiered lists
+
+    Returns:
+        The parsed modifiers
+    """
+    text = _normalize(effect)
+    t = TIER_INDEX.get(tier or "Bronze", 0)
+    return SkillModifiers(
+        crit_chance=_first(r"your (?:items|weapons) have \+?" + _VALUE + r" ?% crit chance", text, t) / 100,
+        weapon_damage=_first(r"your weapons (?:have|gain) \+?" + _VALUE + r" damage", text, t),
+        shield=_first(r"your shield items have \+?" + _VALUE + r" shield", text, t),
+        heal=_first(r"your heal items have \+?" + _VALUE + r" heal", text, t),
+        burn=_first(r"your burn items have \+?" + _VALUE + r" burn", text, t),
+        poison=_first(r"your poison items have \+?" + _VALUE + r" poison", text, t),
+        cooldown_reduction=_first(r"your items(?:'|’)? (?:have their )?cooldowns? (?:are )?reduced (?:by )?" + _VALUE + r" ?%", text, t) / 100,
+        max_health=_first(r"\+?" + _VALUE + r" max health", text, t),
+    )
@@ -0,0 +1,316 @@
+# app/simulation/engine.py
+
+import random
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.services.catalog import Catalog, CatalogItem, CatalogSkill
+from app.simulation.effects import ItemProfile, SkillModifiers, parse_item_effect, parse_skill_effect
+
+# Bump whenever a change to this module or to effects.py can change a fight's outcome
+ENGINE_VERSION = "1"
+
+BOARD_SLOTS = 10
+SIZE_SLOTS = {"small": 1, "medium": 2, "large": 3}
+
+# Shop prices are not in the scraped data, so fall back to the in-game base prices
+SIZE_BASE_COST = {"small": 2, "medium": 4, "large": 6}
+TIER_COST_MULTIPLIER = {"Bronze": 1, "Silver": 2, "Gold": 4, "Diamond": 8, "Legendary": 16}
+SKILL_TIER_COST = {"Bronze": 2, "Silver": 4, "Gold": 8, "Diamond": 16, "Legendary": 32}
+
+TICK = 0.1
+MAX_FIGHT_SECONDS = 60.0
+SANDSTORM_START = 30.0
+BURN_INTERVAL = 0.5
+POISON_INTERVAL = 1.0
+
+@dataclass(frozen=True)
+class BoardSlot:
+    """An item placed on a board, at a given tier."""
+    item_id: int
+    tier: str = "Bronze"
+
+@dataclass(frozen=True)
+class Board:
+    """A board layout: items from left to right plus the selected skills."""
+    slots: Tuple[BoardSlot, ...]
+    skill_ids: Tuple[int, ...] = ()
+
+    @classmethod
+    def from_ids(cls, item_ids: Iterable[int], skill_ids: Iterable[int] = (), tier: str = "Bronze") -> "Board":
+        return cls(tuple(BoardSlot(item_id, tier) for item_id in item_ids), tuple(sorted(skill_ids)))
+
+def slots_used(items: Iterable[CatalogItem]) -> int:
+    """Return how many board slots a sequence of items occupies."""
+    return sum(SIZE_SLOTS.get(item.size or "small", 1) for item in items)
+
+def item_cost(item: CatalogItem, tier: str = "Bronze") -> int:
+    """Return the shop cost of an item at a tier."""
+    if item.cost is not None:
+        return item.cost
+    return SIZE_BASE_COST.get(item.size or "small", 2) * TIER_COST_MULTIPLIER.get(tier, 1)
+
+def skill_cost(skill: CatalogSkill) -> int:
+    """Return the shop cost of a skill at its starting tier."""
+    return SKILL_TIER_COST.get(skill.tier or "Bronze", 2)
+
+def board_cost(board: Board, catalog: Catalog) -> int:
+    """Return the total cost of a board's items and skills."""
+    cost = sum(item_cost(catalog.items[slot.item_id], slot.tier) for slot in board.slots)
+    return cost + sum(skill_cost(catalog.skills[skill_id]) for skill_id in board.skill_ids)
+
+class _ItemState:
+    """Mutable per-fight state of one item on one side."""
+
+    __slots__ = ("profile", "cooldown", "types", "size", "is_weapon", "charge",
+                 "damage_bonus", "haste", "slow", "freeze")
+
+    def __init__(self, item: CatalogItem, profile: ItemProfile, cooldown_reduction: float):
+        self.profile = profile
+        self.cooldown = item.cooldown * (1 - cooldown_reduction) if item.cooldown else None
+        self.types = {t.lower() for t in item.types}
+        self.size = item.size or "small"
+        self.is_weapon = "weapon" in self.types or profile.damage > 0
+        self.charge = 0.0
+        self.damage_bonus = 0.0
+        self.haste = 0.0
+        self.slow = 0.0
+        self.freeze = 0.0
+
+    def matches(self, type_name: Optional[str]) -> bool:
+        if type_name is None or type_name in ("item", "items"):
+            return True
+        type_name = type_name.lower().rstrip("s")
+        return type_name == self.size or any(t.rstrip("s") == type_name for t in self.types)
+
+class _Side:
+    """Mutable per-fight state of one player."""
+
+    __slots__ = ("items", "health", "max_health", "shield", "burn", "poison", "modifiers", "crit_bonus")
+
+    def __init__(self, board: Board, catalog: Catalog, base_health: float):
+        modifiers = [parse_skill_effect(catalog.skills[s].effect, catalog.skills[s].tier) for s in board.skill_ids]
+        self.modifiers = SkillModifiers(
+            crit_chance=sum(m.crit_chance for m in modifiers),
+            weapon_damage=sum(m.weapon_damage for m in modifiers),
+            shield=sum(m.shield for m in modifiers),
+            heal=sum(m.heal for m in modifiers),
+            burn=sum(m.burn for m in modifiers),
+            poison=sum(m.poison for m in modifiers),
+            cooldown_reduction=min(0.5, sum(m.cooldown_reduction for m in modifiers)),
+            max_health=sum(m.max_health for m in modifiers),
+        )
+        self.items: List[_ItemState] = []
+        for slot in board.slots:
+            item = catalog.items[slot.item_id]
+            profile = parse_item_effect(item.effect, slot.tier)
+            self.items.append(_ItemState(item, profile, self.modifiers.cooldown_reduction))
+
+        # Passive adjacency bonuses are applied once at the start of the fight
+        for index, state in enumerate(self.items):
+            bonus = state.profile.adjacent_weapon_bonus
+            if bonus:
+                for neighbour in self._neighbours(index):
+                    if neighbour.is_weapon:
+                        neighbour.damage_bonus += bonus
+
+        self.crit_bonus = self.modifiers.crit_chance + sum(s.profile.board_crit_chance for s in self.items)
+        self.max_health = base_health + self.modifiers.max_health
+        self.health = self.max_health
+        self.shield = 0.0
+        self.burn = 0.0
+        self.poison = 0.0
+
+    def _neighbours(self, index: int) -> List[_ItemState]:
+        return [self.items[i] for i in (index - 1, index + 1) if 0 <= i < len(self.items)]
+
+    def take_damage(self, amount: float) -> None:
+        absorbed = min(self.shield, amount)
+        self.shield -= absorbed
+        self.health -= amount - absorbed
+
+    @property
+    def alive(self) -> bool:
+        return self.health > 0
+
+def _use_item(side: _Side, enemy: _Side, index: int, rng: random.Random) -> None:
+    state = side.items[index]
+    profile = state.profile
+    mods = side.modifiers
+
+    for _ in range(profile.multicast):
+        crit = 2.0 if rng.random() < profile.crit_chance + side.crit_bonus else 1.0
+
+        if profile.damage:
+            enemy.take_damage((profile.damage + state.damage_bonus + mods.weapon_damage) * crit)
+        if profile.shield:
+            side.shield += (profile.shield + mods.shield) * crit
+        if profile.heal:
+            side.health = min(side.max_health, side.health + (profile.heal + mods.heal) * crit)
+        if profile.burn:
+            enemy.burn += (profile.burn + mods.burn) * crit
+        if profile.poison:
+            enemy.poison += (profile.poison + mods.poison) * crit
+
+        if profile.charge_left and index > 0:
+            side.items[index - 1].charge += profile.charge_left
+        if profile.charge_right and index + 1 < len(side.items):
+            side.items[index + 1].charge += profile.charge_right
+        for neighbour in side._neighbours(index):
+            if profile.charge_adjacent and neighbour.matches(profile.charge_adjacent_filter):
+                neighbour.charge += profile.charge_adjacent
+            if profile.haste_adjacent:
+                neighbour.haste += profile.haste_adjacent
+        if profile.right_weapon_gain and index + 1 < len(side.items) and side.items[index + 1].is_weapon:
+            side.items[index + 1].damage_bonus += profile.right_weapon_gain
+        if profile.weapons_gain:
+            for other in side.items:
+                if other.is_weapon:
+                    other.damage_bonus += profile.weapons_gain
+
+        targets = [other for other in enemy.items if other.cooldown]
+        if profile.slow_count and targets:
+            for target in rng.sample(targets, min(profile.slow_count, len(targets))):
+                target.slow += profile.slow_seconds
+        if profile.freeze_count and targets:
+            for target in rng.sample(targets, min(profile.freeze_count, len(targets))):
+                target.freeze += profile.freeze_seconds
+
+    # "When you use another X, charge this" triggers
+    for other_index, other in enumerate(side.items):
+        trigger = other.profile.charge_self_trigger
+        if other_index != index and trigger and state.matches(trigger):
+            other.charge += other.profile.charge_self_seconds
+
+def _advance(side: _Side, enemy: _Side, rng: random.Random) -> None:
+    for index, state in enumerate(side.items):
+        if not state.cooldown:
+            continue
+        if state.freeze > 0:
+            rate = 0.0
+        elif state.haste > 0 and state.slow <= 0:
+            rate = 2.0
+        elif state.slow > 0 and state.haste <= 0:
+            rate = 0.5
+        else:
+            rate = 1.0
+        state.freeze = max(0.0, state.freeze - TICK)
+        state.haste = max(0.0, state.haste - TICK)
+        state.slow = max(0.0, state.slow - TICK)
+
+        state.charge += TICK * rate
+        if state.charge >= state.cooldown:
+            state.charge -= state.cooldown
+            _use_item(side, enemy, index, rng)
+
+def simulate_fight(board_a: Board, board_b: Board, catalog: Catalog, rng: random.Random,
+                   base_health: float = 300.0) -> Optional[int]:
+    """Simulate one fight between two boards.
+
+    Args:
+        board_a: The first player's board
+        board_b: The second player's board
+        catalog: Catalog used to resolve item and skill IDs
+        rng: Random source for crits and target selection
+        base_health: Starting health of both players before skill bonuses
+
+    Returns:
+        0 if board_a wins, 1 if board_b wins, None for a draw
+    """
+    sides = (_Side(board_a, catalog, base_health), _Side(board_b, catalog, base_health))
+
+    for me, enemy in ((0, 1), (1, 0)):
+        for index, state in enumerate(sides[me].items):
+            if state.profile.use_at_start:
+                _use_item(sides[me], sides[enemy], index, rng)
+
+    elapsed = 0.0
+    next_burn = BURN_INTERVAL
+    next_poison = POISON_INTERVAL
+    while elapsed < MAX_FIGHT_SECONDS:
+        elapsed += TICK
+        _advance(sides[0], sides[1], rng)
+        _advance(sides[1], sides[0], rng)
+
+        if elapsed >= next_burn:
+            next_burn += BURN_INTERVAL
+            for side in sides:
+                if side.burn > 0:
+                    side.take_damage(side.burn)
+                    side.burn = max(0.0, side.burn - 1)
+        if elapsed >= next_poison:
+            next_poison += POISON_INTERVAL
+            for side in sides:
+                side.health -= side.poison
+        if elapsed > SANDSTORM_START:
+            storm = (elapsed - SANDSTORM_START) * TICK
+            for side in sides:
+                side.take_damage(storm)
+
+        alive = (sides[0].alive, sides[1].alive)
+        if alive == (True, False):
+            return 0
+        if alive == (False, True):
+            return 1
+        if alive == (False, False):
+            return None
+    return None
+
+def win_rate(board: Board, opponents: Sequence[Board], catalog: Catalog, fights_per_opponent: int = 1,
+             seed: int = 0, base_health: float = 300.0) -> float:
+    """Return the fraction of fights a board wins against a set of opponents.
+
+    The same seed always replays the same crits and targets, so two boards
+    scored with the same seed are compared on equal terms.
+
+    Args:
+        board: Board being scored
+        opponents: Opponent boards to fight
+        catalog: Catalog used to resolve item and skill IDs
+        fights_per_opponent: Number of fights against each opponent
+        seed: Seed for the fight random source
+        base_health: Starting health of both players
+
+    Returns:
+        Wins divided by fights played (draws count as half a win)
+    """
+    if not opponents or fights_per_opponent <= 0:
+        return 0.0
+    rng = random.Random(seed)
+    score = 0.0
+    for opponent in opponents:
+        for _ in range(fights_per_opponent):
+            result = simulate_fight(board, opponent, catalog, rng, base_health)
+            if result == 0:
+                score += 1.0
+            elif result is None:
+                score += 0.5
+    return score / (len(opponents) * fights_per_opponent)
+
+def random_board(pool: Sequence[CatalogItem], rng: random.Random, tier: str = "Bronze",
+                 slots: int = BOARD_SLOTS) -> Board:
+    """Fill a board left to right with random items from a pool until it is full."""
+    chosen: List[CatalogItem] = []
+    free = slots
+    candidates = list(pool)
+    rng.shuffle(candidates)
+    for item in candidates:
+        size = SIZE_SLOTS.get(item.size or "small", 1)
+        if size <= free:
+            chosen.append(item)
+            free -= size
+        if free == 0:
+            break
+    return Board.from_ids((item.id for item in chosen), tier=tier)
+
+def default_opponents(catalog: Catalog, count: int, seed: int, tier: str = "Bronze") -> List[Board]:
+    """Generate a reproducible set of opponent boards from monster items.
+
+    Falls back to the whole catalog when there are no monster items.
+    """
+    pool = [item for item in catalog.items.values() if item.source == "monster" and item.cooldown]
+    if not pool:
+        pool = [item for item in catalog.items.values() if item.cooldown]
+    pool.sort(key=lambda item: item.id)
+    rng = random.Random(seed)
+    return [random_board(pool, rng, tier) for _ in range(count)]
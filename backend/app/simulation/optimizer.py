@@ -0,0 +1,470 @@
+# app/simulation/optimizer.py
+
+import logging
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.services.catalog import Catalog
+from app.simulation.cache import get_simulation_cache
+from app.simulation.engine import (
+    BOARD_SLOTS,
+    ENGINE_VERSION,
+    SIZE_SLOTS,
+    Board,
+    board_cost,
+    default_opponents,
+    win_rate,
+)
+
+logger = logging.getLogger(__name__)
+
+# Most worker processes one run may start, whatever its island count
+OPTIMIZER_MAX_WORKERS = int(os.environ.get("OPTIMIZER_MAX_WORKERS", 0)) or os.cpu_count() or 1
+
+# (item ids from left to right, sorted skill ids)
+Genome = Tuple[Tuple[int, ...], Tuple[int, ...]]
+# (win rate, cost)
+Fitness = Tuple[float, int]
+
+@dataclass
+class OptimizerConfig:
+    """Settings for an island-model optimizer run."""
+    hero_id: int
+    tier: str = "Bronze"
+    include_universal: bool = True
+    include_monster: bool = True
+    max_skills: int = 2
+    islands: Optional[int] = None  # Defaults to one island per core
+    workers: Optional[int] = None  # Defaults to one process per island; 0 runs in-process
+    population_size: int = 24
+    generations: int = 30
+    migration_interval: int = 5
+    migration_size: int = 2
+    mutation_rate: float = 0.3
+    opponents: int = 4
+    opponent_boards: Optional[List[List[int]]] = None
+    fights_per_opponent: int = 2
+    base_health: float = 300.0
+    seed: int = 0
+    time_budget: Optional[float] = None  # Seconds of wall-clock time
+    use_cache: bool = True  # Share results through the simulation cache
+
+@dataclass
+class ParetoEntry:
+    """One non-dominated board found by the optimizer."""
+    item_ids: List[int]
+    skill_ids: List[int]
+    win_rate: float
+    cost: int
+
+@dataclass
+class OptimizerResult:
+    """Outcome of an optimizer run."""
+    pareto_front: List[ParetoEntry]
+    generations_completed: int
+    evaluations: int
+    elapsed_seconds: float
+    islands: int
+    seed: int
+    engine_version: str = ENGINE_VERSION
+    stopped_by_budget: bool = False
+
+@dataclass
+class _Context:
+    """Everything an island needs to evaluate boards; sent once to each worker."""
+    catalog: Catalog
+    config: OptimizerConfig
+    item_pool: List[int]
+    skill_pool: List[int]
+    opponents: List[Board]
+
+# Set in each worker process by _init_worker
+_worker_context: Optional[_Context] = None
+
+def _init_worker(context: _Context) -> None:
+    global _worker_context
+    _worker_context = context
+
+def dominates(a: Fitness, b: Fitness) -> bool:
+    """Return True if fitness a Pareto-dominates b (higher win rate, lower cost)."""
+    return a[0] >= b[0] and a[1] <= b[1] and (a[0] > b[0] or a[1] < b[1])
+
+def _non_dominated_sort(fitnesses: Sequence[Fitness]) -> List[List[int]]:
+    """Split indices into Pareto fronts, best front first."""
+    dominated_by: List[List[int]] = [[] for _ in fitnesses]
+    domination_count = [0] * len(fitnesses)
+    fronts: List[List[int]] = [[]]
+    for i, fi in enumerate(fitnesses):
+        for j, fj in enumerate(fitnesses):
+            if i == j:
+                continue
+            if dominates(fi, fj):
+                dominated_by[i].append(j)
+            elif dominates(fj, fi):
+                domination_count[i] += 1
+        if domination_count[i] == 0:
+            fronts[0].append(i)
+    current = 0
+    while fronts[current]:
+        next_front = []
+        for i in fronts[current]:
+            for j in dominated_by[i]:
+                domination_count[j] -= 1
+                if domination_count[j] == 0:
+                    next_front.append(j)
+        current += 1
+        fronts.append(next_front)
+    return fronts[:-1]
+
+def _crowding(front: List[int], fitnesses: Sequence[Fitness]) -> Dict[int, float]:
+    distance = {i: 0.0 for i in front}
+    for objective in (0, 1):
+        ordered = sorted(front, key=lambda i: (fitnesses[i][objective], i))
+        low, high = fitnesses[ordered[0]][objective], fitnesses[ordered[-1]][objective]
+        distance[ordered[0]] = distance[ordered[-1]] = float("inf")
+        if high == low:
+            continue
+        for k in range(1, len(ordered) - 1):
+            distance[ordered[k]] += (fitnesses[ordered[k + 1]][objective] - fitnesses[ordered[k - 1]][objective]) / (high - low)
+    return distance
+
+def _select_survivors(population: List[Tuple[Genome, Fitness]], size: int) -> List[Tuple[Genome, Fitness]]:
+    """NSGA-II style selection by Pareto rank, then crowding distance."""
+    fitnesses = [fitness for _, fitness in population]
+    survivors: List[Tuple[Genome, Fitness]] = []
+    for front in _non_dominated_sort(fitnesses):
+        if len(survivors) + len(front) <= size:
+            survivors.extend(population[i] for i in sorted(front))
+            continue
+        distance = _crowding(front, fitnesses)
+        ranked = sorted(front, key=lambda i: (-distance[i], i))
+        survivors.extend(population[i] for i in ranked[:size - len(survivors)])
+        break
+    return survivors
+
+def _receive(population: List[Tuple[Genome, Fitness]],
+             incoming: List[Tuple[Genome, Fitness]]) -> List[Tuple[Genome, Fitness]]:
+    """Replace an island's worst boards with migrants from its neighbour."""
+    if not incoming:
+        return population
+    keep = max(0, len(population) - len(incoming))
+    survivors = _select_survivors(population, keep)
+    known = {genome for genome, _ in survivors}
+    return survivors + [entry for entry in incoming if entry[0] not in known]
+
+class _Island:
+    """Genetic operators and evaluation for one island."""
+
+    def __init__(self, context: _Context, rng: random.Random):
+        self.context = context
+        self.config = context.config
+        self.rng = rng
+        self.catalog = context.catalog
+        self.evaluations = 0
+        self._cache: Dict[Genome, Fitness] = {}
+        self.population: List[Tuple[Genome, Fitness]] = []
+        # Population at the start of the current epoch and after each of its generations
+        self.snapshots: List[List[Tuple[Genome, Fitness]]] = []
+
+    def _fits(self, item_ids: Sequence[int]) -> Tuple[int, ...]:
+        """Drop items from the right until the layout fits on the board."""
+        kept = []
+        free = BOARD_SLOTS
+        for item_id in item_ids:
+            size = SIZE_SLOTS.get(self.catalog.items[item_id].size or "small", 1)
+            if size <= free:
+                kept.append(item_id)
+                free -= size
+        return tuple(kept)
+
+    def random_genome(self) -> Genome:
+        pool = list(self.context.item_pool)
+        self.rng.shuffle(pool)
+        skills = self.rng.sample(self.context.skill_pool, min(self.config.max_skills, len(self.context.skill_pool)))
+        return self._fits(pool), tuple(sorted(skills))
+
+    def evaluate(self, genome: Genome) -> Fitness:
+        if genome not in self._cache:
+            board = Board.from_ids(genome[0], genome[1], self.config.tier)
+            simulate = get_simulation_cache().win_rate if self.config.use_cache else win_rate
+            score = simulate(board, self.context.opponents, self.catalog, self.config.fights_per_opponent,
+                             self.config.seed, self.config.base_health)
+            self._cache[genome] = (round(score, 4), board_cost(board, self.catalog))
+            self.evaluations += 1
+        return self._cache[genome]
+
+    def _tournament(self, population: List[Tuple[Genome, Fitness]]) -> Genome:
+        a, b = self.rng.sample(population, 2) if len(population) > 1 else (population[0], population[0])
+        if dominates(b[1], a[1]):
+            return b[0]
+        return a[0]
+
+    def _crossover(self, a: Genome, b: Genome) -> Genome:
+        items_a, items_b = a[0], b[0]
+        cut = self.rng.randint(0, len(items_a))
+        head = list(items_a[:cut])
+        tail = [item_id for item_id in items_b if item_id not in head]
+        skills = sorted(set(a[1]) | set(b[1]))
+        self.rng.shuffle(skills)
+        return self._fits(head + tail), tuple(sorted(skills[:self.config.max_skills]))
+
+    def _mutate(self, genome: Genome) -> Genome:
+        items, skills = list(genome[0]), list(genome[1])
+        pool = self.context.item_pool
+        move = self.rng.random()
+        if move < 0.3 and len(items) > 1:
+            # Swap two positions; this is what explores adjacency effects
+            i, j = self.rng.sample(range(len(items)), 2)
+            items[i], items[j] = items[j], items[i]
+        elif move < 0.7 and items:
+            replacement = self.rng.choice(pool)
+            if replacement not in items:
+                items[self.rng.randrange(len(items))] = replacement
+        elif move < 0.85:
+            candidate = self.rng.choice(pool)
+            if candidate not in items:
+                items.insert(self.rng.randint(0, len(items)), candidate)
+        elif self.context.skill_pool:
+            candidate = self.rng.choice(self.context.skill_pool)
+            if candidate not in skills:
+                if skills and len(skills) >= self.config.max_skills:
+                    skills[self.rng.randrange(len(skills))] = candidate
+                else:
+                    skills.append(candidate)
+        return self._fits(items), tuple(sorted(skills))
+
+    def populate(self, deadline: Optional[float] = None) -> bool:
+        """Create the initial population.
+
+        Args:
+            deadline: time.time() after which to give up, checked before
+                each board evaluation
+
+        Returns:
+            False, leaving the island empty, if the deadline passed first
+        """
+        population = []
+        for _ in range(self.config.population_size):
+            if deadline is not None and time.time() >= deadline:
+                return False
+            genome = self.random_genome()
+            population.append((genome, self.evaluate(genome)))
+        self.population = population
+        return True
+
+    def evolve(self, generations: int, deadline: Optional[float] = None) -> int:
+        """Evolve the population by up to a number of generations.
+
+        The population after every completed generation is kept in
+        ``snapshots`` until the next call, so a run stopped by its deadline
+        can roll every island back to the same generation.
+
+        Args:
+            generations: Generations to run
+            deadline: time.time() after which to give up, checked before
+                each board evaluation
+
+        Returns:
+            Generations completed; a generation the deadline interrupts is
+            discarded
+        """
+        size = self.config.population_size
+        population = self.population
+        self.snapshots = [population]
+        for _ in range(generations):
+            offspring = []
+            for _ in range(size):
+                if deadline is not None and time.time() >= deadline:
+                    return len(self.snapshots) - 1
+                child = self._crossover(self._tournament(population), self._tournament(population))
+                if self.rng.random() < self.config.mutation_rate:
+                    child = self._mutate(child)
+                if child[0]:
+                    offspring.append((child, self.evaluate(child)))
+            merged = {genome: fitness for genome, fitness in population + offspring}
+            population = _select_survivors(sorted(merged.items()), size)
+            self.population = population
+            self.snapshots.append(population)
+        return generations
+
+def _new_island(context: _Context, index: int) -> _Island:
+    return _Island(context, random.Random(context.config.seed * 1_000_003 + index))
+
+# Islands owned by this worker process, created on their first epoch
+_worker_islands: Dict[int, _Island] = {}
+
+def _run_island_epoch(index: int, generations: int, incoming: Optional[List[Tuple[Genome, Fitness]]],
+                      deadline: Optional[float],
+                      islands: Optional[Dict[int, _Island]] = None) -> Tuple[int, Optional[List[Tuple[Genome, Fitness]]], int]:
+    """Take in one island's migrants, then advance it by up to a number of generations.
+
+    Runs in the worker process that owns the island, which keeps its
+    population, random state and evaluation cache between epochs, or
+    in-process when the islands are passed explicitly. The first epoch
+    creates the initial population.
+
+    Returns:
+        (generations completed, population after them, evaluations so far);
+        the population is None if the deadline (a time.time() value) passed
+        before the initial population was complete
+    """
+    if islands is None:
+        islands = _worker_islands
+    island = islands.get(index)
+    if island is None:
+        island = islands[index] = _new_island(_worker_context, index)
+    if not island.population:
+        if not island.populate(deadline):
+            return 0, None, island.evaluations
+    else:
+        island.population = _receive(island.population, incoming or [])
+    completed = island.evolve(generations, deadline)
+    return completed, island.population, island.evaluations
+
+def _rollback_island(index: int, generations: int,
+                     islands: Optional[Dict[int, _Island]] = None) -> List[Tuple[Genome, Fitness]]:
+    """Return an island's population as it was a number of generations into the current epoch."""
+    island = (_worker_islands if islands is None else islands)[index]
+    island.population = island.snapshots[generations]
+    return island.population
+
+class IslandOptimizer:
+    """Island-model genetic optimizer for board layout and skill selection.
+
+    Islands evolve their own populations in separate processes (at most
+    OPTIMIZER_MAX_WORKERS, started fresh rather than forked from the
+    server). Each island stays in one process for the whole run, with its
+    evaluation cache, and runs ``migration_interval`` generations per
+    round trip; then each island sends copies of its best boards to the
+    next island in a ring. A larger interval than ``generations`` means no
+    migration. Results are deterministic for a given seed and number of
+    completed generations. The wall-clock budget is checked before every
+    board evaluation, and a generation it interrupts (or an unfinished
+    initial population) is discarded on every island, so the budget decides
+    how many generations complete but never changes what a completed one
+    produces.
+    """
+
+    def __init__(self, catalog: Catalog, config: OptimizerConfig):
+        self.catalog = catalog
+        self.config = config
+
+    def _build_context(self) -> _Context:
+        config = self.config
+        items = self.catalog.items_for_hero(config.hero_id, config.include_universal, config.include_monster)
+        item_pool = [item.id for item in items if item.cooldown or item.effect]
+        skills = self.catalog.skills_for_hero(config.hero_id, config.include_universal, config.include_monster)
+        skill_pool = [skill.id for skill in skills]
+        if config.opponent_boards:
+            opponents = [Board.from_ids(ids, tier=config.tier) for ids in config.opponent_boards]
+        else:
+            opponents = default_opponents(self.catalog, config.opponents, config.seed, config.tier)
+        return _Context(self.catalog, config, item_pool, skill_pool, opponents)
+
+    def run(self, progress: Optional[Callable[[float, str], None]] = None) -> OptimizerResult:
+        """Run the search.
+
+        Args:
+            progress: Called after every epoch with the completed fraction and
+                a message; it may raise to abort the run
+
+        Returns:
+            The Pareto front and run statistics
+
+        Raises:
+            ValueError: If no items are available
+        """
+        config = self.config
+        started = time.monotonic()
+        deadline = time.time() + config.time_budget if config.time_budget is not None else None
+        context = self._build_context()
+        if not context.item_pool:
+            raise ValueError(f"No items available for hero {config.hero_id}")
+
+        island_count = config.islands or os.cpu_count() or 1
+        workers = min(island_count if config.workers is None else config.workers, OPTIMIZER_MAX_WORKERS)
+        interval = min(config.migration_interval, config.generations)
+
+        # One single-process pool per worker, so island i always runs in the
+        # same process. Spawned, like the job pool: forking a threaded server
+        # copies its locks and connections.
+        executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                initializer=_init_worker, initargs=(context,))
+            for _ in range(workers)
+        ]
+        local_islands = {} if executors else {index: _new_island(context, index) for index in range(island_count)}
+
+        def on_islands(function: Callable, arguments: List[tuple]) -> list:
+            """Call a worker function for every island, where that island lives."""
+            if executors:
+                futures = [executors[index % workers].submit(function, index, *arguments[index])
+                           for index in range(island_count)]
+                return [future.result() for future in futures]
+            return [function(index, *arguments[index], islands=local_islands) for index in range(island_count)]
+
+        populations: List[List[Tuple[Genome, Fitness]]] = [[] for _ in range(island_count)]
+        incoming: List[Optional[List[Tuple[Genome, Fitness]]]] = [None] * island_count
+        evaluations = [0] * island_count
+        completed = 0
+        stopped_by_budget = False
+        try:
+            while completed < config.generations:
+                step = min(interval, config.generations - completed)
+                results = on_islands(_run_island_epoch, [(step, incoming[index], deadline) for index in range(island_count)])
+                evaluations = [result[2] for result in results]
+                if any(result[1] is None for result in results):
+                    stopped_by_budget = True
+                    break
+                reached = min(result[0] for result in results)
+                if reached < step:
+                    # Keep only the generations every island completed
+                    stopped_by_budget = True
+                    populations = on_islands(_rollback_island, [(reached,) for _ in range(island_count)])
+                    completed += reached
+                    break
+                populations = [result[1] for result in results]
+                completed += step
+                incoming = self._emigrants(populations)
+                populations = [_receive(population, boards) for population, boards in zip(populations, incoming)]
+                logger.info(f"Optimizer completed {completed}/{config.generations} generations")
+                if progress:
+                    progress(completed / config.generations, f"{completed}/{config.generations} generations")
+        finally:
+            for executor in executors:
+                executor.shutdown(cancel_futures=True)
+
+        return OptimizerResult(
+            pareto_front=self._pareto_front(populations),
+            generations_completed=completed,
+            evaluations=sum(evaluations),
+            elapsed_seconds=round(time.monotonic() - started, 3),
+            islands=island_count,
+            seed=config.seed,
+            stopped_by_budget=stopped_by_budget,
+        )
+
+    def _emigrants(self, populations: List[List[Tuple[Genome, Fitness]]]) -> List[List[Tuple[Genome, Fitness]]]:
+        """Return the boards each island receives at a migration: copies of the previous island's best."""
+        if len(populations) < 2 or self.config.migration_size <= 0:
+            return [[] for _ in populations]
+        best = [_select_survivors(population, self.config.migration_size) for population in populations]
+        return [best[index - 1] for index in range(len(populations))]
+
+    def _pareto_front(self, populations: List[List[Tuple[Genome, Fitness]]]) -> List[ParetoEntry]:
+        merged: Dict[Genome, Fitness] = {}
+        for population in populations:
+            merged.update(population)
+        entries = sorted(merged.items())
+        front = _non_dominated_sort([fitness for _, fitness in entries])
+        best = [entries[i] for i in front[0]] if front else []
+        best.sort(key=lambda entry: (entry[1][1], -entry[1][0], entry[0]))
+        return [
+            ParetoEntry(list(genome[0]), list(genome[1]), fitness[0], fitness[1])
+            for genome, fitness in best
+        ]
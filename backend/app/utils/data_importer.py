@@ -4,7 +4,7 @@ import json
 import logging
 import sys
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 from sqlalchemy.orm import Session
 
 # Add the parent directory to sys.path
@@ -12,9 +12,14 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 # Now use absolute imports
 from app.database.database import SessionLocal, engine
+from app.database.init_db import ensure_schema
 from app.models.hero import Hero
 from app.models.item import Item, ItemSize, ItemSource
 from app.models.skill import Skill, SkillSource
+from app.services.aggregate_stats import record_catalog_changes
+from app.services.catalog import SNAPSHOT_PATH, invalidate_catalog
+from app.services.catalog_snapshot import DEFAULT_SNAPSHOT_PATH, publish_snapshot
+from app.services.tag_index import sync_all_tags
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,6 +31,8 @@ class DataImporter:
     def __init__(self):
         """Initialize the data importer."""
         self.db = SessionLocal()
+        # Counts from the last run: heroes, items, skills and tag associations
+        self.counts: Dict[str, int] = {}
     
     def __del__(self):
         """Close the database session when done."""
@@ -78,7 +85,7 @@ class DataImporter:
             with open(file_path, 'r', encoding='utf-8') as f:
                 items_data = json.load(f)
             
-            count = 0
+            added = []
             for item_data in items_data:
                 # Check if item already exists
                 existing_item = self.db.query(Item).filter(Item.name == item_data["name"]).first()
@@ -111,12 +118,20 @@ class DataImporter:
                         monster_id=item_data.get("monster_id"),
                         cooldown=item_data.get("cooldown"),
                         effect=item_data.get("effect"),
-                        cost=item_data.get("cost")
+                        cost=item_data.get("cost"),
+                        types=item_data.get("types")
                     )
                     self.db.add(item)
-                    count += 1
+                    added.append(item)
+                elif existing_item.types is None and item_data.get("types"):
+                    # Backfill types for items imported before they were stored
+                    existing_item.types = item_data.get("types")
             
+            # Aggregate stats are updated in the same transaction
+            self.db.flush()
+            record_catalog_changes(self.db, items=[(item, 1) for item in added])
             self.db.commit()
+            count = len(added)
             logger.info(f"Imported {count} new items")
             return count
             
@@ -138,7 +153,7 @@ class DataImporter:
             with open(file_path, 'r', encoding='utf-8') as f:
                 skills_data = json.load(f)
             
-            count = 0
+            added = []
             for skill_data in skills_data:
                 # Check if skill already exists
                 existing_skill = self.db.query(Skill).filter(Skill.name == skill_data["name"]).first()
@@ -163,9 +178,12 @@ class DataImporter:
                         types=skill_data.get("types")
                     )
                     self.db.add(skill)
-                    count += 1
+                    added.append(skill)
             
+            self.db.flush()
+            record_catalog_changes(self.db, skills=[(skill, 1) for skill in added])
             self.db.commit()
+            count = len(added)
             logger.info(f"Imported {count} new skills")
             return count
             
@@ -174,29 +192,70 @@ class DataImporter:
             logger.error(f"Error importing skills: {e}")
             return 0
     
-    def run(self, heroes_file: str = "data/heroes.json", items_file: str = "data/items.json", skills_file: str = "data/skills.json") -> bool:
+    def import_tags(self) -> int:
+        """Rebuild the normalized tag dictionary and item/skill tag associations.
+        
+        Returns:
+            Number of tag associations written
+        """
+        try:
+            count = sync_all_tags(self.db)
+            logger.info(f"Wrote {count} tag associations")
+            return count
+            
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error importing tags: {e}")
+            return 0
+    
+    def run(self, heroes_file: str = "data/heroes.json", items_file: str = "data/items.json", skills_file: str = "data/skills.json",
+            snapshot_file: Optional[str] = None, progress: Optional[Callable[[float, Optional[str]], None]] = None) -> bool:
         """Run the complete data import process.
         
         Args:
             heroes_file: Path to the heroes JSON file
             items_file: Path to the items JSON file
             skills_file: Path to the skills JSON file
+            snapshot_file: Binary catalog snapshot to write (default: CATALOG_SNAPSHOT, or catalog.snap next to the database)
+            progress: Called with (fraction done, message) before each step; may raise to stop the import
             
         Returns:
             True if successful, False otherwise
         """
+        report = progress or (lambda fraction, message=None: None)
+        
+        # Make sure older databases have every column the models expect
+        report(0.0, "Checking schema")
+        ensure_schema()
+        
         # Import heroes first to establish relationships
+        report(0.05, "Importing heroes")
         heroes_count = self.import_heroes(heroes_file)
         logger.info(f"Imported {heroes_count} heroes")
         
         # Import items
+        report(0.25, "Importing items")
         items_count = self.import_items(items_file)
         logger.info(f"Imported {items_count} items")
         
         # Import skills
+        report(0.5, "Importing skills")
         skills_count = self.import_skills(skills_file)
         logger.info(f"Imported {skills_count} skills")
         
+        # Tags are derived from the types strings of everything imported above
+        report(0.75, "Rebuilding tags")
+        tags_count = self.import_tags()
+        self.counts = {"heroes": heroes_count, "items": items_count, "skills": skills_count, "tags": tags_count}
+        
+        invalidate_catalog()
+        
+        # Readers map the binary snapshot instead of parsing JSON or loading ORM rows
+        report(0.9, "Publishing catalog snapshot")
+        snapshot_file = snapshot_file or SNAPSHOT_PATH or str(DEFAULT_SNAPSHOT_PATH)
+        if snapshot_file != SNAPSHOT_PATH:
+            publish_snapshot(self.db, snapshot_file)
+        
         return heroes_count >= 0 and items_count >= 0 and skills_count >= 0
 
 def main():
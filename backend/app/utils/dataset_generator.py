@@ -0,0 +1,476 @@
+# app/utils/dataset_generator.py
+
+import bisect
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Now use absolute imports
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.database.database import Base
+from app.database.init_db import schema_version, set_stored_schema_version
+from app.services.aggregate_stats import REBUILD_STATEMENTS as STATS_REBUILD_STATEMENTS
+from app.services.backfills import BACKFILLS
+from app.services.catalog import split_types
+from app.services.cooccurrence import REBUILD_STATEMENTS
+from app.services.fingerprints import build_fingerprint
+from app.services.tag_index import tag_key
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+
+# Board width in small-item slots and the slots each size takes up
+BOARD_SLOTS = 10
+SIZE_SLOTS = {"small": 1, "medium": 2, "large": 3}
+
+# Builds per 1x scale; 1000x gives the ~100k builds seen in production
+BUILDS_PER_SCALE = 100
+INVENTORIES_PER_SCALE = 50
+
+# Rows per executemany batch
+BATCH_SIZE = 10_000
+
+# Fixed epoch so created_at values do not depend on when the generator runs
+EPOCH = datetime(2024, 1, 1)
+
+_TIERED_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+@dataclass(frozen=True)
+class GeneratedItem:
+    """An item row plus the fields the build generator needs."""
+    id: int
+    name: str
+    size: str
+    source: str
+    hero_id: Optional[int]
+    cooldown: Optional[float]
+    effect: str
+    types: str
+
+@dataclass(frozen=True)
+class GeneratedSkill:
+    """A skill row plus the fields the build generator needs."""
+    id: int
+    name: str
+    source: str
+    hero_id: Optional[int]
+    tier: Optional[str]
+    effect: str
+    types: str
+
+def _load_json(path: Path) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _scale_numbers(text: str, factor: float) -> str:
+    """Multiply every number in an effect string, keeping its tiered shape ("8/12/16/20")."""
+    if factor == 1.0 or not text:
+        return text
+
+    def scale(match: re.Match) -> str:
+        value = float(match.group(0)) * factor
+        return str(max(1, int(round(value))))
+
+    return _TIERED_NUMBER.sub(scale, text)
+
+class DatasetGenerator:
+    """Seeded generator of a scaled-up copy of the game data.
+
+    The real data files are used as templates: at scale ``k`` every real
+    hero becomes ``k`` heroes, each with a mutated copy of the template
+    hero's items and skills (same sizes, types and effect shapes, jittered
+    numbers and cooldowns). Monster items and skills are copied ``k``
+    times. Builds pick items with a skewed popularity so a few items are
+    very common, as in real build data.
+
+    The same seed and scale always produce the same rows.
+    """
+
+    def __init__(self, scale: int = 1, seed: int = 0, builds: Optional[int] = None,
+                 inventories: Optional[int] = None, data_dir: Path = DATA_DIR):
+        if scale < 1:
+            raise ValueError("Scale must be at least 1")
+        self.scale = scale
+        self.seed = seed
+        self.build_count = builds if builds is not None else BUILDS_PER_SCALE * scale
+        self.inventory_count = inventories if inventories is not None else INVENTORIES_PER_SCALE * scale
+        self.template_heroes = _load_json(data_dir / "heroes.json")
+        self.template_items = _load_json(data_dir / "items.json")
+        self.template_skills = _load_json(data_dir / "skills.json")
+
+        # Hero IDs referenced by the data files; heroes.json may list fewer
+        referenced = {row["hero_id"] for row in self.template_items + self.template_skills if row.get("hero_id")}
+        self.template_hero_ids = sorted(referenced | set(range(1, len(self.template_heroes) + 1)))
+
+        self.heroes: Dict[int, str] = {}
+        self.items: List[GeneratedItem] = []
+        self.skills: List[GeneratedSkill] = []
+        self._generate_catalog()
+
+    def _rng(self, stream: str) -> random.Random:
+        # Independent stream per table so changing the build count leaves the catalog unchanged
+        return random.Random(f"{self.seed}:{stream}")
+
+    def _hero_id(self, template_hero_id: int, copy: int) -> int:
+        return copy * len(self.template_hero_ids) + self.template_hero_ids.index(template_hero_id) + 1
+
+    def _generate_catalog(self) -> None:
+        for copy in range(self.scale):
+            for template_id in self.template_hero_ids:
+                if template_id <= len(self.template_heroes):
+                    base = self.template_heroes[template_id - 1]["name"]
+                else:
+                    base = f"Hero {template_id}"
+                hero_id = self._hero_id(template_id, copy)
+                self.heroes[hero_id] = base if copy == 0 else f"{base}-{copy + 1}"
+
+        rng = self._rng("items")
+        for copy in range(self.scale):
+            for template in self.template_items:
+                hero_id = self._hero_id(template["hero_id"], copy) if template.get("hero_id") else None
+                cooldown = template.get("cooldown")
+                if cooldown is not None and copy:
+                    cooldown = float(max(1, int(cooldown) + rng.randint(-1, 1)))
+                factor = 1.0 if copy == 0 else rng.choice((0.5, 0.75, 1.0, 1.25, 1.5, 2.0))
+                self.items.append(GeneratedItem(
+                    id=len(self.items) + 1,
+                    name=template["name"] if copy == 0 else f"{template['name']} {copy + 1}",
+                    size=template.get("size") or "medium",
+                    source=template.get("source") or "universal",
+                    hero_id=hero_id,
+                    cooldown=cooldown,
+                    effect=_scale_numbers(template.get("effect") or "", factor),
+                    types=template.get("types") or "",
+                ))
+
+        rng = self._rng("skills")
+        for copy in range(self.scale):
+            for template in self.template_skills:
+                hero_id = self._hero_id(template["hero_id"], copy) if template.get("hero_id") else None
+                factor = 1.0 if copy == 0 else rng.choice((0.5, 0.75, 1.0, 1.25, 1.5, 2.0))
+                self.skills.append(GeneratedSkill(
+                    id=len(self.skills) + 1,
+                    name=template["name"] if copy == 0 else f"{template['name']} {copy + 1}",
+                    source=template.get("source") or "universal",
+                    hero_id=hero_id,
+                    tier=template.get("tier"),
+                    effect=_scale_numbers(template.get("effect") or "", factor),
+                    types=template.get("types") or "",
+                ))
+
+    def _pools(self) -> Tuple[Dict[int, List[GeneratedItem]], Dict[int, List[GeneratedSkill]]]:
+        """Return each hero's selectable items and skills in popularity order."""
+        universal_items = [item for item in self.items if item.source == "universal"]
+        universal_skills = [skill for skill in self.skills if skill.source == "universal"]
+        item_pools: Dict[int, List[GeneratedItem]] = {hero_id: list(universal_items) for hero_id in self.heroes}
+        skill_pools: Dict[int, List[GeneratedSkill]] = {hero_id: list(universal_skills) for hero_id in self.heroes}
+        for item in self.items:
+            if item.hero_id in item_pools:
+                item_pools[item.hero_id].append(item)
+        for skill in self.skills:
+            if skill.hero_id in skill_pools:
+                skill_pools[skill.hero_id].append(skill)
+
+        rng = self._rng("popularity")
+        for hero_id in sorted(self.heroes):
+            rng.shuffle(item_pools[hero_id])
+            rng.shuffle(skill_pools[hero_id])
+        return item_pools, skill_pools
+
+    @staticmethod
+    def _zipf_weights(n: int, exponent: float = 1.1) -> List[float]:
+        return list(accumulate(1.0 / (rank ** exponent) for rank in range(1, n + 1)))
+
+    @staticmethod
+    def _pick(rng: random.Random, cumulative: Sequence[float]) -> int:
+        return bisect.bisect_left(cumulative, rng.random() * cumulative[-1])
+
+    def iter_builds(self) -> Iterator[Tuple[int, str, int, datetime, List[Tuple[int, str]], List[int]]]:
+        """Yield (build_id, name, hero_id, created_at, [(item_id, slot)], [skill_id]).
+
+        Items are drawn by Zipf-like popularity from the hero's pool until
+        the board is full or the build's target item count is reached.
+        """
+        item_pools, skill_pools = self._pools()
+        hero_ids = sorted(hero_id for hero_id in self.heroes if item_pools[hero_id])
+        item_weights = {hero_id: self._zipf_weights(len(item_pools[hero_id])) for hero_id in hero_ids}
+        skill_weights = {hero_id: self._zipf_weights(len(skill_pools[hero_id])) for hero_id in hero_ids
+                         if skill_pools[hero_id]}
+        rng = self._rng("builds")
+
+        for build_id in range(1, self.build_count + 1):
+            hero_id = rng.choice(hero_ids)
+            pool = item_pools[hero_id]
+            target = rng.randint(3, 8)
+            used = 0
+            chosen: List[Tuple[int, str]] = []
+            seen = set()
+            for _ in range(target * 4):
+                if len(chosen) >= target or used >= BOARD_SLOTS:
+                    break
+                item = pool[self._pick(rng, item_weights[hero_id])]
+                width = SIZE_SLOTS.get(item.size, 2)
+                if item.id in seen or used + width > BOARD_SLOTS:
+                    continue
+                seen.add(item.id)
+                chosen.append((item.id, str(used)))
+                used += width
+
+            skill_ids: List[int] = []
+            if hero_id in skill_weights:
+                for _ in range(rng.randint(0, 4)):
+                    skill_id = skill_pools[hero_id][self._pick(rng, skill_weights[hero_id])].id
+                    if skill_id not in skill_ids:
+                        skill_ids.append(skill_id)
+
+            types = [t for item_id, _ in chosen for t in split_types(self.items[item_id - 1].types)]
+            theme = max(sorted(set(types)), key=types.count) if types else "Mixed"
+            name = f"{self.heroes[hero_id]} {theme} #{build_id}"
+            created_at = EPOCH + timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+            yield build_id, name, hero_id, created_at, chosen, skill_ids
+
+    def iter_inventories(self) -> Iterator[Dict[str, Any]]:
+        """Yield inventory payloads for /inventory/match-builds.
+
+        Each inventory is part of a generated build plus a few random items
+        from the same hero's pool, the way a run in progress looks.
+        """
+        item_pools, skill_pools = self._pools()
+        builds = list(self.iter_builds()) if self.inventory_count else []
+        rng = self._rng("inventories")
+        for _ in range(self.inventory_count if builds else 0):
+            _, _, hero_id, _, build_items, build_skills = rng.choice(builds)
+            item_ids = [item_id for item_id, _ in build_items]
+            kept = rng.sample(item_ids, max(1, int(len(item_ids) * rng.uniform(0.3, 1.0))))
+            extras = [item.id for item in rng.sample(item_pools[hero_id], min(3, len(item_pools[hero_id])))]
+            skill_ids = rng.sample(build_skills, rng.randint(0, len(build_skills)))
+            if skill_pools[hero_id] and rng.random() < 0.5:
+                skill_ids.append(rng.choice(skill_pools[hero_id]).id)
+            yield {
+                "hero_id": hero_id,
+                "item_ids": sorted(set(kept + extras)),
+                "skill_ids": sorted(set(skill_ids)),
+            }
+
+    def iter_tags(self) -> Tuple[List[Tuple[int, str, str]], List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """Return tag rows and item/skill associations, as sync_all_tags would write them."""
+        spellings: Dict[str, Dict[str, int]] = {}
+        for row in self.items + self.skills:
+            for name in split_types(row.types):
+                counts = spellings.setdefault(tag_key(name), {})
+                counts[name] = counts.get(name, 0) + 1
+        tag_ids: Dict[str, int] = {}
+        tags = []
+        for key in sorted(spellings):
+            # Named after the most common spelling, ties broken alphabetically
+            name = min(spellings[key].items(), key=lambda kv: (-kv[1], kv[0]))[0]
+            tag_ids[key] = len(tags) + 1
+            tags.append((tag_ids[key], name, key))
+
+        item_tags = [(item.id, tag_id) for item in self.items
+                     for tag_id in sorted({tag_ids[tag_key(name)] for name in split_types(item.types)})]
+        skill_tags = [(skill.id, tag_id) for skill in self.skills
+                      for tag_id in sorted({tag_ids[tag_key(name)] for name in split_types(skill.types)})]
+        return tags, item_tags, skill_tags
+
+def _batches(rows: Iterator[tuple], size: int = BATCH_SIZE) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _timestamp(value: datetime) -> str:
+    # Same text format SQLAlchemy's SQLite DateTime type writes and parses
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+def write_dataset(generator: DatasetGenerator, db_path: str, overwrite: bool = False) -> Dict[str, int]:
+    """Load a generated dataset into a new SQLite database file.
+
+    The schema is created from the models, secondary indexes are dropped
+    while loading, and all rows go in through ``executemany`` in a single
+    transaction with journaling and syncing off. Indexes are rebuilt and
+    ANALYZE is run at the end.
+
+    Args:
+        generator: Source of the rows
+        db_path: Database file to create
+        overwrite: Replace the file if it already exists
+
+    Returns:
+        Row counts per table
+
+    Raises:
+        FileExistsError: If the file exists and overwrite is False
+    """
+    if os.path.exists(db_path):
+        if not overwrite:
+            raise FileExistsError(f"{db_path} already exists (pass overwrite to replace it)")
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    # Record the schema version so the app skips its schema check on startup
+    set_stored_schema_version(schema_version(), bind=engine)
+    engine.dispose()
+
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    counts: Dict[str, int] = {}
+    try:
+        connection.execute("PRAGMA journal_mode=OFF")
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.execute("PRAGMA temp_store=MEMORY")
+        connection.execute("PRAGMA cache_size=-262144")
+        connection.execute("PRAGMA locking_mode=EXCLUSIVE")
+
+        # Rebuilding an index once is much cheaper than maintaining it per row
+        indexes = connection.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL ORDER BY name"
+        ).fetchall()
+        connection.execute("BEGIN")
+        for name, _ in indexes:
+            connection.execute(f'DROP INDEX "{name}"')
+
+        def insert(table: str, columns: Sequence[str], rows: Iterator[tuple]) -> None:
+            statement = (f'INSERT INTO {table} ({", ".join(columns)}) '
+                         f'VALUES ({", ".join("?" for _ in columns)})')
+            total = 0
+            for batch in _batches(rows):
+                connection.executemany(statement, batch)
+                total += len(batch)
+            counts[table] = total
+
+        insert("heroes", ("id", "name"), iter(sorted(generator.heroes.items())))
+        # Enum columns store the member name, as SQLAlchemy does
+        insert("items", ("id", "name", "description", "size", "source", "hero_id", "cooldown", "effect", "types"), (
+            (item.id, item.name, item.effect, item.size.upper(), item.source.upper(), item.hero_id,
+             item.cooldown, item.effect, item.types)
+            for item in generator.items
+        ))
+        insert("skills", ("id", "name", "description", "source", "hero_id", "tier", "effect", "types"), (
+            (skill.id, skill.name, skill.effect, skill.source.upper(), skill.hero_id, skill.tier,
+             skill.effect, skill.types)
+            for skill in generator.skills
+        ))
+
+        tags, item_tags, skill_tags = generator.iter_tags()
+        insert("tags", ("id", "name", "key"), iter(tags))
+        insert("item_tags", ("item_id", "tag_id"), iter(item_tags))
+        insert("skill_tags", ("skill_id", "tag_id"), iter(skill_tags))
+
+        build_rows: List[tuple] = []
+        build_item_rows: List[tuple] = []
+        build_skill_rows: List[tuple] = []
+        counts["builds"] = counts["build_items"] = counts["build_skills"] = 0
+        build_item_id = build_skill_id = 0
+
+        def flush() -> None:
+            for table, columns, rows in (
+                ("builds", ("id", "name", "description", "hero_id", "created_at", "updated_at", "fingerprint"),
+                 build_rows),
+                ("build_items", ("id", "build_id", "item_id", "slot"), build_item_rows),
+                ("build_skills", ("id", "build_id", "skill_id"), build_skill_rows),
+            ):
+                if rows:
+                    connection.executemany(
+                        f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" for _ in columns)})',
+                        rows,
+                    )
+                    counts[table] += len(rows)
+                    rows.clear()
+
+        # Fingerprints are unique; later copies of a generated build are left without one
+        fingerprints = set()
+        for build_id, name, hero_id, created_at, items, skill_ids in generator.iter_builds():
+            stamp = _timestamp(created_at)
+            fingerprint = build_fingerprint(hero_id, items, skill_ids)
+            if fingerprint in fingerprints:
+                fingerprint = None
+            else:
+                fingerprints.add(fingerprint)
+            build_rows.append((build_id, name, "Generated build", hero_id, stamp, stamp, fingerprint))
+            for item_id, slot in items:
+                build_item_id += 1
+                build_item_rows.append((build_item_id, build_id, item_id, slot))
+            for skill_id in skill_ids:
+                build_skill_id += 1
+                build_skill_rows.append((build_skill_id, build_id, skill_id))
+            if len(build_item_rows) >= BATCH_SIZE:
+                flush()
+        flush()
+
+        for _, sql in indexes:
+            connection.execute(sql)
+        for statement in REBUILD_STATEMENTS + STATS_REBUILD_STATEMENTS:
+            connection.execute(statement)
+        # Every derived table was written above, so the app has nothing to backfill
+        insert("data_backfills", ("name", "completed_at"),
+               ((name, _timestamp(datetime.utcnow())) for name in BACKFILLS))
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+    except Exception:
+        # Rollback is unreliable with the journal off, so drop the half-written file
+        connection.close()
+        os.remove(db_path)
+        raise
+    connection.close()
+    return counts
+
+def write_inventories(generator: DatasetGenerator, path: str) -> int:
+    """Write the generated inventories as a JSON list of match-builds payloads.
+
+    Returns:
+        Number of inventories written
+    """
+    inventories = list(generator.iter_inventories())
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(inventories, f)
+    return len(inventories)
+
+def generate(db_path: str, scale: int = 1, seed: int = 0, builds: Optional[int] = None,
+             inventories: Optional[int] = None, inventories_path: Optional[str] = None,
+             overwrite: bool = False) -> Dict[str, int]:
+    """Generate a dataset and load it into ``db_path``.
+
+    Args:
+        db_path: Database file to create
+        scale: Catalog and build multiplier (1 = the size of the data files)
+        seed: Random seed
+        builds: Number of builds (default: 100 per unit of scale)
+        inventories: Number of inventories (default: 50 per unit of scale)
+        inventories_path: Where to write the inventories (default: next to the database)
+        overwrite: Replace an existing database file
+
+    Returns:
+        Row counts per table, plus "inventories"
+    """
+    started = time.perf_counter()
+    generator = DatasetGenerator(scale=scale, seed=seed, builds=builds, inventories=inventories)
+    counts = write_dataset(generator, db_path, overwrite=overwrite)
+    inventories_path = inventories_path or f"{os.path.splitext(db_path)[0]}_inventories.json"
+    counts["inventories"] = write_inventories(generator, inventories_path)
+    logger.info(f"Generated {scale}x dataset in {time.perf_counter() - started:.1f}s: {counts}")
+    return counts
@@ -0,0 +1,34 @@
+# app/utils/run_cooccurrence_rebuild.py
+
+import sys
+import os
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Now use absolute imports
+from app.database.database import SessionLocal
+from app.database.init_db import ensure_schema
+from app.services.cooccurrence import rebuild_cooccurrence
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def main():
+    """Recompute the item co-occurrence counts from the stored builds."""
+    logger.info("Rebuilding co-occurrence counts")
+    
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        counts = rebuild_cooccurrence(db)
+    finally:
+        db.close()
+    
+    for table, rows in counts.items():
+        logger.info(f"{table}: {rows} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# app/utils/run_dataset_generator.py
+
+import argparse
+import sys
+import os
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Now use absolute imports
+from app.utils.dataset_generator import generate
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Generate a deterministic scaled-up dataset for scale testing")
+    parser.add_argument("database", help="SQLite database file to create")
+    parser.add_argument("--scale", type=int, default=1, help="Catalog and build multiplier (1 to 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--builds", type=int, default=None, help="Number of builds (default: 100 per unit of scale)")
+    parser.add_argument("--inventories", type=int, default=None,
+                        help="Number of inventories (default: 50 per unit of scale)")
+    parser.add_argument("--inventories-file", default=None,
+                        help="JSON file for the inventories (default: <database>_inventories.json)")
+    parser.add_argument("--overwrite", action="store_true", help="Replace the database file if it exists")
+    return parser.parse_args()
+
+def main():
+    """Generate the dataset."""
+    args = parse_args()
+    if not 1 <= args.scale <= 1000:
+        logger.error("Scale must be between 1 and 1000")
+        sys.exit(1)
+    try:
+        generate(
+            args.database,
+            scale=args.scale,
+            seed=args.seed,
+            builds=args.builds,
+            inventories=args.inventories,
+            inventories_path=args.inventories_file,
+            overwrite=args.overwrite,
+        )
+    except FileExistsError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# app/utils/run_fingerprint_backfill.py
+
+import argparse
+import json
+import sys
+import os
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Now use absolute imports
+from app.database.database import SessionLocal
+from app.database.init_db import ensure_schema
+from app.services.fingerprints import BACKFILL_BATCH_SIZE, backfill_fingerprints
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Fingerprint stored builds that have no fingerprint yet")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="Builds per transaction")
+    parser.add_argument("--delete-duplicates", action="store_true",
+                        help="Delete builds identical to an older build instead of only reporting them")
+    parser.add_argument("--output", default=None, help="Write the duplicates found as JSON to this file")
+    return parser.parse_args()
+
+def main():
+    """Backfill build fingerprints."""
+    args = parse_args()
+
+    # Adds the fingerprint column and its unique index to older databases
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        result = backfill_fingerprints(db, batch_size=args.batch_size, delete_duplicates=args.delete_duplicates)
+    finally:
+        db.close()
+
+    logger.info(f"Fingerprinted {result['fingerprinted']} builds")
+    for duplicate in result["duplicates"][:20]:
+        logger.info(f"Build {duplicate['build_id']} is a copy of build {duplicate['duplicate_of']}")
+    if result["deleted"]:
+        logger.info(f"Deleted {result['deleted']} duplicate builds")
+    elif result["duplicates"]:
+        logger.warning(f"{len(result['duplicates'])} duplicate builds were left without a fingerprint; "
+                       f"rerun with --delete-duplicates to remove them")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        logger.info(f"Saved result to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# app/utils/run_optimizer.py
+
+import argparse
+import json
+import sys
+import os
+from dataclasses import asdict
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Now use absolute imports
+from app.database.database import SessionLocal
+from app.database.init_db import ensure_schema
+from app.services.catalog import load_catalog
+from app.simulation.optimizer import IslandOptimizer, OptimizerConfig
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Search for boards that trade off win rate against cost")
+    parser.add_argument("--hero-id", type=int, required=True, help="Hero to optimize for")
+    parser.add_argument("--tier", default="Bronze", help="Tier of every item on the board")
+    parser.add_argument("--no-universal", action="store_true", help="Exclude universal items and skills")
+    parser.add_argument("--no-monster", action="store_true", help="Exclude monster items and skills")
+    parser.add_argument("--max-skills", type=int, default=2, help="Maximum number of skills per board")
+    parser.add_argument("--islands", type=int, default=None, help="Number of islands (default: one per core)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 runs in-process)")
+    parser.add_argument("--population", type=int, default=24, help="Boards per island")
+    parser.add_argument("--generations", type=int, default=30, help="Generations to run")
+    parser.add_argument("--migration-interval", type=int, default=5, help="Generations between migrations")
+    parser.add_argument("--fights", type=int, default=2, help="Fights per opponent")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--budget", type=float, default=None, help="Wall-clock budget in seconds")
+    parser.add_argument("--output", default=None, help="Write the result as JSON to this file")
+    return parser.parse_args()
+
+def main():
+    """Run the board optimizer."""
+    args = parse_args()
+    logger.info(f"Starting optimizer for hero {args.hero_id}")
+    
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        catalog = load_catalog(db)
+    finally:
+        db.close()
+    
+    config = OptimizerConfig(
+        hero_id=args.hero_id,
+        tier=args.tier,
+        include_universal=not args.no_universal,
+        include_monster=not args.no_monster,
+        max_skills=args.max_skills,
+        islands=args.islands,
+        workers=args.workers,
+        population_size=args.population,
+        generations=args.generations,
+        migration_interval=args.migration_interval,
+        fights_per_opponent=args.fights,
+        seed=args.seed,
+        time_budget=args.budget,
+    )
+    result = IslandOptimizer(catalog, config).run()
+    
+    for entry in result.pareto_front:
+        names = ", ".join(catalog.items[item_id].name for item_id in entry.item_ids)
+        logger.info(f"win rate {entry.win_rate:.2f}  cost {entry.cost:3d}  [{names}]")
+    logger.info(f"{result.evaluations} boards evaluated in {result.elapsed_seconds}s")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(asdict(result), f, indent=2)
+        logger.info(f"Saved result to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# app/utils/run_stats_reconcile.py
+
+import argparse
+import json
+import sys
+import os
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Now use absolute imports
+from app.database.database import SessionLocal
+from app.database.init_db import ensure_schema
+from app.services.aggregate_stats import reconcile_stats
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Check the aggregate stats tables against a full recompute")
+    parser.add_argument("--fix", action="store_true", help="Rewrite the tables that differ")
+    parser.add_argument("--output", default=None, help="Write the report as JSON to this file")
+    return parser.parse_args()
+
+def main():
+    """Reconcile the aggregate stats; exits with 1 if any table was off and not fixed."""
+    args = parse_args()
+    
+    ensure_schema()
+    db = SessionLocal()
+    try:
+        report = reconcile_stats(db, fix=args.fix)
+    finally:
+        db.close()
+    
+    off = 0
+    for table, result in report.items():
+        mismatches = result["mismatches"]
+        if not mismatches:
+            logger.info(f"{table}: {result['rows']} rows match")
+            continue
+        off += 1
+        logger.warning(f"{table}: {len(mismatches)} of {result['rows']} rows differ"
+                       f"{' (rewritten)' if args.fix else ''}")
+        for mismatch in mismatches[:20]:
+            logger.warning(f"  {mismatch['key']}: stored {mismatch['stored']}, expected {mismatch['expected']}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Saved report to {args.output}")
+    
+    return 1 if off and not args.fix else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
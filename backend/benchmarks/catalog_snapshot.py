@@ -0,0 +1,117 @@
+# benchmarks/catalog_snapshot.py
+#
+# Catalog loading benchmark: ORM rows, the JSON data files and the binary
+# snapshot.
+#
+#   cd backend
+#   python -m benchmarks.catalog_snapshot --scale 20
+#
+# Reports the median time and the Python memory allocated by each way of
+# getting a catalog, plus the cost of a single record lookup and a full
+# scan of the mapped snapshot.
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+
+DATA_DIR = BACKEND_DIR / "data"
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def measure(function: Callable[[], Any], runs: int) -> Dict[str, float]:
+    """Return the median wall time of ``function`` and the memory its result keeps allocated."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - started)
+        del result
+    tracemalloc.start()
+    result = function()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"median_us": round(statistics.median(samples) * 1e6, 1), "retained_kb": round(retained / 1024, 1)}
+
+def load_json_files() -> list:
+    data = []
+    for name in ("heroes.json", "items.json", "skills.json"):
+        with open(DATA_DIR / name, 'r', encoding='utf-8') as f:
+            data.append(json.load(f))
+    return data
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare ways of loading the catalog")
+    parser.add_argument("--scale", type=int, default=1, help="Dataset scale factor")
+    parser.add_argument("--runs", type=int, default=5, help="Runs of the slow loaders")
+    parser.add_argument("--open-runs", type=int, default=1000, help="Runs of the snapshot open")
+    parser.add_argument("--output", default=None, help="Also write the results to this file")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bazaar-catalog-")
+    db_path = f"{scratch}/catalog.db"
+    snapshot_path = f"{scratch}/catalog.snap"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from app.utils.dataset_generator import generate
+
+    generate(db_path, scale=args.scale, builds=0, inventories=0)
+
+    from app.database.database import SessionLocal
+    from app.services.catalog import load_catalog
+    from app.services.catalog_snapshot import MappedCatalog, write_snapshot
+
+    db = SessionLocal()
+    try:
+        catalog = load_catalog(db)
+        results: Dict[str, Dict[str, float]] = {
+            "orm_load": measure(lambda: load_catalog(db), args.runs),
+        }
+    finally:
+        db.close()
+    # The data files are the unscaled originals
+    results["json_files_1x"] = measure(load_json_files, args.runs)
+    results["snapshot_write"] = measure(lambda: write_snapshot(catalog, snapshot_path, 1), args.runs)
+    results["snapshot_open"] = measure(lambda: MappedCatalog(snapshot_path), args.open_runs)
+
+    mapped = MappedCatalog(snapshot_path)
+    item_ids = list(catalog.items)
+    middle = item_ids[len(item_ids) // 2]
+    # A fresh mapping each time, so the lookup includes decoding the record
+    results["snapshot_lookup"] = measure(lambda: MappedCatalog(snapshot_path).items[middle], args.open_runs)
+    results["snapshot_full_scan"] = measure(lambda: [mapped.items._record(row) for row in range(len(item_ids))],
+                                            args.runs)
+
+    report = {
+        "scale": args.scale,
+        "items": len(catalog.items),
+        "skills": len(catalog.skills),
+        "snapshot_bytes": os.path.getsize(snapshot_path),
+        "metrics": results,
+    }
+    logger.info(f"{report['items']} items, {report['skills']} skills, snapshot {report['snapshot_bytes']} bytes")
+    for metric, stats in results.items():
+        logger.info(f"{metric:<20} median {stats['median_us']:>12.1f} us  retained {stats['retained_kb']:>10.1f} KiB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+# benchmarks/http_load.py
+#
+# HTTP load test and latency benchmark for the FastAPI app.
+#
+#   cd backend
+#   python -m benchmarks.http_load --concurrency 8 --requests 200
+#   python -m benchmarks.http_load --update-baseline
+#
+# Boots app.main:app under uvicorn against a scratch SQLite database filled
+# by the dataset generator, drives every route family, and compares the
+# results with the stored baseline. Exits non-zero when a route regresses
+# past the threshold.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+
+DEFAULT_BASELINE = BACKEND_DIR / "benchmarks" / "baseline.json"
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# SQL statement count in the app's Server-Timing header
+_SQL_STATEMENTS = re.compile(r'sql;desc="(\d+) statements"')
+
+class Scenario:
+    """One route family: a route template plus a request factory."""
+
+    def __init__(self, route: str, method: str, make: Callable[[random.Random], Tuple[str, Optional[dict]]]):
+        self.route = route
+        self.method = method
+        self.make = make
+
+def seed_database(db_path: str, scale: int, builds: int, seed: int) -> Dict[str, List[int]]:
+    """Generate the scratch database and return the IDs the scenarios draw from."""
+    from app.utils.dataset_generator import generate
+
+    generate(db_path, scale=scale, seed=seed, builds=builds, inventories=0, overwrite=True)
+    connection = sqlite3.connect(db_path)
+    try:
+        return {
+            table: [row_id for (row_id,) in connection.execute(f"SELECT id FROM {table} ORDER BY id")]
+            for table in ("heroes", "items", "skills", "builds")
+        }
+    finally:
+        connection.close()
+
+def make_scenarios(ids: Dict[str, List[int]]) -> List[Scenario]:
+    items, skills, heroes, builds = ids["items"], ids["skills"], ids["heroes"], ids["builds"]
+
+    def build_body(rng: random.Random) -> dict:
+        return {
+            "name": "Load test build",
+            "hero_id": rng.choice(heroes),
+            "build_items": [{"item_id": i, "slot": str(n)} for n, i in enumerate(rng.sample(items, 5))],
+            "build_skills": [{"skill_id": s} for s in rng.sample(skills, 2)],
+        }
+
+    def inventory_body(rng: random.Random) -> dict:
+        return {"hero_id": rng.choice(heroes), "item_ids": rng.sample(items, 6), "skill_ids": rng.sample(skills, 2)}
+
+    return [
+        Scenario("GET /items/", "GET", lambda rng: ("/items/?limit=100", None)),
+        Scenario("GET /items/{item_id}", "GET", lambda rng: (f"/items/{rng.choice(items)}", None)),
+        Scenario("GET /items/search", "GET", lambda rng: ("/items/search?types=Weapon&types_none=Tech&limit=50", None)),
+        Scenario("GET /items/{item_id}/synergies", "GET", lambda rng: (f"/items/{rng.choice(items)}/synergies", None)),
+        Scenario("GET /skills/", "GET", lambda rng: ("/skills/?types=Shield,Burn&limit=100", None)),
+        Scenario("GET /skills/{skill_id}", "GET", lambda rng: (f"/skills/{rng.choice(skills)}", None)),
+        Scenario("GET /heroes/", "GET", lambda rng: ("/heroes/", None)),
+        Scenario("GET /heroes/{hero_id}", "GET", lambda rng: (f"/heroes/{rng.choice(heroes)}", None)),
+        Scenario("GET /builds/", "GET", lambda rng: (f"/builds/?hero_id={rng.choice(heroes)}&limit=50", None)),
+        Scenario("GET /builds/{build_id}", "GET", lambda rng: (f"/builds/{rng.choice(builds)}", None)),
+        Scenario("POST /inventory/match-builds", "POST", lambda rng: ("/inventory/match-builds", inventory_body(rng))),
+        # Writes run last so the read routes always see the same seeded data
+        Scenario("POST /builds/", "POST", lambda rng: ("/builds/", build_body(rng))),
+    ]
+
+def start_server(app) -> Tuple[Any, threading.Thread, int]:
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Server did not start")
+        time.sleep(0.05)
+    return server, thread, port
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+async def run_scenario(base_url: str, scenario: Scenario, requests: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    import httpx
+
+    rng = random.Random(f"{seed}:{scenario.route}")
+    plans = [scenario.make(rng) for _ in range(requests)]
+    latencies: List[float] = []
+    statements: List[int] = []
+    errors = 0
+    next_index = 0
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async def worker():
+            nonlocal next_index, errors
+            while next_index < len(plans):
+                path, body = plans[next_index]
+                next_index += 1
+                started = time.perf_counter()
+                response = await client.request(scenario.method, path, json=body)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    errors += 1
+                match = _SQL_STATEMENTS.search(response.headers.get("server-timing", ""))
+                statements.append(int(match.group(1)) if match else 0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "sql_statements_per_request": round(sum(statements) / len(statements), 2) if statements else 0.0,
+        "sql_statements_max": max(statements) if statements else 0,
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_delta_ms: float) -> List[str]:
+    """Return a description of every route that regressed against the baseline."""
+    regressions = []
+    for route, current in results["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if current[metric] > previous[metric] * (1 + threshold) and current[metric] - previous[metric] > min_delta_ms:
+                regressions.append(f"{route}: {metric} {previous[metric]} -> {current[metric]}")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{route}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} rps")
+        # Statement counts barely move between runs (only the session's weak identity map
+        # makes lazy loads vary), so a few percent more usually means a new N+1
+        allowed = previous["sql_statements_per_request"] * 1.05 + 0.5
+        if current["sql_statements_per_request"] > allowed:
+            regressions.append(
+                f"{route}: SQL statements {previous['sql_statements_per_request']} -> {current['sql_statements_per_request']}"
+            )
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{route}: errors {previous.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load-test the API and compare latencies with a baseline")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per route")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--scale", type=int, default=1, help="Dataset scale factor (see app/utils/dataset_generator.py)")
+    parser.add_argument("--builds", type=int, default=500, help="Builds to seed into the scratch database")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the data and the request mix")
+    parser.add_argument("--routes", default=None, help="Comma-separated substrings; only matching routes run")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore latency regressions smaller than this")
+    parser.add_argument("--output", default=None, help="Also write the results to this file")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bazaar-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{scratch}/bench.db"
+    os.environ["SIMULATION_CACHE_PATH"] = f"{scratch}/simulation_cache.db"
+    logger.info(f"Seeding scratch database in {scratch}")
+    ids = seed_database(f"{scratch}/bench.db", args.scale, args.builds, args.seed)
+
+    os.environ["METRICS_ENABLED"] = "1"
+    # Measures the app itself; one load generator would be rate limited as a single client
+    os.environ["ADMISSION_ENABLED"] = "0"
+    from app.main import app
+
+    server, thread, port = start_server(app)
+    base_url = f"http://127.0.0.1:{port}"
+
+    scenarios = make_scenarios(ids)
+    if args.routes:
+        wanted = [r.strip() for r in args.routes.split(",")]
+        scenarios = [s for s in scenarios if any(w in s.route for w in wanted)]
+
+    results: Dict[str, Any] = {
+        "concurrency": args.concurrency,
+        "requests_per_route": args.requests,
+        "scale": args.scale,
+        "builds": args.builds,
+        "seed": args.seed,
+        "routes": {},
+    }
+    try:
+        for scenario in scenarios:
+            # Warm up caches so the measurement reflects steady state
+            asyncio.run(run_scenario(base_url, scenario, min(20, args.requests), 1, args.seed + 1))
+            stats = asyncio.run(run_scenario(base_url, scenario, args.requests, args.concurrency, args.seed))
+            results["routes"][scenario.route] = stats
+            logger.info(
+                f"{scenario.route:<34} {stats['throughput_rps']:>8.1f} rps  p50 {stats['p50_ms']:>7.2f}  "
+                f"p95 {stats['p95_ms']:>7.2f}  p99 {stats['p99_ms']:>7.2f} ms  "
+                f"sql {stats['sql_statements_per_request']:>6.1f}  errors {stats['errors']}"
+            )
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        logger.warning(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    for regression in regressions:
+        logger.error(f"Regression: {regression}")
+    if regressions:
+        return 1
+    logger.info("No regressions against the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+# benchmarks/overload.py
+#
+# Overload benchmark: read latency and outcomes while build saves flood the
+# single SQLite writer, with admission control off and on.
+#
+#   cd backend
+#   python -m benchmarks.overload --writers 64 --readers 8 --duration 10
+#
+# Each mode starts uvicorn on a fresh copy of a scratch database. Writers
+# post builds as fast as they can, each as its own client; readers fetch
+# builds at a steady pace. Reports, per mode and request kind, how many
+# requests succeeded, were shed (429/503) or failed or timed out, and the
+# latency of the successful ones.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+
+from benchmarks.http_load import percentile, seed_database
+from benchmarks.startup import free_port
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Clients identify themselves with this header, so each gets its own token bucket
+CLIENT_HEADER = "x-client-id"
+
+async def drive(base_url: str, ids: Dict[str, List[int]], writers: int, readers: int, read_interval: float,
+                duration: float, timeout: float, seed: int) -> Dict[str, Any]:
+    import httpx
+
+    rng = random.Random(seed)
+    items, skills, heroes, builds = ids["items"], ids["skills"], ids["heroes"], ids["builds"]
+    outcomes: Dict[str, Counter] = {"read": Counter(), "write": Counter()}
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    deadline = time.perf_counter() + duration
+
+    async def request(client, kind: str, method: str, path: str, body=None):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+        except httpx.TimeoutException:
+            outcomes[kind]["timeout"] += 1
+            return
+        except httpx.HTTPError:
+            outcomes[kind]["error"] += 1
+            return
+        if response.status_code < 400:
+            outcomes[kind]["ok"] += 1
+            latencies[kind].append((time.perf_counter() - started) * 1000)
+        elif response.status_code in (429, 503):
+            outcomes[kind][str(response.status_code)] += 1
+            if "retry-after" not in response.headers:
+                outcomes[kind]["missing_retry_after"] += 1
+        else:
+            outcomes[kind]["error"] += 1
+
+    async def writer(client, number: int):
+        client.headers[CLIENT_HEADER] = f"writer-{number}"
+        while time.perf_counter() < deadline:
+            body = {
+                "name": "Overload build",
+                "hero_id": rng.choice(heroes),
+                "build_items": [{"item_id": i, "slot": str(n)} for n, i in enumerate(rng.sample(items, 5))],
+                "build_skills": [{"skill_id": s} for s in rng.sample(skills, 2)],
+            }
+            await request(client, "write", "POST", "/builds/?dedupe=false", body)
+
+    async def reader(client, number: int):
+        client.headers[CLIENT_HEADER] = f"reader-{number}"
+        while time.perf_counter() < deadline:
+            await request(client, "read", "GET", f"/builds/{rng.choice(builds)}")
+            await asyncio.sleep(read_interval)
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    clients = [httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) for _ in range(writers + readers)]
+    try:
+        await asyncio.gather(
+            *(writer(clients[n], n) for n in range(writers)),
+            *(reader(clients[writers + n], n) for n in range(readers)),
+        )
+    finally:
+        for client in clients:
+            await client.aclose()
+
+    results = {}
+    for kind in ("read", "write"):
+        values = sorted(latencies[kind])
+        results[kind] = {
+            **{outcome: outcomes[kind][outcome] for outcome in ("ok", "429", "503", "timeout", "error")},
+            "missing_retry_after": outcomes[kind]["missing_retry_after"],
+            "ok_per_second": round(outcomes[kind]["ok"] / duration, 1),
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "p99_ms": round(percentile(values, 99), 1),
+        }
+    return results
+
+def wait_for_server(process: subprocess.Popen, base_url: str, timeout: float = 60.0) -> None:
+    import httpx
+
+    started = time.perf_counter()
+    while True:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None or time.perf_counter() - started > timeout:
+            raise RuntimeError("Server did not start")
+        time.sleep(0.05)
+
+def run_mode(admission: bool, db_path: str, scratch: str, ids: Dict[str, List[int]], args) -> Dict[str, Any]:
+    """Serve a copy of the seeded database and drive it for one mode."""
+    mode_db = f"{scratch}/overload-{'on' if admission else 'off'}.db"
+    shutil.copyfile(db_path, mode_db)
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{mode_db}",
+        "SIMULATION_CACHE_PATH": f"{scratch}/simulation_cache.db",
+        "JOB_MANAGER_ENABLED": "0",
+        "ADMISSION_ENABLED": "1" if admission else "0",
+        "ADMISSION_CLIENT_HEADER": CLIENT_HEADER,
+    }
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_for_server(process, base_url)
+        return asyncio.run(drive(base_url, ids, args.writers, args.readers, args.read_interval,
+                                 args.duration, args.timeout, args.seed))
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare behaviour under a write flood with and without admission control")
+    parser.add_argument("--writers", type=int, default=64, help="Concurrent clients posting builds")
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent clients reading builds")
+    parser.add_argument("--read-interval", type=float, default=0.05, help="Pause between one reader's requests")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per mode")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Client timeout per request")
+    parser.add_argument("--scale", type=int, default=1, help="Dataset scale factor")
+    parser.add_argument("--builds", type=int, default=2000, help="Builds to seed into the scratch database")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the data and the request mix")
+    parser.add_argument("--output", default=None, help="Also write the results to this file")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bazaar-overload-")
+    db_path = f"{scratch}/overload.db"
+    logger.info(f"Seeding scratch database in {scratch}")
+    ids = seed_database(db_path, args.scale, args.builds, args.seed)
+
+    results: Dict[str, Any] = {"writers": args.writers, "readers": args.readers, "duration": args.duration,
+                               "modes": {}}
+    for admission in (False, True):
+        mode = "admission" if admission else "no_admission"
+        results["modes"][mode] = stats = run_mode(admission, db_path, scratch, ids, args)
+        for kind, kind_stats in stats.items():
+            logger.info(
+                f"{mode:<13} {kind:<5} ok {kind_stats['ok']:>6} ({kind_stats['ok_per_second']:>6.1f}/s)  "
+                f"429 {kind_stats['429']:>6}  503 {kind_stats['503']:>6}  timeout {kind_stats['timeout']:>5}  "
+                f"error {kind_stats['error']:>4}  p50 {kind_stats['p50_ms']:>7.1f}  p95 {kind_stats['p95_ms']:>7.1f}  "
+                f"p99 {kind_stats['p99_ms']:>7.1f} ms"
+            )
+    shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
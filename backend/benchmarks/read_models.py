@@ -0,0 +1,130 @@
+# benchmarks/read_models.py
+#
+# ORM objects vs. projection read models, per 1000 rows.
+#
+#   cd backend
+#   python -m benchmarks.read_models --scale 10
+#
+# For items, skills and builds (with their item and skill rows), loads the
+# same rows once as ORM instances and once as __slots__ records, converts
+# them the way the read routes do, and reports the median time and the
+# peak Python memory allocated per 1000 rows.
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def measure(function: Callable[[], Any], rows: int, runs: int) -> Dict[str, float]:
+    """Return the median time and peak allocation of ``function``, scaled to 1000 rows."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_1k = 1000 / rows
+    return {
+        "ms_per_1k": round(statistics.median(samples) * 1000 * per_1k, 3),
+        "kb_per_1k": round(peak / 1024 * per_1k, 1),
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare ORM and projection read paths")
+    parser.add_argument("--scale", type=int, default=10, help="Dataset scale factor")
+    parser.add_argument("--builds", type=int, default=5000, help="Generated builds")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--output", default=None, help="Also write the results to this file")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bazaar-read-models-")
+    db_path = f"{scratch}/read_models.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from app.utils.dataset_generator import generate
+
+    generate(db_path, scale=args.scale, builds=args.builds, inventories=0)
+
+    from app.database.database import SessionLocal
+    from app.models.build import Build
+    from app.models.item import Item
+    from app.models.skill import Skill
+    from app.routes.item_routes import convert_item_for_response
+    from app.routes.skill_routes import convert_skill_for_response
+    from app.schemas.build import BuildResponse
+    from app.services.read_models import ItemRecord, SkillRecord, load_builds, project
+
+    def run(function: Callable[[Any], Any]) -> Callable[[], Any]:
+        # A fresh session per call, as each request gets one
+        def call():
+            db = SessionLocal()
+            try:
+                return function(db)
+            finally:
+                db.close()
+        return call
+
+    def builds_response(builds):
+        return [BuildResponse.model_validate(build) for build in builds]
+
+    paths = {
+        "items": (
+            Item,
+            lambda db: [convert_item_for_response(item) for item in db.query(Item).all()],
+            lambda db: [convert_item_for_response(item) for item in project(db.query(Item), ItemRecord)],
+        ),
+        "skills": (
+            Skill,
+            lambda db: [convert_skill_for_response(skill) for skill in db.query(Skill).all()],
+            lambda db: [convert_skill_for_response(skill) for skill in project(db.query(Skill), SkillRecord)],
+        ),
+        "builds": (
+            Build,
+            lambda db: builds_response(db.query(Build).all()),
+            lambda db: builds_response(load_builds(db, db.query(Build))),
+        ),
+    }
+
+    results: Dict[str, Any] = {}
+    for name, (model, orm_path, projection_path) in paths.items():
+        db = SessionLocal()
+        try:
+            rows = db.query(model).count()
+        finally:
+            db.close()
+        results[name] = {
+            "rows": rows,
+            "orm": measure(run(orm_path), rows, args.runs),
+            "projection": measure(run(projection_path), rows, args.runs),
+        }
+        orm, projection = results[name]["orm"], results[name]["projection"]
+        logger.info(f"{name:<7} {rows:>7} rows  "
+                    f"ORM {orm['ms_per_1k']:>8.2f} ms {orm['kb_per_1k']:>8.1f} KiB  "
+                    f"projection {projection['ms_per_1k']:>8.2f} ms {projection['kb_per_1k']:>8.1f} KiB  (per 1k rows)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"scale": args.scale, "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
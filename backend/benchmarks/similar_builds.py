@@ -0,0 +1,110 @@
+# benchmarks/similar_builds.py
+#
+# MinHash-LSH similar-build lookup vs. comparing against every build.
+#
+#   cd backend
+#   python -m benchmarks.similar_builds --builds 100000
+#
+# Builds the index over a generated library, then for a sample of builds
+# reports the median query time of the index and of a full scan, the
+# number of candidates the index compared, and its recall: the share of
+# its top-k results that are as similar as the exact k-th neighbour.
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare LSH and full-scan similar-build lookups")
+    parser.add_argument("--scale", type=int, default=10, help="Dataset scale factor")
+    parser.add_argument("--builds", type=int, default=100000, help="Generated builds")
+    parser.add_argument("--queries", type=int, default=200, help="Builds to look up")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per lookup")
+    parser.add_argument("--output", default=None, help="Also write the results to this file")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bazaar-similar-")
+    db_path = f"{scratch}/similar.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from app.utils.dataset_generator import generate
+
+    generate(db_path, scale=args.scale, builds=args.builds, inventories=0)
+
+    from app.database.database import SessionLocal
+    from app.services.similar_builds import MinHashLSH, jaccard
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        index = MinHashLSH.load(db)
+        load_seconds = time.perf_counter() - started
+        # Loaded again for the memory figure; tracing slows the load down several times
+        del index
+        tracemalloc.start()
+        index = MinHashLSH.load(db)
+        index_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        db.close()
+
+    def scan(build_id: int) -> List[Tuple[int, float]]:
+        features = index.features[build_id]
+        scored = [(other, jaccard(features, other_features))
+                  for other, other_features in index.features.items() if other != build_id]
+        scored.sort(key=lambda entry: (-entry[1], entry[0]))
+        return scored[:args.k]
+
+    sample = random.Random(0).sample(sorted(index.features), min(args.queries, len(index)))
+    lsh_times, scan_times, candidates, recalls = [], [], [], []
+    for build_id in sample:
+        started = time.perf_counter()
+        found, compared = index.similar(build_id, args.k)
+        lsh_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        exact = scan(build_id)
+        scan_times.append(time.perf_counter() - started)
+        candidates.append(compared)
+        if exact and exact[-1][1] > 0:
+            cutoff = exact[-1][1]
+            recalls.append(sum(1 for _, similarity in found if similarity >= cutoff) / len(exact))
+
+    results: Dict[str, Any] = {
+        "builds": len(index),
+        "load_seconds": round(load_seconds, 2),
+        "index_mb": round(index_bytes / 2**20, 1),
+        "lsh_median_ms": round(statistics.median(lsh_times) * 1000, 3),
+        "scan_median_ms": round(statistics.median(scan_times) * 1000, 3),
+        "median_candidates": statistics.median(candidates),
+        "mean_recall": round(statistics.mean(recalls), 3) if recalls else None,
+    }
+    logger.info(f"{results['builds']} builds indexed in {results['load_seconds']}s ({results['index_mb']} MiB)")
+    logger.info(f"LSH  median {results['lsh_median_ms']:>9.3f} ms  {results['median_candidates']} candidates  "
+                f"recall@{args.k} {results['mean_recall']}")
+    logger.info(f"scan median {results['scan_median_ms']:>9.3f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"scale": args.scale, "k": args.k, "results": results}, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# benchmarks/startup.py
+#
+# Cold-start benchmark: import time of app.main and time to first response.
+#
+#   cd backend
+#   python -m benchmarks.startup --runs 5
+#   python -m benchmarks.startup --warm-caches before --update-baseline
+#
+# Every run starts a fresh interpreter against a scratch database from the
+# dataset generator, so nothing is cached between runs except the OS page
+# cache. Exits non-zero when a metric regresses past the threshold.
+
+import argparse
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+
+DEFAULT_BASELINE = BACKEND_DIR / "benchmarks" / "startup_baseline.json"
+
+# First request that needs the catalog, tag index and a database round trip
+CATALOG_PATH = "/items/search?types=Weapon&limit=10"
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_import(env: Dict[str, str]) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def _get(url: str, timeout: float = 30.0) -> Optional[int]:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except (urllib.error.URLError, ConnectionError):
+        return None
+
+def measure_first_response(env: Dict[str, str], timeout: float = 60.0) -> Dict[str, float]:
+    """Start uvicorn and time the first successful responses.
+
+    Returns:
+        Seconds from process start to the first 200 from "/" and then to
+        the first catalog-backed response
+    """
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        while _get(f"{base_url}/", timeout=1.0) != 200:
+            if process.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError("Server did not answer in time")
+            time.sleep(0.01)
+        first_response = time.perf_counter() - started
+        if _get(f"{base_url}{CATALOG_PATH}") != 200:
+            raise RuntimeError(f"{CATALOG_PATH} failed")
+        first_catalog_response = time.perf_counter() - started
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {"first_response": first_response, "first_catalog_response": first_catalog_response}
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+def compare(results: Dict, baseline: Dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Return a description of every metric whose median regressed against the baseline."""
+    regressions = []
+    for metric, current in results["metrics"].items():
+        previous = baseline.get("metrics", {}).get(metric)
+        if previous is None:
+            continue
+        delta = current["median_ms"] - previous["median_ms"]
+        if current["median_ms"] > previous["median_ms"] * (1 + threshold) and delta > min_delta_ms:
+            regressions.append(f"{metric}: {previous['median_ms']} -> {current['median_ms']} ms")
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first response")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per metric")
+    parser.add_argument("--scale", type=int, default=1, help="Dataset scale factor")
+    parser.add_argument("--warm-caches", choices=("before", "after", "off"), default="after",
+                        help="WARM_CACHES setting for the server")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=50.0, help="Ignore regressions smaller than this")
+    parser.add_argument("--output", default=None, help="Also write the results to this file")
+    return parser.parse_args()
+
+def main() -> int:
+    args = parse_args()
+
+    from app.utils.dataset_generator import generate
+
+    scratch = tempfile.mkdtemp(prefix="bazaar-startup-")
+    db_path = f"{scratch}/startup.db"
+    generate(db_path, scale=args.scale, inventories=0)
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "SIMULATION_CACHE_PATH": f"{scratch}/simulation_cache.db",
+        "WARM_CACHES": args.warm_caches,
+        "JOB_WORKERS": "1",
+    }
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    responses = [measure_first_response(env) for _ in range(args.runs)]
+    results = {
+        "runs": args.runs,
+        "scale": args.scale,
+        "warm_caches": args.warm_caches,
+        "metrics": {
+            "import": summarize(imports),
+            "first_response": summarize([r["first_response"] for r in responses]),
+            "first_catalog_response": summarize([r["first_catalog_response"] for r in responses]),
+        },
+    }
+    for metric, stats in results["metrics"].items():
+        logger.info(f"{metric:<24} median {stats['median_ms']:>8.1f} ms  "
+                    f"min {stats['min_ms']:>8.1f}  max {stats['max_ms']:>8.1f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        logger.warning(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    for regression in regressions:
+        logger.error(f"Regression: {regression}")
+    if regressions:
+        return 1
+    logger.info("No regressions against the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,140 @@
+# run.py
+#
+#   python run.py                          # development: one process with autoreload
+#   python run.py --workers 4 --port 8000  # production: N workers sharing one catalog snapshot
+#
+# In production mode the launcher publishes the catalog to a binary snapshot
+# file (CATALOG_SNAPSHOT, default catalog.snap next to the SQLite database, also
+# written by the data importer) that every worker memory-maps read-only, so
+# the catalog's pages are shared between workers.
+# When a worker or the importer publishes a new generation it signals the
+# launcher (SIGUSR1, PID in <snapshot>.pid), which forwards the signal to
+# every worker so they reopen the file. SIGHUP republishes from the database.
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
 import uvicorn
 
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run The Bazaar Game Assistant API")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; more than one runs the production launcher")
+    parser.add_argument("--snapshot", default=os.environ.get("CATALOG_SNAPSHOT"),
+                        help="Shared catalog snapshot file for production workers (default: catalog.snap next to the database)")
+    parser.add_argument("--no-reload", action="store_true", help="Disable autoreload in development mode")
+    return parser.parse_args()
+
+def serve_worker(config: uvicorn.Config, sockets) -> None:
+    """Worker process entry point: serve on the launcher's listening socket."""
+    uvicorn.Server(config).run(sockets=sockets)
+
+class Launcher:
+    """Start N uvicorn workers on one socket and keep them running."""
+
+    def __init__(self, args):
+        from app.services.catalog_snapshot import DEFAULT_SNAPSHOT_PATH
+
+        self.args = args
+        self.snapshot = os.path.abspath(args.snapshot or DEFAULT_SNAPSHOT_PATH)
+        self.pid_file = f"{self.snapshot}.pid"
+        self.context = multiprocessing.get_context("spawn")
+        self.workers = {}
+        self.stopping = False
+        self.republish = False
+
+    def publish(self) -> None:
+        from app.database.database import SessionLocal
+        from app.database.init_db import ensure_schema
+        from app.services.catalog_snapshot import publish_snapshot
+
+        ensure_schema()
+        db = SessionLocal()
+        try:
+            publish_snapshot(db, self.snapshot, notify=False)
+        finally:
+            db.close()
+
+    def start_worker(self, index: int, config: uvicorn.Config, sockets) -> None:
+        # Spawned children copy os.environ when they start
+        os.environ["JOB_MANAGER_ENABLED"] = "1" if index == 0 else "0"
+        process = self.context.Process(target=serve_worker, args=(config, sockets), name=f"worker-{index}")
+        process.start()
+        self.workers[index] = process
+        logger.info(f"Started worker {index} (pid {process.pid})")
+
+    def forward(self, signum, frame) -> None:
+        for process in self.workers.values():
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGUSR1)
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def request_republish(self, signum, frame) -> None:
+        self.republish = True
+
+    def run(self) -> None:
+        os.environ["CATALOG_SNAPSHOT"] = self.snapshot
+        # The schema is upgraded and the catalog snapshot published once here;
+        # workers then find the schema version current and map the snapshot.
+        # Every other cache is per worker process (tag index, synergy graph,
+        # similar-build index, inventory match postings, the simulation
+        # cache's memory tier) and built by each worker for itself; with
+        # WARM_CACHES=after every worker warms the first three in the
+        # background once it is accepting connections.
+        os.environ.setdefault("WARM_CACHES", "after")
+        self.publish()
+        with open(self.pid_file, "w") as f:
+            f.write(str(os.getpid()))
+
+        config = uvicorn.Config("app.main:app", host=self.args.host, port=self.args.port)
+        sock = config.bind_socket()
+        signal.signal(signal.SIGUSR1, self.forward)
+        signal.signal(signal.SIGHUP, self.request_republish)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        try:
+            for index in range(self.args.workers):
+                self.start_worker(index, config, [sock])
+            while not self.stopping:
+                time.sleep(0.5)
+                if self.republish:
+                    self.republish = False
+                    self.publish()
+                    self.forward(signal.SIGUSR1, None)
+                for index, process in list(self.workers.items()):
+                    if not process.is_alive() and not self.stopping:
+                        logger.warning(f"Worker {index} exited with {process.exitcode}; restarting")
+                        self.start_worker(index, config, [sock])
+        finally:
+            for process in self.workers.values():
+                if process.is_alive():
+                    process.terminate()
+            for process in self.workers.values():
+                process.join(timeout=10)
+            sock.close()
+            if os.path.exists(self.pid_file):
+                os.remove(self.pid_file)
+            logger.info("Stopped")
+
+def main():
+    args = parse_args()
+    if args.workers <= 1:
+        uvicorn.run("app.main:app", host=args.host, port=args.port, reload=not args.no_reload)
+        return
+    Launcher(args).run()
+
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    sys.exit(main())
@@ -57,16 +57,73 @@ export const fetchItems = async (params = {}) => {
   }
 };
 
+// Lookups made within this window are sent as one batch request
+const BATCH_DELAY_MS = 10;
+// Longer ID lists are sent in a POST body instead of the query string
+const MAX_GET_BATCH_IDS = 100;
+
 /**
- * Fetch a single item by ID
- * @param {number} itemId - The ID of the item to fetch
- * @returns {Promise<Object>} - Item data
+ * Fetch many items by ID in one request
+ * @param {Array<number>} itemIds - The IDs of the items to fetch
+ * @returns {Promise<Object>} - { items: { [id]: item }, missing: [ids not found] }
  */
-export const fetchItemById = async (itemId) => {
+export const fetchItemsByIds = async (itemIds) => {
   try {
-    const response = await apiClient.get(`/items/${itemId}`);
+    const ids = [...new Set(itemIds)];
+    const response = ids.length > MAX_GET_BATCH_IDS
+      ? await apiClient.post('/items/batch', { ids })
+      : await apiClient.get('/items/batch', { params: { ids: ids.join(',') } });
     return response.data;
   } catch (error) {
     return handleApiError(error);
   }
-};
\ No newline at end of file
+};
+
+// Item details already fetched or in flight, by ID
+const itemCache = new Map();
+// Lookups waiting for the next batch: ID -> { resolve, reject }
+let pendingLookups = new Map();
+let batchTimer = null;
+
+const flushItemLookups = async () => {
+  const lookups = pendingLookups;
+  pendingLookups = new Map();
+  batchTimer = null;
+  try {
+    const { items, missing } = await fetchItemsByIds([...lookups.keys()]);
+    lookups.forEach(({ resolve, reject }, itemId) => {
+      if (items[itemId]) {
+        resolve(items[itemId]);
+      } else {
+        reject({ status: 404, data: { detail: 'Item not found' } });
+      }
+    });
+    missing.forEach((itemId) => itemCache.delete(itemId));
+  } catch (error) {
+    lookups.forEach(({ reject }, itemId) => {
+      itemCache.delete(itemId);
+      reject(error);
+    });
+  }
+};
+
+/**
+ * Fetch a single item by ID
+ *
+ * Lookups made at about the same time (e.g. every item placed on a board)
+ * are combined into one /items/batch request, and results are cached.
+ * @param {number} itemId - The ID of the item to fetch
+ * @returns {Promise<Object>} - Item data
+ */
+export const fetchItemById = (itemId) => {
+  if (!itemCache.has(itemId)) {
+    const lookup = new Promise((resolve, reject) => {
+      pendingLookups.set(itemId, { resolve, reject });
+    });
+    itemCache.set(itemId, lookup);
+    if (!batchTimer) {
+      batchTimer = setTimeout(flushItemLookups, BATCH_DELAY_MS);
+    }
+  }
+  return itemCache.get(itemId);
+};
@@ -13,26 +13,33 @@ const PlacedItem = ({ item, onRemove, slotsOccupied = 1 }) => {
   const tooltipTimeoutRef = useRef(null);
   const itemRef = useRef(null);
   
-  // Fetch detailed item data when needed
+  // Fetch detailed item data as soon as the item is placed. Every item on
+  // the board asks at once, so the lookups go out as one batch request and
+  // the tooltip usually has its details before the first hover.
   useEffect(() => {
-    // Only fetch details if we don't have them and tooltip is shown
-    if (showTooltip && !itemDetails && !loading) {
-      const fetchDetails = async () => {
-        try {
-          setLoading(true);
-          const details = await fetchItemById(item.id);
-          console.log('Fetched item details:', details);
+    let cancelled = false;
+    const fetchDetails = async () => {
+      try {
+        setLoading(true);
+        const details = await fetchItemById(item.id);
+        if (!cancelled) {
           setItemDetails(details);
-        } catch (error) {
-          console.error('Failed to fetch item details:', error);
-        } finally {
+        }
+      } catch (error) {
+        console.error('Failed to fetch item details:', error);
+      } finally {
+        if (!cancelled) {
           setLoading(false);
         }
-      };
-      
-      fetchDetails();
-    }
-  }, [showTooltip, item.id, itemDetails, loading]);
+      }
+    };
+    
+    setItemDetails(null);
+    fetchDetails();
+    return () => {
+      cancelled = true;
+    };
+  }, [item.id]);
   
   // Use either the fetched details or the original item
   const displayItem = itemDetails || item;